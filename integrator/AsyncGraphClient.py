@@ -0,0 +1,160 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+from integrator.integrator.GraphClient import (DEFAULT_LIMITER,
+                                              get_default_rate_limiter)
+from integrator.integrator.GraphThrottle import (IDEMPOTENT_METHODS,
+                                                THROTTLE_STATUSES, RetryPolicy,
+                                                TokenBucket, parse_retry_after)
+from integrator.integrator.logging_config import log_operation
+
+DEFAULT_MAX_CONCURRENCY = 100
+DEFAULT_ASYNC_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+class AsyncGraphClient:
+    """
+    Asynchronous counterpart of GraphClient built on one shared httpx.AsyncClient.
+
+    A semaphore bounds the number of Graph calls in flight, so callers can gather
+    thousands of coroutines without opening thousands of connections. Requests
+    also pass the same rate limiter as GraphClient, so async and sync callers
+    share one request budget and back off together when Graph throttles.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_keepalive_connections: int = 20,
+        timeout: httpx.Timeout = DEFAULT_ASYNC_TIMEOUT,
+        retry_policy: RetryPolicy = None,
+        client: httpx.AsyncClient = None,
+        rate_limiter: TokenBucket = DEFAULT_LIMITER,
+    ):
+        """
+        Initialize the AsyncGraphClient.
+
+        Args:
+            max_concurrency (int): Maximum number of requests in flight at once.
+            max_keepalive_connections (int): Idle connections kept open for reuse.
+            timeout (httpx.Timeout): Default timeout for every request.
+            retry_policy (RetryPolicy): Retry/backoff policy, as for GraphClient.
+            client (httpx.AsyncClient): Optional preconfigured client to use.
+            rate_limiter (TokenBucket): Limiter every request must pass, as for
+                GraphClient. Defaults to the process-wide one from
+                get_default_rate_limiter(); pass None to disable rate limiting.
+        """
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = get_default_rate_limiter() if rate_limiter is DEFAULT_LIMITER else rate_limiter
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, bounded by the concurrency semaphore and the rate limiter
+        and retried according to the retry policy. A throttled (429/503) response
+        with a Retry-After pauses the rate limiter for that long.
+
+        Raises:
+            httpx.HTTPError: If the last attempt failed without response.
+        """
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                await self._acquire_token()
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    retry = attempt < self.retry_policy.max_retries and method.upper() in IDEMPOTENT_METHODS
+                    if not retry:
+                        raise
+                    delay = self.retry_policy.get_delay(attempt)
+                    reason = str(e)
+                else:
+                    if response.status_code in THROTTLE_STATUSES:
+                        self._pause_rate_limiter(response.headers.get("Retry-After"))
+                    if not self.retry_policy.should_retry(method, attempt, response=response):
+                        return response
+                    delay = self.retry_policy.get_delay(attempt, response)
+                    reason = f"status {response.status_code}"
+            attempt += 1
+            log_operation(
+                "info",
+                f"Retrying {method} in {delay:.2f}s (attempt {attempt}): {reason}",
+                operation="graph_request",
+                object=url,
+            )
+            await asyncio.sleep(delay)
+
+    async def _acquire_token(self) -> None:
+        """Wait for the rate limiter in a worker thread, so the event loop keeps running."""
+        if self.rate_limiter is not None:
+            await asyncio.to_thread(self.rate_limiter.acquire)
+
+    def _pause_rate_limiter(self, retry_after: str) -> None:
+        """Pause the rate limiter for the delay of a Retry-After header, if given."""
+        delay = parse_retry_after(retry_after)
+        if delay is not None and self.rate_limiter is not None:
+            self.rate_limiter.pause(min(delay, self.retry_policy.max_backoff))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        """
+        Stream a response body while holding one concurrency slot. Not retried.
+        """
+        async with self.semaphore:
+            await self._acquire_token()
+            async with self.client.stream(method, url, **kwargs) as response:
+                if response.status_code in THROTTLE_STATUSES:
+                    self._pause_rate_limiter(response.headers.get("Retry-After"))
+                yield response
+
+    async def iter_collection(self, url: str, **kwargs):
+        """
+        Lazily yield the items of a Graph collection, following @odata.nextLink.
+
+        Raises:
+            httpx.HTTPError: If fetching any page fails.
+        """
+        while url:
+            response = await self.get(url, **kwargs)
+            response.raise_for_status()
+            page = response.json()
+            for item in page.get("value", []):
+                yield item
+            url = page.get("@odata.nextLink")
+            kwargs.pop("params", None)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
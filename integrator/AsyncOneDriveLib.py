@@ -0,0 +1,460 @@
+import asyncio
+import os
+
+import anyio
+import httpx
+
+from integrator.integrator.AsyncGraphClient import AsyncGraphClient
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneDriveLib import (DOWNLOAD_STREAM_BLOCK,
+                                               FOLDER_TREE_SELECT,
+                                               NOTEBOOK_SEARCH_SELECT,
+                                               SIMPLE_UPLOAD_LIMIT,
+                                               UPLOAD_CHUNK_SIZE,
+                                               UPLOAD_FRAGMENT_UNIT,
+                                               load_upload_state,
+                                               save_upload_state)
+from integrator.integrator.OneLib import (get_headers, get_page_params,
+                                          is_notebook)
+
+
+class AsyncOneDriveLib:
+    """
+    Asynchronous counterpart of OneDriveLib with the same method surface.
+
+    All calls go through one AsyncGraphClient, so many coroutines can keep
+    hundreds of Graph requests in flight while the client bounds concurrency.
+    """
+
+    def __init__(self, base_url: str = "https://graph.microsoft.com/v1.0/me/drive/", client: AsyncGraphClient = None):
+        """
+        Initialize the AsyncOneDriveLib instance with a base URL.
+
+        Args:
+            base_url (str): The base URL for OneDrive API. Defaults to Microsoft Graph API endpoint for OneDrive.
+            client (AsyncGraphClient): Shared async transport. Pass the same instance to
+                AsyncOneNoteLib to share connections and the concurrency limit.
+        """
+        self.base_url = base_url
+        self.client = client or AsyncGraphClient()
+
+    def get_file_url(self, folder_id: str, file_name: str) -> str:
+        """
+        Generate the URL to access a file in a folder.
+        """
+        return f"{self.base_url}items/{folder_id}:/{file_name}:/content"
+
+    def get_folder_url(self, folder_id: str) -> str:
+        """
+        Generate the URL to access a folder.
+        """
+        return f"{self.base_url}items/{folder_id}"
+
+    async def iter_root_objects(self, access_token: str, page_size: int = None, select=None, expand=None):
+        """
+        Lazily yield all objects in the OneDrive root folder, following @odata.nextLink.
+
+        Raises:
+            httpx.HTTPError: If fetching any page fails.
+        """
+        url = f"{self.base_url}root/children"
+        try:
+            async for item in self.client.iter_collection(
+                url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+            ):
+                yield item
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error fetching folder contents for ROOT Folder: {str(e)}",
+                operation="list_root_objects",
+            )
+            raise
+
+    async def list_root_objects(self, access_token: str, page_size: int = None, select=None, expand=None) -> list:
+        """List all objects in the OneDrive root folder, or an empty list if any page could not be fetched."""
+        try:
+            return [item async for item in self.iter_root_objects(access_token, page_size, select, expand)]
+        except httpx.HTTPError:
+            return []
+
+    async def find_onenote_notebook(self, access_token: str, notebook_name: str, select=NOTEBOOK_SEARCH_SELECT):
+        """Find a OneNote notebook in the root folder by name."""
+        try:
+            async for obj in self.iter_root_objects(access_token, select=select):
+                if obj.get("name") == notebook_name and is_notebook(obj):
+                    log_operation(
+                        "info",
+                        f"Found Notebook: {notebook_name} (ID: {obj.get('id')})",
+                        operation="find_onenote_notebook",
+                        object=notebook_name,
+                    )
+                    return obj
+        except httpx.HTTPError:
+            pass
+        return None
+
+    async def iter_folder_content(
+        self, access_token: str, folder_id: str, page_size: int = None, select=None, expand=None
+    ):
+        """
+        Lazily yield the items of a folder, following @odata.nextLink.
+
+        Raises:
+            httpx.HTTPError: If fetching any page fails.
+        """
+        url = self.get_folder_url(folder_id) + "/children"
+        try:
+            async for item in self.client.iter_collection(
+                url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+            ):
+                yield item
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error fetching folder contents for ID {folder_id}: {str(e)}",
+                operation="get_folder_contents",
+                object=folder_id,
+            )
+            raise
+
+    async def get_folder_content(
+        self, access_token: str, folder_id: str, page_size: int = None, select=None, expand=None
+    ) -> dict:
+        """
+        Fetch the contents of a folder from OneDrive.
+
+        Returns:
+            dict: The contents of the folder, with the items of all pages under "value".
+        """
+        url = self.get_folder_url(folder_id) + "/children"
+        try:
+            items = [
+                item async for item in self.client.iter_collection(
+                    url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+                )
+            ]
+            return {"value": items}
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error fetching folder contents for ID {folder_id}: {str(e)}",
+                operation="get_folder_contents",
+                object=folder_id,
+            )
+            return None
+
+    async def get_folders(
+        self, access_token: str, base_url: str = None, page_size: int = None, select=FOLDER_TREE_SELECT
+    ) -> dict:
+        """
+        Fetch all folders and subfolders starting from the base URL, listing all
+        subfolders of a level concurrently.
+
+        Returns:
+            dict: A nested dictionary representing the folder structure, as
+            returned by OneDriveLib.get_folders.
+        """
+        base_url = base_url or self.base_url + "root/children"
+        folder_structure = {}
+        try:
+            folders = [
+                item async for item in self.client.iter_collection(
+                    base_url, headers=get_headers(access_token), params=get_page_params(page_size, select)
+                )
+                if item.get("folder")
+            ]
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error fetching folders: {str(e)}",
+                operation="get_folders",
+            )
+            return folder_structure
+
+        folder_urls = [self.get_folder_url(item["id"]) for item in folders]
+        subfolders = await asyncio.gather(*[
+            self.get_folders(access_token, folder_url + "/children", page_size, select) for folder_url in folder_urls
+        ])
+        for item, folder_url, children in zip(folders, folder_urls, subfolders):
+            folder_structure[item["name"]] = {"FolderURL": folder_url, "Subfolders": children}
+        return folder_structure
+
+    async def create_directory(self, access_token: str, folder_name: str) -> dict:
+        """
+        Create a new directory in the root of OneDrive.
+        """
+        url = f"{self.base_url}root/children"
+        data = {
+            "name": folder_name,
+            "folder": {},
+            "@microsoft.graph.conflictBehavior": "rename",
+        }
+        try:
+            response = await self.client.post(url, json=data, headers=get_headers(access_token))
+            response.raise_for_status()
+            log_operation(
+                "info",
+                f"Directory created: {folder_name} (ID: {response.json().get('id')})",
+                operation="create_directory",
+                object=folder_name,
+            )
+            return response.json()
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error creating directory '{folder_name}': {str(e)}",
+                operation="create_directory",
+                object=folder_name,
+            )
+            return None
+
+    async def upload_file_to_directory(
+        self,
+        access_token: str,
+        folder_id: str,
+        file_path: str,
+        file_name: str,
+        large_file_threshold: int = SIMPLE_UPLOAD_LIMIT,
+        max_retries: int = 5,
+        state_file: str = None,
+    ) -> dict:
+        """
+        Upload a file to a specific directory in OneDrive.
+
+        Files larger than large_file_threshold are sent through an upload session,
+        retrying failed ranges and resuming an interrupted session from state_file
+        as OneDriveLib.upload_large_file does.
+        """
+        local_file = os.path.join(file_path, file_name)
+        if not os.path.isfile(local_file):
+            log_operation(
+                "error",
+                f"File not found: {local_file}",
+                operation="upload_file",
+                object=file_path,
+            )
+            return None
+
+        try:
+            if os.path.getsize(local_file) > large_file_threshold:
+                item = await self._upload_large_file(
+                    access_token, folder_id, local_file, file_name, max_retries=max_retries, state_file=state_file
+                )
+            else:
+                async with await anyio.open_file(local_file, "rb") as file:
+                    content = await file.read()
+                response = await self.client.put(
+                    self.get_file_url(folder_id, file_name), content=content, headers=get_headers(access_token)
+                )
+                response.raise_for_status()
+                item = response.json()
+            log_operation(
+                "info",
+                f"File uploaded: {file_name} to folder {folder_id} (ID: {item.get('id')})",
+                operation="upload_file",
+                object=file_name,
+            )
+            return item
+        except (httpx.HTTPError, OSError) as e:
+            log_operation(
+                "error",
+                f"Error uploading file '{file_name}': {str(e)}",
+                operation="upload_file",
+                object=file_name,
+            )
+            return None
+
+    async def _get_next_upload_offset(self, upload_url: str) -> int:
+        """
+        Ask the upload session which byte it expects next.
+        """
+        response = await self.client.get(upload_url)
+        response.raise_for_status()
+        ranges = response.json().get("nextExpectedRanges") or ["0-"]
+        return int(ranges[0].split("-")[0])
+
+    async def _upload_large_file(
+        self,
+        access_token: str,
+        folder_id: str,
+        local_file: str,
+        file_name: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 5,
+        state_file: str = None,
+    ) -> dict:
+        """
+        Send a file through an upload session in sequential byte ranges.
+
+        A range failing with a transport error, 416, 429 or 5xx is retried up to
+        max_retries times with exponential backoff, continuing at the byte the
+        session expects next. With state_file, the session is persisted and a
+        later call for the same file version resumes it.
+        """
+        chunk_size = max(UPLOAD_FRAGMENT_UNIT, chunk_size - chunk_size % UPLOAD_FRAGMENT_UNIT)
+        total = os.path.getsize(local_file)
+        file_mtime = os.path.getmtime(local_file)
+        upload_url = load_upload_state(state_file, total, file_mtime)
+        offset = 0
+        if upload_url:
+            try:
+                offset = await self._get_next_upload_offset(upload_url)
+                log_operation(
+                    "info",
+                    f"Resuming upload of {file_name} at byte {offset}",
+                    operation="upload_large_file",
+                    object=file_name,
+                )
+            except httpx.HTTPError:
+                # Session expired or was cancelled: start a new one
+                upload_url = None
+        if not upload_url:
+            url = f"{self.base_url}items/{folder_id}:/{file_name}:/createUploadSession"
+            data = {"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+            response = await self.client.post(url, json=data, headers=get_headers(access_token))
+            response.raise_for_status()
+            upload_url = response.json()["uploadUrl"]
+            if state_file:
+                save_upload_state(state_file, upload_url, total, file_mtime)
+
+        attempt = 0
+        async with await anyio.open_file(local_file, "rb") as file:
+            while True:
+                await file.seek(offset)
+                chunk = await file.read(chunk_size)
+                end = offset + len(chunk)
+                try:
+                    # The upload URL is pre-authenticated; it must not carry the Authorization header
+                    response = await self.client.put(
+                        upload_url,
+                        content=chunk,
+                        headers={"Content-Range": f"bytes {offset}-{end - 1}/{total}"},
+                    )
+                    response.raise_for_status()
+                    if response.status_code in (200, 201):
+                        break
+                    ranges = response.json().get("nextExpectedRanges") or [f"{end}-"]
+                    offset = int(ranges[0].split("-")[0])
+                    attempt = 0
+                except httpx.HTTPError as e:
+                    status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                    retryable = status is None or status >= 500 or status in (416, 429)
+                    if not retryable or attempt >= max_retries:
+                        raise
+                    attempt += 1
+                    log_operation(
+                        "info",
+                        f"Retrying range {offset}-{end - 1} (attempt {attempt}): {str(e)}",
+                        operation="upload_large_file",
+                        object=upload_url,
+                    )
+                    await asyncio.sleep(min(2 ** attempt, 30))
+                    try:
+                        offset = await self._get_next_upload_offset(upload_url)
+                    except httpx.HTTPError:
+                        pass
+
+        if state_file and os.path.isfile(state_file):
+            os.remove(state_file)
+        return response.json()
+
+    async def download_file(self, access_token: str, folder_id: str, destination_path: str, file_name: str) -> None:
+        """
+        Download a file from OneDrive to the specified destination via a ".part"
+        file that is renamed into place once complete.
+        """
+        url = self.get_file_url(folder_id, file_name)
+        local_file = os.path.join(destination_path, file_name)
+        part_file = local_file + ".part"
+        try:
+            async with self.client.stream("GET", url, headers=get_headers(access_token)) as response:
+                response.raise_for_status()
+                async with await anyio.open_file(part_file, "wb") as file:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_STREAM_BLOCK):
+                        await file.write(chunk)
+            os.replace(part_file, local_file)
+            log_operation(
+                "info",
+                f"File downloaded: {file_name} to {destination_path}",
+                operation="download_file",
+                object=file_name,
+            )
+        except (httpx.HTTPError, OSError) as e:
+            if os.path.isfile(part_file):
+                os.remove(part_file)
+            log_operation(
+                "error",
+                f"Error downloading file '{file_name}': {str(e)}",
+                operation="download_file",
+                object=file_name,
+            )
+
+    async def delete_folder_and_contents(self, access_token: str, folder_id: str) -> None:
+        """
+        Delete a folder and all its contents from OneDrive, deleting the children
+        concurrently.
+        """
+        try:
+            files = [
+                item async for item in self.client.iter_collection(
+                    self.get_folder_url(folder_id) + "/children", headers=get_headers(access_token)
+                )
+            ]
+            await asyncio.gather(*[self.delete_file(access_token, file["id"], file["name"]) for file in files])
+            await self.delete_folder(access_token, folder_id)
+            log_operation(
+                "info",
+                f"Folder and its contents deleted: {folder_id}",
+                operation="delete_folder_and_contents",
+                object=folder_id,
+            )
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error deleting folder contents for '{folder_id}': {str(e)}",
+                operation="delete_folder_and_contents",
+                object=folder_id,
+            )
+
+    async def delete_file(self, access_token: str, file_id: str, file_name: str) -> None:
+        """
+        Delete a file from OneDrive.
+        """
+        try:
+            response = await self.client.delete(f"{self.base_url}items/{file_id}", headers=get_headers(access_token))
+            response.raise_for_status()
+            log_operation(
+                "info",
+                f"File deleted: {file_name} (ID: {file_id})",
+                operation="delete_file",
+                object=file_name,
+            )
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error deleting file '{file_name}': {str(e)}",
+                operation="delete_file",
+                object=file_name,
+            )
+
+    async def delete_folder(self, access_token: str, folder_id: str) -> None:
+        """
+        Delete a folder from OneDrive.
+        """
+        try:
+            response = await self.client.delete(self.get_folder_url(folder_id), headers=get_headers(access_token))
+            response.raise_for_status()
+            log_operation(
+                "info",
+                f"Folder deleted: {folder_id}",
+                operation="delete_folder",
+                object=folder_id,
+            )
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error deleting folder '{folder_id}': {str(e)}",
+                operation="delete_folder",
+                object=folder_id,
+            )
@@ -0,0 +1,226 @@
+import asyncio
+
+import httpx
+
+from integrator.integrator.AsyncGraphClient import AsyncGraphClient
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneLib import get_headers, get_page_params
+from integrator.integrator.OneNoteLib import (ONENOTE_NAME_SELECT,
+                                              ONENOTE_NOTEBOOK_BASE_URL,
+                                              ONENOTE_PAGE_BASE_URL,
+                                              ONENOTE_SECTION_BASE_URL)
+from integrator.integrator.OneNotePageTemplate import render_page
+
+
+class AsyncOneNoteLib:
+    """
+    Asynchronous counterpart of OneNoteLib with the same method surface.
+    """
+
+    def __init__(self, client: AsyncGraphClient = None):
+        """
+        Initialize the AsyncOneNoteLib instance.
+
+        Args:
+            client (AsyncGraphClient): Shared async transport. Pass the same instance to
+                AsyncOneDriveLib to share connections and the concurrency limit.
+        """
+        self.client = client or AsyncGraphClient()
+        self.notebook_base_url = ONENOTE_NOTEBOOK_BASE_URL
+        self.section_base_url = ONENOTE_SECTION_BASE_URL
+        self.page_base_url = ONENOTE_PAGE_BASE_URL
+
+    def get_notebook_url(self, notebook_id: str) -> str:
+        """
+        Generate the URL to access a specific notebook.
+        """
+        return f"{self.notebook_base_url}/{notebook_id}"
+
+    def get_section_url(self, section_id: str) -> str:
+        """
+        Generate the URL to access a specific section.
+        """
+        return f"{self.section_base_url}/{section_id}"
+
+    def get_page_url(self, page_id: str) -> str:
+        """
+        Generate the URL to access a specific page.
+        """
+        return f"{self.page_base_url}/{page_id}"
+
+    async def get_notebooks(self, access_token: str, select=ONENOTE_NAME_SELECT) -> list:
+        """
+        Retrieve all notebooks for the authenticated user.
+        """
+        try:
+            return [
+                {"name": notebook.get("displayName", "Unnamed"), "id": notebook.get("id")}
+                async for notebook in self.client.iter_collection(
+                    self.notebook_base_url, headers=get_headers(access_token), params=get_page_params(select=select)
+                )
+            ]
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error retrieving notebooks: {str(e)}",
+                operation="get_notebooks",
+                object="notebooks"
+            )
+            return []
+
+    async def list_sections(
+        self, access_token: str, notebook_id: str, select=ONENOTE_NAME_SELECT
+    ) -> list[dict[str, str]]:
+        """
+        List all sections in a OneNote notebook.
+
+        Returns:
+            list[dict[str, str]]: A list of sections with their names and IDs.
+            Returns an empty list if an error occurs.
+        """
+        url = f"{self.notebook_base_url}/{notebook_id}/sections"
+        try:
+            return [
+                {"name": section.get("displayName", "Unnamed Section"), "id": section.get("id", "")}
+                async for section in self.client.iter_collection(
+                    url, headers=get_headers(access_token), params=get_page_params(select=select)
+                )
+            ]
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error listing sections for notebook '{notebook_id}': {str(e)}",
+                operation="list_sections",
+                object=notebook_id,
+            )
+            return []
+
+    async def iter_pages(
+        self, access_token: str, section_id: str = None, page_size: int = None, select=None, expand=None
+    ):
+        """
+        Lazily yield all pages in a OneNote section (or of the user if no section
+        is given), following @odata.nextLink.
+
+        Raises:
+            httpx.HTTPError: If fetching any page fails.
+        """
+        if section_id is None:
+            url = self.page_base_url
+        else:
+            url = f"{self.section_base_url}/{section_id}/pages"
+        try:
+            async for page in self.client.iter_collection(
+                url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+            ):
+                yield page
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error listing pages for section '{section_id}': {str(e)}",
+                operation="list_pages",
+                object=section_id
+            )
+            raise
+
+    async def list_pages(
+        self, access_token: str, section_id: str = None, page_size: int = None, select=None, expand=None
+    ) -> list:
+        """List all pages in a OneNote section, or an empty list if any page could not be fetched."""
+        try:
+            return [page async for page in self.iter_pages(access_token, section_id, page_size, select, expand)]
+        except httpx.HTTPError:
+            return []
+
+    async def get_notebook_structure(self, access_token: str, notebook_id: str) -> dict:
+        """
+        Get the structure of a notebook, fetching the pages of all sections concurrently.
+
+        Returns:
+            dict: Section name -> list of {"page_id", "page_title"}.
+        """
+        url = f"{self.notebook_base_url}/{notebook_id}/sections"
+        try:
+            sections = [
+                section async for section in self.client.iter_collection(url, headers=get_headers(access_token))
+            ]
+
+            async def fetch_pages(section_id):
+                return [
+                    page async for page in self.client.iter_collection(
+                        f"{self.section_base_url}/{section_id}/pages", headers=get_headers(access_token)
+                    )
+                ]
+
+            section_pages = await asyncio.gather(*[fetch_pages(section["id"]) for section in sections])
+            notebook_structure = {
+                section["displayName"]: [{"page_id": page["id"], "page_title": page["title"]} for page in pages]
+                for section, pages in zip(sections, section_pages)
+            }
+            log_operation(
+                "info",
+                f"Structure retrieved for notebook {notebook_id}",
+                operation="get_notebook_structure",
+                object=notebook_id
+            )
+            return notebook_structure
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error retrieving structure for notebook '{notebook_id}': {str(e)}",
+                operation="get_notebook_structure",
+                object=notebook_id
+            )
+            return None
+
+    async def create_page(self, access_token: str, section_id: str, title: str, content_html: str) -> dict:
+        """
+        Create a page in a specific section of a OneNote notebook.
+        """
+        url = f"{self.section_base_url}/{section_id}/pages"
+        page_html = render_page(title, content_html)
+        headers = get_headers(access_token)
+        headers["Content-Type"] = "application/xhtml+xml"
+        try:
+            response = await self.client.post(url, content=page_html.encode("utf-8"), headers=headers)
+            response.raise_for_status()
+            log_operation(
+                "info",
+                f"Page created: {title} (ID: {response.json().get('id')})",
+                operation="create_page",
+                object=title
+            )
+            return response.json()
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error creating page '{title}': {str(e)}",
+                operation="create_page",
+                object=title
+            )
+            return None
+
+    async def add_text_to_page(self, access_token: str, page_id: str, content_html: str) -> dict:
+        """
+        Append content to the body of an existing OneNote page.
+        """
+        url = f"{self.page_base_url}/{page_id}/content"
+        data = [{"target": "body", "action": "append", "content": content_html}]
+        try:
+            response = await self.client.patch(url, json=data, headers=get_headers(access_token))
+            response.raise_for_status()
+            log_operation(
+                "info",
+                f"Text added to page: {page_id}",
+                operation="add_text_to_page",
+                object=page_id
+            )
+            return {"id": page_id, "status": response.status_code}
+        except httpx.HTTPError as e:
+            log_operation(
+                "error",
+                f"Error adding text to page '{page_id}': {str(e)}",
+                operation="add_text_to_page",
+                object=page_id
+            )
+            return None
@@ -0,0 +1,240 @@
+import json
+import sys
+from array import array
+
+NO_INDEX = -1
+
+
+class DriveItem:
+    """
+    Lightweight view of one node of a DriveItemTree.
+
+    Views hold only the tree and the node index, so they are created on demand
+    and never stored; all node data lives in the tree's arrays.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: "DriveItemTree", index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def id(self) -> str:
+        return self.tree.ids[self.index]
+
+    @property
+    def name(self) -> str:
+        return self.tree.names[self.index]
+
+    @property
+    def is_folder(self) -> bool:
+        return bool(self.tree.folders[self.index])
+
+    @property
+    def size(self) -> int:
+        return self.tree.sizes[self.index]
+
+    @property
+    def parent(self) -> "DriveItem":
+        parent_index = self.tree.parents[self.index]
+        return None if parent_index == NO_INDEX else DriveItem(self.tree, parent_index)
+
+    @property
+    def path(self) -> str:
+        return self.tree.get_path(self.index)
+
+    def children(self):
+        """Yield the direct children, in insertion order."""
+        for child_index in self.tree.iter_child_indexes(self.index):
+            yield DriveItem(self.tree, child_index)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DriveItem) and other.tree is self.tree and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f"DriveItem(id={self.id!r}, path={self.path!r})"
+
+
+class DriveItemTree:
+    """
+    Compact in-memory tree of drive items.
+
+    Nodes are stored column-wise: parallel lists of IDs and interned names, and
+    int arrays for the parent, first child, last child and next sibling of every
+    node. A tree of hundreds of thousands of folders therefore costs a few dozen
+    bytes per node instead of two dicts and a URL string each, as the nested
+    get_folders structure does. Node 0 is the root the tree was built from.
+    """
+
+    def __init__(self, root_id: str = "root", root_name: str = ""):
+        self.ids = []
+        self.names = []
+        self.folders = bytearray()
+        self.sizes = array("q")
+        self.parents = array("l")
+        self.first_child = array("l")
+        self.last_child = array("l")
+        self.next_sibling = array("l")
+        self._id_index = None
+        self._append(root_id, root_name, NO_INDEX, True, 0)
+
+    def _append(self, item_id: str, name: str, parent_index: int, is_folder: bool, size: int) -> int:
+        index = len(self.ids)
+        self.ids.append(item_id)
+        self.names.append(sys.intern(name))
+        self.folders.append(1 if is_folder else 0)
+        self.sizes.append(size or 0)
+        self.parents.append(parent_index)
+        self.first_child.append(NO_INDEX)
+        self.last_child.append(NO_INDEX)
+        self.next_sibling.append(NO_INDEX)
+        if parent_index != NO_INDEX:
+            if self.first_child[parent_index] == NO_INDEX:
+                self.first_child[parent_index] = index
+            else:
+                self.next_sibling[self.last_child[parent_index]] = index
+            self.last_child[parent_index] = index
+        if self._id_index is not None:
+            self._id_index[item_id] = index
+        return index
+
+    def add(self, parent_index: int, item_id: str, name: str, is_folder: bool = True, size: int = 0) -> int:
+        """
+        Add a node below parent_index.
+
+        Returns:
+            int: The index of the new node.
+        """
+        if not 0 <= parent_index < len(self.ids):
+            raise IndexError(f"No node with index {parent_index}")
+        return self._append(item_id, name, parent_index, is_folder, size)
+
+    def add_item(self, parent_index: int, item: dict) -> int:
+        """
+        Add a Graph drive item below parent_index.
+
+        Returns:
+            int: The index of the new node.
+        """
+        return self.add(parent_index, item["id"], item["name"], "folder" in item, item.get("size", 0))
+
+    @property
+    def root(self) -> DriveItem:
+        return DriveItem(self, 0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self):
+        """Yield every node depth-first, parents before their children."""
+        for index in self.iter_indexes():
+            yield DriveItem(self, index)
+
+    def iter_indexes(self, start: int = 0):
+        """Yield the node indexes of a subtree depth-first, without recursion."""
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            yield index
+            children = list(self.iter_child_indexes(index))
+            stack.extend(reversed(children))
+
+    def iter_child_indexes(self, index: int):
+        """Yield the indexes of the direct children of a node, in insertion order."""
+        child_index = self.first_child[index]
+        while child_index != NO_INDEX:
+            yield child_index
+            child_index = self.next_sibling[child_index]
+
+    def get_path(self, index: int) -> str:
+        """Build the path of a node relative to the root, e.g. "/Documents/2024"."""
+        names = []
+        while index > 0:
+            names.append(self.names[index])
+            index = self.parents[index]
+        return "/" + "/".join(reversed(names))
+
+    def find(self, path: str) -> DriveItem:
+        """
+        Look up a node by its path relative to the root, e.g. "Documents/2024".
+
+        Returns:
+            DriveItem: The node, or None if the path does not exist.
+        """
+        index = 0
+        for name in filter(None, path.split("/")):
+            for child_index in self.iter_child_indexes(index):
+                if self.names[child_index] == name:
+                    index = child_index
+                    break
+            else:
+                return None
+        return DriveItem(self, index)
+
+    def get(self, item_id: str) -> DriveItem:
+        """
+        Look up a node by item ID. The ID index is built on first use.
+
+        Returns:
+            DriveItem: The node, or None if the ID is not in the tree.
+        """
+        if self._id_index is None:
+            self._id_index = {node_id: index for index, node_id in enumerate(self.ids)}
+        index = self._id_index.get(item_id)
+        return None if index is None else DriveItem(self, index)
+
+    def to_folder_structure(self, get_folder_url) -> dict:
+        """
+        Convert the folders of the tree to the nested format returned by
+        OneDriveLib.get_folders.
+
+        Args:
+            get_folder_url: Callable mapping an item ID to its folder URL,
+                e.g. OneDriveLib.get_folder_url.
+        """
+        folder_structure = {}
+        stack = [(0, folder_structure)]
+        while stack:
+            index, subfolders = stack.pop()
+            for child_index in self.iter_child_indexes(index):
+                if self.folders[child_index]:
+                    node = {"FolderURL": get_folder_url(self.ids[child_index]), "Subfolders": {}}
+                    subfolders[self.names[child_index]] = node
+                    stack.append((child_index, node["Subfolders"]))
+        return folder_structure
+
+    def to_dict(self) -> dict:
+        """Serialize the tree column-wise; nodes are listed in insertion order."""
+        return {
+            "ids": self.ids,
+            "names": self.names,
+            "parents": self.parents.tolist(),
+            "folders": self.folders.hex(),
+            "sizes": self.sizes.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriveItemTree":
+        """Rebuild a tree serialized with to_dict."""
+        tree = cls(data["ids"][0], data["names"][0])
+        folders = bytes.fromhex(data["folders"])
+        for index in range(1, len(data["ids"])):
+            tree._append(
+                data["ids"][index], data["names"][index], data["parents"][index], folders[index], data["sizes"][index]
+            )
+        return tree
+
+    def save(self, file_path: str) -> None:
+        """Write the tree to a JSON file."""
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, file_path: str) -> "DriveItemTree":
+        """Read a tree written by save."""
+        with open(file_path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
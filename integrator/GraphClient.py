@@ -0,0 +1,349 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from integrator.integrator.GraphThrottle import (THROTTLE_STATUSES,
+                                                RetryPolicy, TokenBucket,
+                                                parse_retry_after)
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneLib import get_headers
+
+# (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUT = (10, 60)
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+
+GRAPH_API_ROOT = "https://graph.microsoft.com/v1.0"
+# Graph accepts at most 20 sub-requests per $batch call
+MAX_BATCH_SIZE = 20
+BATCH_RETRY_STATUS = (429, 503, 504)
+# Combined request rate of all clients using the shared default rate limiter
+DEFAULT_REQUESTS_PER_SECOND = 20
+DEFAULT_BURST = 40
+# Default of GraphClient's rate_limiter, standing for the shared limiter (None disables limiting)
+DEFAULT_LIMITER = object()
+
+
+class GraphClient:
+    """
+    Shared HTTP transport for all Microsoft Graph calls.
+
+    Wraps a single requests.Session whose adapters keep connections alive, so
+    consecutive calls to graph.microsoft.com reuse an open TCP/TLS connection
+    instead of paying a new handshake per request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        timeout=DEFAULT_TIMEOUT,
+        session: requests.Session = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: TokenBucket = DEFAULT_LIMITER,
+    ):
+        """
+        Initialize the GraphClient.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of kept-alive connections per host.
+            pool_block (bool): If True, never open more than pool_maxsize connections
+                to one host; extra callers wait for a free connection.
+            timeout: Default timeout for every request, either a number or a
+                (connect, read) tuple. Can be overridden per call.
+            session (requests.Session): Optional preconfigured session to use.
+            retry_policy (RetryPolicy): Retry/backoff policy for throttled and failed
+                requests. Defaults to RetryPolicy(); pass RetryPolicy(max_retries=0)
+                to disable retries.
+            rate_limiter (TokenBucket): Limiter every request must pass. Defaults
+                to the process-wide one from get_default_rate_limiter(), so all
+                clients back off together when Graph throttles; pass None to
+                disable rate limiting.
+        """
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = get_default_rate_limiter() if rate_limiter is DEFAULT_LIMITER else rate_limiter
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session, applying the default timeout,
+        the rate limiter and the retry policy.
+
+        Throttled (429/503) responses are retried after their Retry-After delay. If
+        the response carries a Retry-After, the rate limiter is paused for that
+        long, even when the request is not retried, so other threads back off as
+        well. Request bodies that are one-shot iterators cannot be resent and are
+        never retried; seekable file bodies are rewound before a retry.
+
+        Returns:
+            requests.Response: The last response received.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt failed without response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        data = kwargs.get("data")
+        rewind_position = None
+        retryable_body = True
+        if hasattr(data, "seek") and hasattr(data, "tell"):
+            rewind_position = data.tell()
+        elif data is not None and not isinstance(data, (bytes, bytearray, memoryview, str, dict, list, tuple)):
+            retryable_body = False
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if not retryable_body or not self.retry_policy.should_retry(method, attempt, exception=e):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+                reason = str(e)
+            else:
+                if response.status_code in THROTTLE_STATUSES:
+                    self._pause_rate_limiter(response.headers.get("Retry-After"))
+                if not retryable_body or not self.retry_policy.should_retry(method, attempt, response=response):
+                    return response
+                delay = self.retry_policy.get_delay(attempt, response)
+                reason = f"status {response.status_code}"
+                response.close()
+
+            attempt += 1
+            log_operation(
+                "info",
+                f"Retrying {method} in {delay:.2f}s (attempt {attempt}): {reason}",
+                operation="graph_request",
+                object=url,
+            )
+            time.sleep(delay)
+            if rewind_position is not None:
+                data.seek(rewind_position)
+
+    def _pause_rate_limiter(self, retry_after: str) -> None:
+        """Pause the rate limiter for the delay of a Retry-After header, if given."""
+        delay = parse_retry_after(retry_after)
+        if delay is not None and self.rate_limiter is not None:
+            self.rate_limiter.pause(min(delay, self.retry_policy.max_backoff))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def iter_collection(self, url: str, **kwargs):
+        """
+        Lazily yield the items of a Graph collection, following @odata.nextLink
+        until the last page. Only one page is held in memory at a time.
+
+        Args:
+            url (str): URL of the first page.
+            **kwargs: Passed to the first GET (e.g. headers, params). The nextLink
+                already carries the query string, so params are not resent.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails.
+        """
+        while url:
+            response = self.get(url, **kwargs)
+            response.raise_for_status()
+            page = response.json()
+            yield from page.get("value", [])
+            url = page.get("@odata.nextLink")
+            kwargs.pop("params", None)
+
+    def _next_batch(self, pending: list[dict], results: dict) -> list[dict]:
+        """
+        Take up to MAX_BATCH_SIZE requests from pending whose dependencies are either
+        finished or part of the same batch. Requests depending on a failed request
+        are answered with 424 without being sent.
+        """
+        batch = []
+        batch_ids = set()
+        for sub_request in list(pending):
+            if len(batch) >= MAX_BATCH_SIZE:
+                break
+            depends_on = sub_request.get("dependsOn", [])
+            failed = [dep for dep in depends_on if dep in results and results[dep]["status"] >= 400]
+            if failed:
+                pending.remove(sub_request)
+                results[sub_request["id"]] = {
+                    "id": sub_request["id"],
+                    "status": 424,
+                    "body": {"error": {"code": "FailedDependency", "message": f"Dependency {failed[0]} failed"}},
+                }
+                continue
+            if any(dep not in results and dep not in batch_ids for dep in depends_on):
+                continue
+            pending.remove(sub_request)
+            sub_request = dict(sub_request)
+            inner = [dep for dep in depends_on if dep in batch_ids]
+            if inner:
+                sub_request["dependsOn"] = inner
+            else:
+                sub_request.pop("dependsOn", None)
+            batch.append(sub_request)
+            batch_ids.add(sub_request["id"])
+        return batch
+
+    def execute_batch(
+        self,
+        access_token: str,
+        sub_requests: list[dict],
+        graph_root: str = GRAPH_API_ROOT,
+        max_retries: int = 3,
+    ) -> dict:
+        """
+        Execute independent Graph calls through JSON batching, MAX_BATCH_SIZE per
+        /$batch round trip.
+
+        Each sub-request is a dict with "id", "method" and "url", and optionally
+        "headers", "body" and "dependsOn" (a list of ids). URLs may be absolute
+        (starting with graph_root) or relative to it. Dependent requests are kept
+        in the same batch as their dependencies; sub-requests throttled with
+        429/503/504 are re-queued after their Retry-After delay.
+
+        Args:
+            access_token (str): The access token for authentication.
+            sub_requests (list[dict]): The calls to execute.
+            graph_root (str): Versioned Graph root, e.g. https://graph.microsoft.com/v1.0.
+            max_retries (int): How often a throttled sub-request is re-queued.
+
+        Returns:
+            dict: Sub-request id -> response dict with "status", "headers" and "body".
+
+        Raises:
+            requests.exceptions.RequestException: If a /$batch call itself fails.
+        """
+        pending = []
+        for sub_request in sub_requests:
+            sub_request = dict(sub_request, id=str(sub_request["id"]))
+            if "dependsOn" in sub_request:
+                sub_request["dependsOn"] = [str(dep) for dep in sub_request["dependsOn"]]
+            if sub_request["url"].startswith(graph_root):
+                sub_request["url"] = sub_request["url"][len(graph_root):]
+            pending.append(sub_request)
+        originals = {sub_request["id"]: sub_request for sub_request in pending}
+        results = {}
+        retries = {}
+
+        while pending:
+            batch = self._next_batch(pending, results)
+            if not batch:
+                # Remaining requests depend on ids that will never complete
+                for sub_request in pending:
+                    missing = [dep for dep in sub_request.get("dependsOn", []) if dep not in originals]
+                    results[sub_request["id"]] = {
+                        "id": sub_request["id"],
+                        "status": 424,
+                        "body": {"error": {"code": "FailedDependency", "message": f"Unknown dependency {missing}"}},
+                    }
+                break
+
+            response = self.post(f"{graph_root}/$batch", json={"requests": batch}, headers=get_headers(access_token))
+            response.raise_for_status()
+            responses = {item["id"]: item for item in response.json().get("responses", [])}
+
+            requeued = set()
+            retry_after = 0
+            for sub_request in batch:
+                item = responses.get(sub_request["id"], {"id": sub_request["id"], "status": 500, "body": None})
+                throttled = item["status"] in BATCH_RETRY_STATUS
+                blocked = item["status"] == 424 and requeued.intersection(sub_request.get("dependsOn", []))
+                if (throttled and retries.get(sub_request["id"], 0) < max_retries) or blocked:
+                    if throttled:
+                        retries[sub_request["id"]] = retries.get(sub_request["id"], 0) + 1
+                        headers = CaseInsensitiveDict(item.get("headers") or {})
+                        if item["status"] in THROTTLE_STATUSES:
+                            self._pause_rate_limiter(headers.get("Retry-After"))
+                        delay = parse_retry_after(headers.get("Retry-After"))
+                        if delay is None:
+                            delay = 2 ** retries[sub_request["id"]]
+                        retry_after = max(retry_after, min(delay, self.retry_policy.max_backoff))
+                    requeued.add(sub_request["id"])
+                    continue
+                results[sub_request["id"]] = item
+
+            if requeued:
+                pending[:0] = [originals[request_id] for request_id in originals if request_id in requeued]
+                log_operation(
+                    "info",
+                    f"Re-queuing {len(requeued)} throttled batch requests after {retry_after:.2f}s",
+                    operation="execute_batch",
+                )
+                time.sleep(retry_after)
+
+        return results
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+_default_rate_limiter = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> TokenBucket:
+    """
+    Return the process-wide TokenBucket used by every GraphClient created without
+    an explicit rate_limiter, capping their combined rate at
+    DEFAULT_REQUESTS_PER_SECOND.
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = TokenBucket(DEFAULT_REQUESTS_PER_SECOND, DEFAULT_BURST)
+        return _default_rate_limiter
+
+
+def get_default_client() -> GraphClient:
+    """
+    Return the process-wide GraphClient shared by all library classes that were
+    not given an explicit client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GraphClient()
+            log_operation(
+                "info",
+                "Default Graph client created.",
+                operation="get_default_client",
+            )
+        return _default_client
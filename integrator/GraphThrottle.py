@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# Methods that may be resent after a connection error or a 5xx response
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+# Statuses meaning the request was rejected before being processed, so any method may be resent
+THROTTLE_STATUSES = frozenset([429, 503])
+SERVER_ERROR_STATUSES = frozenset([500, 502, 504])
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a Graph request is retried and how long to wait before it.
+
+    Throttled requests (429/503) wait for the server's Retry-After; everything else
+    uses exponential backoff with full jitter, so parallel workers do not retry in
+    lockstep.
+    """
+
+    def __init__(self, max_retries: int = 5, backoff_factor: float = 0.5, max_backoff: float = 60.0):
+        """
+        Args:
+            max_retries (int): Retries after the first attempt.
+            backoff_factor (float): Base delay in seconds, doubled per attempt.
+            max_backoff (float): Upper bound of a single delay in seconds.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def should_retry(self, method: str, attempt: int, response: requests.Response = None,
+                     exception: Exception = None) -> bool:
+        """
+        Return True if a request that got response (or raised exception) on the
+        given attempt (0-based) should be sent again.
+        """
+        if attempt >= self.max_retries:
+            return False
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if exception is not None:
+            return idempotent and isinstance(
+                exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            )
+        if response.status_code in THROTTLE_STATUSES:
+            return True
+        return idempotent and response.status_code in SERVER_ERROR_STATUSES
+
+    def get_delay(self, attempt: int, response: requests.Response = None) -> float:
+        """
+        Seconds to wait before retry number attempt + 1.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at rate per second up to capacity; every request
+    takes one. A throttling response can pause the whole bucket, so all threads
+    sharing it back off together instead of each discovering the throttle.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+        Args:
+            rate (float): Sustained requests per second.
+            capacity (int): Maximum burst size. Defaults to one second's worth of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available and take it.
+        """
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self.condition.wait(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                self.condition.wait((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for the given number of seconds.
+        """
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            # Refill from empty once the pause ends, instead of crediting the pause as a burst
+            self.tokens = 0.0
+            self.updated_at = self.paused_until
+            self.condition.notify_all()
@@ -0,0 +1,197 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+
+
+class LazyFolder:
+    """
+    Folder node of a LazyFolderTree. Its children are fetched the first time
+    they are accessed and again once the cached listing is older than the TTL.
+    """
+
+    __slots__ = ("tree", "id", "name", "parent", "_children", "_fetched_at", "_loading")
+
+    def __init__(self, tree: "LazyFolderTree", item_id: str, name: str, parent: "LazyFolder" = None):
+        self.tree = tree
+        self.id = item_id
+        self.name = name
+        self.parent = parent
+        self._children = {}
+        self._fetched_at = None
+        self._loading = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """True if the children are cached and not older than the tree's TTL."""
+        fetched_at = self._fetched_at
+        return fetched_at is not None and time.monotonic() - fetched_at < self.tree.ttl
+
+    @property
+    def children(self) -> list["LazyFolder"]:
+        """The subfolders, fetched on first access."""
+        self.tree.load(self)
+        return list(self._children.values())
+
+    def get_child(self, name: str) -> "LazyFolder":
+        """Return the subfolder with the given name, or None."""
+        self.tree.load(self)
+        return self._children.get(name)
+
+    def __getitem__(self, name: str) -> "LazyFolder":
+        child = self.get_child(name)
+        if child is None:
+            raise KeyError(name)
+        return child
+
+    @property
+    def path(self) -> str:
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/" + "/".join(reversed(names))
+
+    def invalidate(self) -> None:
+        """Drop the cached listing so the next access fetches it again."""
+        self._fetched_at = None
+
+    def __repr__(self) -> str:
+        return f"LazyFolder(id={self.id!r}, path={self.path!r})"
+
+
+class LazyFolderTree:
+    """
+    Folder tree of a OneDrive that is listed on demand.
+
+    Only the folders a caller actually opens are listed, one request per folder
+    (or per page of a large folder). With prefetch, opening a folder also lists
+    its subfolders in the background, so the next level is usually cached by
+    the time it is accessed.
+    """
+
+    def __init__(
+        self,
+        onedrive,
+        access_token: str,
+        root_id: str = "root",
+        ttl: float = 300,
+        prefetch: bool = False,
+        max_workers: int = 4,
+        page_size: int = None,
+    ):
+        """
+        Args:
+            onedrive (OneDriveLib): Library instance used for the listings.
+            access_token (str): Access token for authorization. Can be replaced
+                through the access_token attribute when it is refreshed.
+            root_id (str): ID of the folder the tree starts from.
+            ttl (float): Seconds a folder listing stays cached.
+            prefetch (bool): List the subfolders of every opened folder in the background.
+            max_workers (int): Number of background prefetch threads.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+        """
+        self.onedrive = onedrive
+        self.access_token = access_token
+        self.ttl = ttl
+        self.page_size = page_size
+        self.root = LazyFolder(self, root_id, "")
+        self.fetch_count = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if prefetch else None
+
+    def load(self, folder: LazyFolder, prefetch: bool = True) -> None:
+        """
+        Fetch the children of a folder unless a fresh listing is cached. Concurrent
+        calls for the same folder share one request; if that request fails, the
+        waiting callers fetch again themselves instead of inheriting the error of,
+        say, a background prefetch. With prefetch (and prefetching enabled for the
+        tree), the subfolders are then listed in the background, one level ahead only.
+
+        Raises:
+            requests.exceptions.RequestException: If the listing fails.
+        """
+        while True:
+            with self._lock:
+                if folder.is_loaded:
+                    return
+                future = folder._loading
+                owner = future is None
+                if owner:
+                    future = folder._loading = Future()
+            if owner:
+                break
+            try:
+                future.result()
+                return
+            except requests.exceptions.RequestException:
+                continue
+
+        try:
+            items = self.onedrive.list_child_folders(
+                self.access_token, self.onedrive.get_children_url(folder.id), self.page_size
+            )
+            with self._lock:
+                self.fetch_count += 1
+                # Keep existing child nodes so their own cached listings survive a refresh
+                previous = {child.id: child for child in folder._children.values()}
+                children = {}
+                for item in items:
+                    child = previous.get(item["id"]) or LazyFolder(self, item["id"], item["name"], folder)
+                    child.name = item["name"]
+                    children[item["name"]] = child
+                folder._children = children
+                folder._fetched_at = time.monotonic()
+                folder._loading = None
+            future.set_result(None)
+        except BaseException as e:
+            with self._lock:
+                folder._loading = None
+            future.set_exception(e)
+            raise
+
+        if prefetch and self._executor is not None:
+            for child in children.values():
+                if not child.is_loaded:
+                    self._executor.submit(self._prefetch, child)
+
+    def _prefetch(self, folder: LazyFolder) -> None:
+        """Load a folder in the background; failures are retried on the next access."""
+        try:
+            self.load(folder, prefetch=False)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error prefetching folder '{folder.id}': {str(e)}",
+                operation="lazy_folder_tree",
+                object=folder.id,
+            )
+
+    def find(self, path: str) -> LazyFolder:
+        """
+        Open a folder by path relative to the root, listing only the folders on the way.
+
+        Returns:
+            LazyFolder: The folder, or None if the path does not exist.
+        """
+        folder = self.root
+        for name in filter(None, path.split("/")):
+            folder = folder.get_child(name)
+            if folder is None:
+                return None
+        return folder
+
+    def close(self) -> None:
+        """Stop background prefetching."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
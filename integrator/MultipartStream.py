@@ -0,0 +1,178 @@
+import bisect
+import io
+import mimetypes
+import os
+import uuid
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+class MultipartStream(io.RawIOBase):
+    """
+    Seekable, read-only file object producing a multipart/form-data body.
+
+    Parts are described up front and their contents are read only while the
+    body is sent: files from disk in the chunks the HTTP client asks for,
+    buffers through memoryviews without copying them. The total length is
+    known in advance, so requests sends a Content-Length instead of chunked
+    encoding, and a retry can rewind the stream with seek(0).
+    """
+
+    def __init__(self, boundary: str = None):
+        """
+        Args:
+            boundary (str): Part boundary. Defaults to a random one.
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        # Parallel lists: start offset in the body, length and source of every segment
+        self._offsets = []
+        self._lengths = []
+        self._sources = []
+        self._length = 0
+        self._position = 0
+        self._finished = False
+        self._open_path = None
+        self._open_file = None
+
+    @property
+    def content_type(self) -> str:
+        """Value for the Content-Type header of the request."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _append(self, source, length: int) -> None:
+        if length:
+            self._offsets.append(self._length)
+            self._lengths.append(length)
+            self._sources.append(source)
+            self._length += length
+
+    def _append_bytes(self, data) -> None:
+        data = memoryview(data).cast("B")
+        self._append(data, len(data))
+
+    def add_part(self, name: str, data, content_type: str = None, filename: str = None) -> None:
+        """
+        Add a part.
+
+        Args:
+            name (str): Form field name of the part.
+            data: The content: str (sent as UTF-8), a bytes-like object, a path
+                (os.PathLike) of a file that is opened only while it is sent, or
+                a seekable binary file object, which is read from its current
+                position to the end.
+            content_type (str): Content type of the part. Guessed from filename
+                (or the file path) if omitted.
+            filename (str): Optional file name of the part.
+
+        Raises:
+            ValueError: If the body has already been read.
+        """
+        if self._finished:
+            raise ValueError("Cannot add parts after the body has been read")
+        if isinstance(data, os.PathLike):
+            data = os.fspath(data)
+            source = ("path", data, 0)
+            length = os.path.getsize(data)
+            guess_name = filename or data
+        elif hasattr(data, "read"):
+            start = data.tell()
+            length = data.seek(0, io.SEEK_END) - start
+            data.seek(start)
+            source = ("file", data, start)
+            guess_name = filename
+        else:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+                content_type = content_type or "text/plain; charset=utf-8"
+            source = None
+            length = None
+            guess_name = filename
+        if content_type is None:
+            content_type = (guess_name and mimetypes.guess_type(guess_name)[0]) or DEFAULT_CONTENT_TYPE
+
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        header = (
+            f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\nContent-Type: {content_type}\r\n\r\n"
+        )
+        self._append_bytes(header.encode("utf-8"))
+        if source is None:
+            self._append_bytes(data)
+        else:
+            self._append(source, length)
+        self._append_bytes(b"\r\n")
+
+    def _finish(self) -> None:
+        if not self._finished:
+            self._append_bytes(f"--{self.boundary}--\r\n".encode("ascii"))
+            self._finished = True
+
+    def __len__(self) -> int:
+        self._finish()
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._finish()
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._length
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def _read_source(self, source, offset: int, buffer: memoryview) -> int:
+        kind, target, start = source
+        if kind == "path":
+            if self._open_path != target:
+                self._close_file()
+                self._open_file = open(target, "rb")
+                self._open_path = target
+            file = self._open_file
+        else:
+            file = target
+        file.seek(start + offset)
+        return file.readinto(buffer) or 0
+
+    def readinto(self, buffer) -> int:
+        self._finish()
+        buffer = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(buffer) and self._position < self._length:
+            index = bisect.bisect_right(self._offsets, self._position) - 1
+            offset = self._position - self._offsets[index]
+            size = min(len(buffer) - written, self._lengths[index] - offset)
+            source = self._sources[index]
+            if isinstance(source, memoryview):
+                buffer[written:written + size] = source[offset:offset + size]
+            else:
+                size = self._read_source(source, offset, buffer[written:written + size])
+                if size == 0:
+                    raise IOError(f"File of multipart part {source[1]!r} is shorter than when it was added")
+            written += size
+            self._position += size
+        if written and self._position >= self._length:
+            # Release the last file as soon as the body has been sent
+            self._close_file()
+        return written
+
+    def _close_file(self) -> None:
+        if self._open_file is not None:
+            self._open_file.close()
+            self._open_file = None
+            self._open_path = None
+
+    def close(self) -> None:
+        self._close_file()
+        super().close()
@@ -3,17 +3,19 @@ import json
 import msal
 import requests
 
+from integrator.integrator.GraphClient import GraphClient, get_default_client
 from integrator.integrator.logging_config import log_operation
 
 
 class MyMSAL_Lib:
-    def __init__(self, config):
+    def __init__(self, config, client: GraphClient = None):
         """
         Initialize the MSAL client application and acquire an access token.
         """
         
         try:
             self.config = config
+            self.client = client or get_default_client()
             self.app = msal.PublicClientApplication(
                 client_id=config['CLIENT_ID'],
                 authority=config['AUTHORITY']
@@ -61,7 +63,7 @@ class MyMSAL_Lib:
         url = f"{self.config['GRAPH_API_BASE_URL']}{request_url}"
         try:
             headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(url, headers=headers)
+            response = self.client.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -73,6 +75,45 @@ class MyMSAL_Lib:
             )
             return None
         
+    def get_text_request(self, request_url):
+        """
+        Send a GET request and return the response body as text, e.g. page HTML.
+        """
+        url = f"{self.config['GRAPH_API_BASE_URL']}{request_url}"
+        try:
+            headers = {"Authorization": f"Bearer {self.access_token}"}
+            response = self.client.get(url, headers=headers)
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Get Request failed for URL {url}: {str(e)}",
+                operation="get_text_request",
+                object=url
+            )
+            return None
+
+    def iter_request(self, request_url, params=None):
+        """
+        Lazily yield the items of a paged GET response, following @odata.nextLink.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails.
+        """
+        url = f"{self.config['GRAPH_API_BASE_URL']}{request_url}"
+        try:
+            headers = {"Authorization": f"Bearer {self.access_token}"}
+            yield from self.client.iter_collection(url, headers=headers, params=params)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Get Request failed for URL {url}: {str(e)}",
+                operation="iter_request",
+                object=url
+            )
+            raise
+
     def post_request(self, request_url, headers={}, data=None):
         """
         Send a GET request to the provided URL using the stored access token.
@@ -87,7 +128,7 @@ class MyMSAL_Lib:
                     data = json.dumps(data)
                     headers["Content-Type"] = "application/json"  # Ensure content type is set to JSON
 
-            response = requests.post(url, headers=headers, data=data)
+            response = self.client.post(url, headers=headers, data=data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -1,5 +1,8 @@
 from integrator.integrator.logging_config import log_operation
 from integrator.integrator.MyMSAL_Lib import MyMSAL_Lib
+from integrator.integrator.OneLib import get_page_params
+from integrator.integrator.OneNotePageTemplate import render_page
+from integrator.integrator.PageContentCache import PageContentCache
 
 
 class DefaultConfig:
@@ -20,19 +23,22 @@ class DefaultEndpoints:
     SECTIONS = "/me/onenote/notebooks/{notebook-id}/sections"
     PAGES = "/me/onenote/sections/{section-id}/pages"
     PAGE = "/me/onenote/pages/{page-id}"
+    PAGE_CONTENT = "/me/onenote/pages/{page-id}/content"
 
 class MyOneNote_Lib:
-    def __init__(self, msal_config = None, endpoints = None):
+    def __init__(self, msal_config = None, endpoints = None, client = None, content_cache: PageContentCache = None):
         """
-        Initialize the MyOneNote_Lib with a MyMSAL_Lib object.
+        Initialize the MyOneNote_Lib with a MyMSAL_Lib object and an optional
+        PageContentCache for get_page_content.
         """
+        self.content_cache = content_cache
         if msal_config is None:
             msal_config = DefaultConfig.__dict__
         if endpoints is None:
             endpoints = DefaultEndpoints.__dict__
         try:
             self.endpoints = endpoints  
-            self.msal_lib = MyMSAL_Lib(msal_config)
+            self.msal_lib = MyMSAL_Lib(msal_config, client=client)
         except Exception as e:
             log_operation(
                 "error",
@@ -84,19 +90,21 @@ class MyOneNote_Lib:
             )
             return []
 
-    def get_pages(self, section_id):
+    def iter_pages(self, section_id, page_size=None):
+        """
+        Lazily yield title, ID and last modification time of every page in a
+        section, following @odata.nextLink.
+        """
+        url = self.endpoints["PAGES"].replace("{section-id}", section_id)
+        for page in self.msal_lib.iter_request(url, params=get_page_params(page_size)):
+            yield {"title": page["title"], "id": page["id"], "last_modified": page.get("lastModifiedDateTime")}
+
+    def get_pages(self, section_id, page_size=None):
         """
         Get a list of pages for a given section ID.
         """
         try:
-            url = self.endpoints["PAGES"].replace("{section-id}", section_id)
-            response = self.msal_lib.get_request(url)
-            if response:
-                return [
-                    {"title": page["title"], "id": page["id"]}
-                    for page in response.get("value", [])
-                ]
-            return []
+            return list(self.iter_pages(section_id, page_size))
         except Exception as e:
             log_operation(
                 "error",
@@ -108,17 +116,20 @@ class MyOneNote_Lib:
         
     def get_page(self, page_id):
         """
-        Get a list of pages for a given section ID.
+        Get title, ID and last modification time of a single page, or None if it
+        could not be fetched.
         """
         try:
             url = self.endpoints["PAGE"].replace("{page-id}", page_id)
+            # A single page is returned as the object itself, not as a "value" list
             response = self.msal_lib.get_request(url)
             if response:
-                return [
-                    {"title": page["title"], "id": page["id"]}
-                    for page in response.get("value", [])
-                ]
-            return []
+                return {
+                    "title": response.get("title"),
+                    "id": response["id"],
+                    "last_modified": response.get("lastModifiedDateTime"),
+                }
+            return None
         except Exception as e:
             log_operation(
                 "error",
@@ -126,8 +137,30 @@ class MyOneNote_Lib:
                 operation="get_page",
                 object=page_id
             )
-            return []
+            return None
         
+    def get_page_content(self, page_id, last_modified=None):
+        """
+        Get the HTML content of a page, or None if it could not be fetched.
+
+        With a content cache, unchanged pages are served from the cache. Pass the
+        "last_modified" value from iter_pages/get_pages; otherwise it is looked
+        up with get_page first.
+        """
+        if self.content_cache is not None and last_modified is None:
+            page = self.get_page(page_id)
+            last_modified = page["last_modified"] if page else None
+        if self.content_cache is not None:
+            content = self.content_cache.get(page_id, last_modified)
+            if content is not None:
+                return content
+
+        url = self.endpoints.get("PAGE_CONTENT", DefaultEndpoints.PAGE_CONTENT).replace("{page-id}", page_id)
+        content = self.msal_lib.get_text_request(url)
+        if content is not None and self.content_cache is not None:
+            self.content_cache.put(page_id, last_modified, content)
+        return content
+
     def create_section(self, notebook_id, section_name):
         """
         Create a new section in a notebook.
@@ -149,18 +182,8 @@ class MyOneNote_Lib:
         """
         url = self.endpoints["PAGES"].replace("{section-id}", section_id)
         headers = {"Content-Type": "application/xhtml+xml"}
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{title}</title>
-        </head>
-        <body>
-            {content}
-        </body>
-        </html>
-        """
-        
+        html = render_page(title, content)
+
         response = self.msal_lib.post_request(url, headers=headers, data=html)
         print(f"Response Page Created: {response}")
         if response:
@@ -0,0 +1,251 @@
+import json
+import os
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneDriveLib import OneDriveLib
+from integrator.integrator.OneLib import get_headers
+
+
+class OneDriveDeltaSync:
+    """
+    Incremental mirror of the OneDrive item tree built on the drive /delta endpoint.
+
+    The first sync enumerates the whole drive; every later sync only asks Graph for
+    the changes since the persisted delta link and applies them to the cached tree.
+    """
+
+    def __init__(self, onedrive: OneDriveLib, state_file: str):
+        """
+        Initialize the delta sync and load a previously persisted state.
+
+        Args:
+            onedrive (OneDriveLib): Library instance providing base URL and HTTP client.
+            state_file (str): JSON file holding the delta link and the cached items.
+        """
+        self.onedrive = onedrive
+        self.state_file = state_file
+        self.delta_link = None
+        # item ID -> {"name", "parent_id", "folder", "cTag"}
+        self.items = {}
+        # parent ID -> set of child IDs, kept in step with items
+        self.children = {}
+        self.load_state()
+
+    def load_state(self) -> None:
+        """
+        Load delta link and cached items from the state file, if present.
+        """
+        if not os.path.isfile(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r") as file:
+                state = json.load(file)
+            self.delta_link = state.get("delta_link")
+            self.items = state.get("items", {})
+            self._index_children()
+        except (OSError, json.JSONDecodeError) as e:
+            log_operation(
+                "error",
+                f"Ignoring unreadable delta state {self.state_file}: {str(e)}",
+                operation="load_delta_state",
+                object=self.state_file,
+            )
+            self.delta_link = None
+            self.items = {}
+            self.children = {}
+
+    def _index_children(self) -> None:
+        """
+        Rebuild the parent -> children index from the cached items.
+        """
+        self.children = {}
+        for item_id, item in self.items.items():
+            self.children.setdefault(item["parent_id"], set()).add(item_id)
+
+    def _unlink(self, item_id: str, parent_id: str) -> None:
+        siblings = self.children.get(parent_id)
+        if siblings is not None:
+            siblings.discard(item_id)
+            if not siblings:
+                del self.children[parent_id]
+
+    def save_state(self) -> None:
+        """
+        Persist delta link and cached items, replacing the state file atomically.
+        """
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, "w") as file:
+            json.dump({"delta_link": self.delta_link, "items": self.items}, file)
+        os.replace(temp_file, self.state_file)
+
+    def reset(self) -> None:
+        """
+        Forget the cached tree; the next sync enumerates the whole drive again.
+        """
+        self.delta_link = None
+        self.items = {}
+        self.children = {}
+
+    def _remove_subtree(self, item_id: str) -> list[str]:
+        """
+        Remove an item and all cached descendants, returning the removed IDs.
+        """
+        item = self.items.get(item_id)
+        if item is not None:
+            self._unlink(item_id, item["parent_id"])
+        removed = []
+        stack = [item_id]
+        while stack:
+            current = stack.pop()
+            if self.items.pop(current, None) is not None:
+                removed.append(current)
+            stack.extend(self.children.pop(current, ()))
+        return removed
+
+    def _apply(self, item: dict) -> dict:
+        """
+        Apply one delta item to the cache and describe the change.
+        """
+        item_id = item["id"]
+        cached = self.items.get(item_id)
+
+        if "deleted" in item:
+            if cached is None:
+                return None
+            removed = self._remove_subtree(item_id)
+            return {"type": "deleted", "id": item_id, "name": cached["name"], "removed": len(removed)}
+
+        entry = {
+            "name": item.get("name"),
+            "parent_id": None if "root" in item else item.get("parentReference", {}).get("id"),
+            "folder": "folder" in item or "root" in item,
+            "cTag": item.get("cTag"),
+        }
+        self.items[item_id] = entry
+        if cached is not None and cached["parent_id"] != entry["parent_id"]:
+            self._unlink(item_id, cached["parent_id"])
+        self.children.setdefault(entry["parent_id"], set()).add(item_id)
+        change = {"id": item_id, "name": entry["name"], "folder": entry["folder"]}
+
+        if cached is None:
+            change["type"] = "added"
+        elif cached["parent_id"] != entry["parent_id"]:
+            change.update(type="moved", old_parent_id=cached["parent_id"])
+        elif cached["name"] != entry["name"]:
+            change.update(type="renamed", old_name=cached["name"])
+        elif cached.get("cTag") != entry["cTag"]:
+            change["type"] = "modified"
+        else:
+            return None
+        return change
+
+    def _record_page(self, items: list[dict]) -> None:
+        """
+        Apply a page of delta items to the library's metadata store, if it has one,
+        which keeps its search index current. Delta items carry no parent path,
+        so paths come from the cached tree. Only called once the whole sync has
+        succeeded, so the store never holds changes the cached state rolled back.
+        """
+        store = self.onedrive.metadata_store
+        if store is None:
+            return
+        for item in items:
+            if "deleted" in item:
+                store.delete_item(item["id"])
+        changed = [item for item in items if "deleted" not in item]
+        store.upsert_items(changed, paths={item["id"]: self.get_path(item["id"]) for item in changed})
+
+    def sync(self, access_token: str) -> list[dict]:
+        """
+        Fetch the changes since the last sync and apply them to the cached tree
+        and, if the library has one, to its metadata store.
+
+        Returns:
+            list[dict]: One entry per change with "type" (added, moved, renamed,
+            modified or deleted), "id" and "name". Empty if nothing changed or the
+            request failed.
+        """
+        url = self.delta_link or f"{self.onedrive.base_url}root/delta"
+        changes = []
+        pages = []
+        delta_link = None
+        try:
+            while url:
+                response = self.onedrive.client.get(url, headers=get_headers(access_token))
+                if response.status_code == 410:
+                    # The delta link expired: Graph requires a full resynchronisation
+                    log_operation(
+                        "info",
+                        "Delta link expired, starting full resync",
+                        operation="delta_sync",
+                    )
+                    self.reset()
+                    changes = []
+                    pages = []
+                    url = f"{self.onedrive.base_url}root/delta"
+                    continue
+                response.raise_for_status()
+                page = response.json()
+                for item in page.get("value", []):
+                    change = self._apply(item)
+                    if change:
+                        changes.append(change)
+                pages.append(page.get("value", []))
+                url = page.get("@odata.nextLink")
+                delta_link = page.get("@odata.deltaLink", delta_link)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error fetching drive delta: {str(e)}",
+                operation="delta_sync",
+            )
+            # Keep the previous delta link so the next run replays the same changes
+            self.reset()
+            self.load_state()
+            return []
+
+        self.delta_link = delta_link
+        self.save_state()
+        for items in pages:
+            self._record_page(items)
+        log_operation(
+            "info",
+            f"Delta sync applied {len(changes)} changes",
+            operation="delta_sync",
+        )
+        return changes
+
+    def get_path(self, item_id: str) -> str:
+        """
+        Build the path of a cached item from its ancestors, e.g. "/Documents/Reports".
+        """
+        names = []
+        current = self.items.get(item_id)
+        while current is not None and current["parent_id"] is not None:
+            names.append(current["name"])
+            current = self.items.get(current["parent_id"])
+        return "/" + "/".join(reversed(names))
+
+    def get_folder_structure(self) -> dict:
+        """
+        Build the cached folder tree in the same nested format as OneDriveLib.get_folders.
+        """
+        children = {}
+        root_id = None
+        for item_id, item in self.items.items():
+            if item["parent_id"] is None:
+                root_id = item_id
+            elif item["folder"]:
+                children.setdefault(item["parent_id"], []).append(item_id)
+
+        folder_structure = {}
+        stack = [(root_id, folder_structure)]
+        while stack:
+            parent_id, subfolders = stack.pop()
+            for folder_id in children.get(parent_id, []):
+                node = {"FolderURL": self.onedrive.get_folder_url(folder_id), "Subfolders": {}}
+                subfolders[self.items[folder_id]["name"]] = node
+                stack.append((folder_id, node["Subfolders"]))
+        return folder_structure
@@ -0,0 +1,226 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneDriveLib import DOWNLOAD_STREAM_BLOCK, OneDriveLib
+from integrator.integrator.OneDriveMirror import MIRROR_SELECT, OneDriveMirror
+from integrator.integrator.OneLib import get_headers
+
+# The listing also carries the pre-authenticated download URL of every file
+DOWNLOAD_SELECT = MIRROR_SELECT + ",@microsoft.graph.downloadUrl"
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when the batch is cancelled."""
+
+
+class OneDriveDownloader:
+    """
+    Download many OneDrive files with a bounded pool of worker threads.
+
+    Files that already exist locally with the remote size and quickXorHash are
+    skipped, so running an interrupted or cancelled batch again resumes it.
+    """
+
+    def __init__(self, onedrive: OneDriveLib, max_workers: int = 8, verify_hash: bool = True, hash_workers: int = None):
+        """
+        Args:
+            onedrive (OneDriveLib): Library instance used for listings and downloads.
+            max_workers (int): Number of concurrent downloads.
+            verify_hash (bool): Compare the quickXorHash of local files with the same
+                size before skipping them; otherwise a matching size is enough.
+            hash_workers (int): Number of hashing processes. Defaults to the CPU count.
+        """
+        self.onedrive = onedrive
+        self.max_workers = max_workers
+        self.verify_hash = verify_hash
+        self.mirror = OneDriveMirror(onedrive, hash_workers=hash_workers)
+
+    def _find_up_to_date(self, files: dict, local_files: dict) -> set:
+        """
+        Return the relative paths whose local copy matches the remote item.
+        """
+        same_size = {
+            rel_path: local_path
+            for rel_path, local_path in local_files.items()
+            if os.path.isfile(local_path) and os.path.getsize(local_path) == files[rel_path].get("size")
+        }
+        if not self.verify_hash:
+            return set(same_size)
+        changed, _ = self.mirror.find_changed_files(same_size, files)
+        return set(same_size).difference(changed)
+
+    def _stream_to_file(
+        self, download_url: str, headers: dict, item: dict, local_path: str, cancel_event: threading.Event
+    ) -> int:
+        """
+        Stream one download URL to a ".part" file and rename it into place.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        part_file = local_path + ".part"
+        written = 0
+        try:
+            with self.onedrive.client.get(download_url, headers=headers, stream=True) as response:
+                response.raise_for_status()
+                with open(part_file, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_STREAM_BLOCK):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise DownloadCancelled(item["name"])
+                        file.write(chunk)
+                        written += len(chunk)
+            os.replace(part_file, local_path)
+            return written
+        except BaseException:
+            if os.path.isfile(part_file):
+                os.remove(part_file)
+            raise
+
+    def _download_item(self, access_token: str, item: dict, local_path: str, cancel_event: threading.Event) -> int:
+        """
+        Download one file, preferring the pre-authenticated URL from the listing.
+
+        Pre-authenticated URLs expire after a short time, so a large batch can reach
+        items whose URL is no longer valid. On 401/403 the file is fetched through
+        the authenticated content endpoint instead, which redirects to a fresh URL.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        # The pre-authenticated download URL from the listing saves the redirect
+        download_url = item.get("@microsoft.graph.downloadUrl")
+        if download_url:
+            try:
+                return self._stream_to_file(download_url, {}, item, local_path, cancel_event)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in (401, 403):
+                    raise
+                log_operation(
+                    "info",
+                    f"Download URL of '{item['name']}' expired, requesting a fresh one",
+                    operation="download_items",
+                    object=item["id"],
+                )
+        content_url = self.onedrive.get_folder_url(item["id"]) + "/content"
+        return self._stream_to_file(content_url, get_headers(access_token), item, local_path, cancel_event)
+
+    def download_items(
+        self,
+        access_token: str,
+        items: dict,
+        destination_dir: str,
+        cancel_event: threading.Event = None,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Download files into destination_dir.
+
+        Args:
+            access_token (str): The access token for authentication.
+            items (dict | list[dict]): Relative local path -> drive item, or a list
+                of drive items that are saved under their names. Folder items are ignored.
+            destination_dir (str): Local directory to download into.
+            cancel_event (threading.Event): When set, running downloads are aborted
+                and no new ones are started; call again to resume.
+            progress_callback: Optional callable(files_done, files_total, bytes_done)
+                invoked after each file.
+
+        Returns:
+            dict: {"downloaded", "skipped", "failed", "cancelled"} lists of relative
+            paths, plus "bytes", "seconds", "bytes_per_second" and "files_per_second".
+        """
+        if not isinstance(items, dict):
+            items = {item["name"]: item for item in items}
+        files = {rel_path: item for rel_path, item in items.items() if "folder" not in item}
+        local_files = {
+            rel_path: os.path.join(destination_dir, *rel_path.split("/")) for rel_path in files
+        }
+        started = time.perf_counter()
+        skipped = self._find_up_to_date(files, local_files)
+        report = {"downloaded": [], "skipped": sorted(skipped), "failed": [], "cancelled": [], "bytes": 0}
+
+        pending = deque(rel_path for rel_path in files if rel_path not in skipped)
+        total = len(files)
+        done = len(skipped)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Keep a bounded number of futures queued so cancelling is immediate
+                while pending and len(running) < 2 * self.max_workers and not (
+                    cancel_event is not None and cancel_event.is_set()
+                ):
+                    rel_path = pending.popleft()
+                    local_path = local_files[rel_path]
+                    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                    future = executor.submit(self._download_item, access_token, files[rel_path], local_path, cancel_event)
+                    running[future] = rel_path
+                if not running:
+                    report["cancelled"].extend(pending)
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rel_path = running.pop(future)
+                    try:
+                        report["bytes"] += future.result()
+                        report["downloaded"].append(rel_path)
+                    except DownloadCancelled:
+                        report["cancelled"].append(rel_path)
+                        continue
+                    except Exception as e:
+                        # A failing item never aborts the rest of the batch
+                        report["failed"].append(rel_path)
+                        log_operation(
+                            "error",
+                            f"Error downloading file '{rel_path}': {str(e)}",
+                            operation="download_items",
+                            object=rel_path,
+                        )
+                    done += 1
+                    if progress_callback is not None:
+                        progress_callback(done, total, report["bytes"])
+
+        seconds = time.perf_counter() - started
+        report["seconds"] = seconds
+        report["bytes_per_second"] = report["bytes"] / seconds if seconds else 0.0
+        report["files_per_second"] = len(report["downloaded"]) / seconds if seconds else 0.0
+        log_operation(
+            "info",
+            f"Downloaded {len(report['downloaded'])} files ({report['bytes'] / 2**20:.1f} MiB, "
+            f"{report['bytes_per_second'] / 2**20:.2f} MiB/s), {len(skipped)} up to date, "
+            f"{len(report['failed'])} failed, {len(report['cancelled'])} cancelled",
+            operation="download_items",
+            object=destination_dir,
+        )
+        return report
+
+    def download_folder(
+        self,
+        access_token: str,
+        folder_id: str,
+        destination_dir: str,
+        cancel_event: threading.Event = None,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Download a OneDrive folder with all subfolders into destination_dir.
+
+        Returns:
+            dict: The report of download_items, or None if the folder could not be listed.
+        """
+        try:
+            remote = self.mirror.list_remote_tree(access_token, folder_id, select=DOWNLOAD_SELECT)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error listing remote folder '{folder_id}': {str(e)}",
+                operation="download_folder",
+                object=folder_id,
+            )
+            return None
+        return self.download_items(access_token, remote, destination_dir, cancel_event, progress_callback)
@@ -1,21 +1,84 @@
+import io
+import json
+import mmap
 import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import (FIRST_COMPLETED, ThreadPoolExecutor,
+                                as_completed, wait)
+from urllib.parse import urlparse
 
 import requests
 
+from integrator.integrator.DriveItemTree import DriveItemTree
+from integrator.integrator.GraphClient import GraphClient, get_default_client
+from integrator.integrator.LazyFolderTree import LazyFolderTree
 from integrator.integrator.logging_config import log_operation
-from integrator.integrator.OneLib import (get_headers, is_notebook,
-                                          list_all_attributes)
+from integrator.integrator.OneDriveMetadataStore import OneDriveMetadataStore
+from integrator.integrator.OneLib import (ChunkReader, get_graph_root,
+                                          get_headers, get_page_params,
+                                          is_notebook, list_all_attributes,
+                                          merge_select, read_fully)
+
+# Graph requires upload session fragments to be multiples of 320 KiB
+UPLOAD_FRAGMENT_UNIT = 320 * 1024
+UPLOAD_CHUNK_SIZE = 32 * UPLOAD_FRAGMENT_UNIT  # 10 MiB
+# Files above this size are sent through an upload session instead of a single PUT
+SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024
+DELETE_BATCH_SIZE = 20
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_STREAM_BLOCK = 1024 * 1024
+# Default $select projections of the listing call sites
+FOLDER_TREE_SELECT = "id,name,folder"
+METADATA_SELECT = "id,name,root,parentReference,folder,file,size,eTag,cTag,lastModifiedDateTime"
+NOTEBOOK_SEARCH_SELECT = "id,name,package,parentReference,webUrl"
+
+
+def load_upload_state(state_file: str, file_size: int, file_mtime: float) -> str:
+    """
+    Return the upload URL saved in state_file if it belongs to the same file version.
+    """
+    if not state_file or not os.path.isfile(state_file):
+        return None
+    try:
+        with open(state_file, "r") as file:
+            state = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if state.get("file_size") != file_size or state.get("file_mtime") != file_mtime:
+        return None
+    return state.get("upload_url")
+
+
+def save_upload_state(state_file: str, upload_url: str, file_size: int, file_mtime: float) -> None:
+    """
+    Save the upload URL of a file version, so an interrupted upload can resume.
+    """
+    with open(state_file, "w") as file:
+        json.dump({"upload_url": upload_url, "file_size": file_size, "file_mtime": file_mtime}, file)
 
 
 class OneDriveLib:
-    def __init__(self, base_url: str = "https://graph.microsoft.com/v1.0/me/drive/"):
+    def __init__(
+        self,
+        base_url: str = "https://graph.microsoft.com/v1.0/me/drive/",
+        client: GraphClient = None,
+        metadata_store: OneDriveMetadataStore = None,
+    ):
         """
         Initialize the OneDriveLib instance with a base URL.
 
         Args:
             base_url (str): The base URL for OneDrive API. Defaults to Microsoft Graph API endpoint for OneDrive.
+            client (GraphClient): Shared HTTP transport. Defaults to the process-wide client.
+            metadata_store (OneDriveMetadataStore): Optional local metadata mirror that
+                folder listings are recorded into.
         """
         self.base_url = base_url
+        self.client = client or get_default_client()
+        self.metadata_store = metadata_store
 
     def get_file_url(self, folder_id: str, file_name: str) -> str:
         """
@@ -28,25 +91,73 @@ class OneDriveLib:
         Generate the URL to access a folder.
         """
         return f"{self.base_url}items/{folder_id}"
+
+    def get_children_url(self, folder_id: str) -> str:
+        """
+        Generate the URL listing the children of a folder, or of the root for "root".
+        """
+        if folder_id == "root":
+            return f"{self.base_url}root/children"
+        return self.get_folder_url(folder_id) + "/children"
     
-    def list_root_objects(self, access_token: str) -> list:
-        """List all objects in the OneDrive root folder."""
-        url = f"{self.base_url}/root/children"
+    def _iter_children(self, access_token: str, folder_id: str, page_size: int = None, select=None, expand=None):
+        """
+        Yield the children of a folder (or "root") across all pages, recording
+        them in the metadata store if one is configured. A select projection is
+        widened by the fields the metadata store needs.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails.
+        """
+        url = self.get_children_url(folder_id)
+        if self.metadata_store is not None:
+            select = merge_select(select, METADATA_SELECT)
+        items = self.client.iter_collection(
+            url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+        )
+        if self.metadata_store is not None:
+            items = self.metadata_store.record_listing(folder_id, items)
+        return items
+
+    def iter_root_objects(self, access_token: str, page_size: int = None, select=None, expand=None):
+        """
+        Lazily yield all objects in the OneDrive root folder, following @odata.nextLink.
+
+        Args:
+            access_token (str): The access token for authentication.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). None returns full items.
+            expand (str | list[str]): Relationships to inline ($expand).
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails, so a
+                failed page never looks like the end of the listing.
+        """
         try:
-            response = requests.get(url, headers=get_headers(access_token))
-            response.raise_for_status()
-            return response.json().get("value", [])
+            yield from self._iter_children(access_token, "root", page_size, select, expand)
         except requests.exceptions.RequestException as e:
             log_operation(
                 "error",
                 f"Error fetching folder contents for ROOT Folder: {str(e)}",
                 operation="list_root_objects",
-            ) 
+            )
+            raise
+
+    def list_root_objects(self, access_token: str, page_size: int = None, select=None, expand=None) -> list:
+        """
+        List all objects in the OneDrive root folder.
+
+        Returns:
+            list: All objects, or an empty list if any page could not be fetched.
+        """
+        try:
+            return list(self.iter_root_objects(access_token, page_size, select, expand))
+        except requests.exceptions.RequestException:
             return []
 
-    def find_onenote_notebook(self, access_token, notebook_name: str):
+    def find_onenote_notebook(self, access_token, notebook_name: str, select=NOTEBOOK_SEARCH_SELECT):
         """Find a OneNote notebook in the root folder by name."""
-        objects = self.list_root_objects(access_token)
+        objects = self.list_root_objects(access_token, select=select)
         for obj in objects:
             log_operation(
                     "info",
@@ -64,22 +175,52 @@ class OneDriveLib:
                 return obj
         return None
 
-    def get_folder_content(self, access_token: str, folder_id: str) -> dict:
+    def iter_folder_content(
+        self, access_token: str, folder_id: str, page_size: int = None, select=None, expand=None
+    ):
+        """
+        Lazily yield the items of a folder, following @odata.nextLink.
+
+        Args:
+            access_token (str): The access token for authentication.
+            folder_id (str): The ID of the folder.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). None returns full items.
+            expand (str | list[str]): Relationships to inline ($expand).
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails, so a
+                failed page never looks like the end of the listing.
+        """
+        try:
+            yield from self._iter_children(access_token, folder_id, page_size, select, expand)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error fetching folder contents for ID {folder_id}: {str(e)}",
+                operation="get_folder_contents",
+                object=folder_id,
+            )
+            raise
+
+    def get_folder_content(
+        self, access_token: str, folder_id: str, page_size: int = None, select=None, expand=None
+    ) -> dict:
         """
         Fetch the contents of a folder from OneDrive.
 
         Args:
             access_token (str): The access token for authentication.
             folder_id (str): The ID of the folder.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). None returns full items.
+            expand (str | list[str]): Relationships to inline ($expand).
 
         Returns:
-            dict: The contents of the folder.
+            dict: The contents of the folder, with the items of all pages under "value".
         """
-        url = f"https://graph.microsoft.com/v1.0/me/drive/items/{folder_id}/children"
         try:
-            response = requests.get(url, headers=get_headers(access_token))
-            response.raise_for_status()
-            return response.json()
+            return {"value": list(self._iter_children(access_token, folder_id, page_size, select, expand))}
         except requests.exceptions.RequestException as e:
             log_operation(
                 "error",
@@ -89,17 +230,111 @@ class OneDriveLib:
             )
             return None
 
-    def get_folders(self, access_token: str, base_url: str = None) -> dict:
+    def list_children_cached(self, access_token: str, folder_id: str, max_age: float = 300) -> list[dict]:
+        """
+        List the children of a folder from the metadata store, fetching and
+        recording them first if the stored listing is missing or older than max_age
+        seconds. Without a metadata store, the folder is listed live.
+
+        Returns:
+            list[dict]: Metadata store rows of the children (id, parent_id, name,
+            path, is_folder, size, etag, ctag, last_modified, fetched_at), or the
+            raw Graph items if no store is configured. None if the folder had to
+            be listed and the listing failed.
+        """
+        try:
+            if self.metadata_store is None:
+                return list(self.iter_folder_content(access_token, folder_id, select=METADATA_SELECT))
+            children = self.metadata_store.list_children(folder_id, max_age)
+            if children is None:
+                for _ in self.iter_folder_content(access_token, folder_id, select=METADATA_SELECT):
+                    pass
+                children = self.metadata_store.list_children(folder_id) or []
+            return children
+        except requests.exceptions.RequestException:
+            return None
+
+    def resolve_path(self, access_token: str, path: str, max_age: float = 300) -> dict:
+        """
+        Resolve a drive path such as "/Documents/report.pdf" to its item.
+
+        The metadata store is consulted first; on a miss or a row older than max_age
+        seconds, the item is fetched by path and recorded.
+
+        Returns:
+            dict: Metadata store row of the item (the raw Graph item if no store is
+            configured), or None if it does not exist.
+        """
+        if self.metadata_store is not None:
+            item = self.metadata_store.get_item_by_path(path, max_age)
+            if item is not None:
+                return item
+        url = f"{self.base_url}root:/{path.strip('/')}" if path.strip("/") else f"{self.base_url}root"
+        try:
+            response = self.client.get(url, headers=get_headers(access_token))
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error resolving path '{path}': {str(e)}",
+                operation="resolve_path",
+                object=path,
+            )
+            return None
+        if self.metadata_store is None:
+            return response.json()
+        self.metadata_store.upsert_items([response.json()])
+        return self.metadata_store.get_item(response.json()["id"])
+
+    def search_items(self, query: str, limit: int = 20, prefix: bool = False, fuzzy: bool = False, **options) -> list[dict]:
+        """
+        Search the items recorded in the metadata store by name and path, without
+        any network call. Only items seen by earlier listings, path lookups or
+        delta syncs are found. Requires a metadata store.
+
+        Args:
+            query (str): Text to search for.
+            limit (int): Maximum number of results.
+            prefix (bool): Match names starting with query.
+            fuzzy (bool): Tolerate typos in query.
+            options: Further OneDriveMetadataStore.search options (folders_only).
+
+        Returns:
+            list[dict]: Metadata store rows of the matches, best first.
+
+        Raises:
+            ValueError: If no metadata store is configured.
+        """
+        if self.metadata_store is None:
+            raise ValueError("search_items needs a metadata store; pass metadata_store to OneDriveLib")
+        return self.metadata_store.search(query, limit=limit, prefix=prefix, fuzzy=fuzzy, **options)
+
+    def get_folders(
+        self,
+        access_token: str,
+        base_url: str = None,
+        page_size: int = None,
+        select=FOLDER_TREE_SELECT,
+        as_tree: bool = False,
+    ):
         """
         Recursively fetch all folders and subfolders in OneDrive starting from the base URL.
         
         Args:
             access_token (str): Access token for authorization.
             base_url (str): Base URL to start fetching folders. Defaults to the root directory.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). Must include id, name and folder.
+            as_tree (bool): Build a compact DriveItemTree instead of nested dictionaries.
 
         Returns:
-            dict: A nested dictionary representing the folder structure.
+            dict: A nested dictionary representing the folder structure, or a
+            DriveItemTree if as_tree is set.
         """
+        if as_tree:
+            return self._get_folder_tree(access_token, base_url, page_size, select)
         log_operation(
                 "info",
                 f"Start Folder: (URL: {base_url})",
@@ -111,10 +346,9 @@ class OneDriveLib:
         folder_structure = {}
 
         try:
-            response = requests.get(base_url, headers=get_headers(access_token))
-            response.raise_for_status()
-            items = response.json().get("value", [])
-            
+            items = self.client.iter_collection(
+                base_url, headers=get_headers(access_token), params=get_page_params(page_size, select)
+            )
             for item in items:
                 if item.get("folder"):  # Check if the item is a folder
                     folder_name = item["name"]
@@ -127,7 +361,7 @@ class OneDriveLib:
                         )
                     folder_structure[folder_name] = {
                         "FolderURL": folder_url,
-                        "Subfolders": self.get_folders(access_token, folder_url + "/children"),
+                        "Subfolders": self.get_folders(access_token, folder_url + "/children", page_size, select),
                     }
                 else:
                     log_operation(
@@ -145,19 +379,175 @@ class OneDriveLib:
             )
             return {}
 
-    def create_directory(self, access_token: str, folder_name: str) -> dict:
+    def open_folder_tree(
+        self, access_token: str, folder_id: str = "root", ttl: float = 300, prefetch: bool = False, **options
+    ) -> LazyFolderTree:
         """
-        Create a new directory in the root of OneDrive.
+        Open a folder tree that lists folders only when they are accessed, as an
+        alternative to fetching the whole tree with get_folders.
+
+        Args:
+            access_token (str): Access token for authorization.
+            folder_id (str): ID of the folder the tree starts from. Defaults to the root.
+            ttl (float): Seconds a folder listing stays cached.
+            prefetch (bool): List the subfolders of every opened folder in the background.
+            options: Further LazyFolderTree options (max_workers, page_size).
+
+        Returns:
+            LazyFolderTree: The tree; close it to stop background prefetching.
         """
-        url = f"{self.base_url}root/children"
+        return LazyFolderTree(self, access_token, folder_id, ttl=ttl, prefetch=prefetch, **options)
+
+    def _get_folder_tree(
+        self, access_token: str, base_url: str = None, page_size: int = None, select=FOLDER_TREE_SELECT
+    ) -> DriveItemTree:
+        """
+        Fetch the folder tree depth-first into a DriveItemTree. Folders whose
+        listing fails are kept without children.
+        """
+        tree = DriveItemTree()
+        pending = [(0, base_url or self.base_url + "root/children")]
+        while pending:
+            parent_index, children_url = pending.pop()
+            try:
+                for item in self.list_child_folders(access_token, children_url, page_size, select):
+                    index = tree.add_item(parent_index, item)
+                    pending.append((index, self.get_folder_url(item["id"]) + "/children"))
+            except requests.exceptions.RequestException as e:
+                log_operation(
+                    "error",
+                    f"Error fetching folders: {str(e)}",
+                    operation="get_folders",
+                    object=children_url,
+                )
+        return tree
+
+    def list_child_folders(
+        self, access_token: str, children_url: str, page_size: int = None, select=FOLDER_TREE_SELECT
+    ) -> list[dict]:
+        """
+        Fetch the folder items directly below a children URL, across all pages.
+
+        Args:
+            access_token (str): Access token for authorization.
+            children_url (str): Children URL of the folder, see get_children_url.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). Must include folder.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails.
+        """
+        items = self.client.iter_collection(
+            children_url, headers=get_headers(access_token), params=get_page_params(page_size, select)
+        )
+        return [item for item in items if item.get("folder")]
+
+    def crawl_folders(
+        self,
+        access_token: str,
+        base_url: str = None,
+        max_workers: int = 8,
+        max_depth: int = None,
+        cancel_event: threading.Event = None,
+        page_size: int = None,
+        select=FOLDER_TREE_SELECT,
+        as_tree: bool = False,
+    ):
+        """
+        Fetch the folder tree breadth-first with a bounded pool of worker threads.
+
+        Produces the same nested structure as get_folders, but keeps up to
+        max_workers folder listings in flight and never recurses, so deep trees
+        cannot hit the Python recursion limit.
+
+        Args:
+            access_token (str): Access token for authorization.
+            base_url (str): Children URL to start from. Defaults to the root directory.
+            max_workers (int): Maximum number of concurrent listing requests.
+            max_depth (int): Number of folder levels to fetch; None fetches all levels.
+            cancel_event (threading.Event): When set, pending listings are dropped and
+                the partial structure fetched so far is returned.
+            page_size (int): Items per page ($top). Defaults to the Graph page size.
+            select (str | list[str]): Properties to return ($select). Must include id, name and folder.
+            as_tree (bool): Build a compact DriveItemTree instead of nested dictionaries.
+
+        Returns:
+            dict: A nested dictionary representing the folder structure, or a
+            DriveItemTree if as_tree is set.
+        """
+        base_url = base_url or self.base_url + "root/children"
+        tree = DriveItemTree() if as_tree else None
+        folder_structure = {}
+        if max_depth is not None and max_depth < 1:
+            return tree if as_tree else folder_structure
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending = {
+                executor.submit(self.list_child_folders, access_token, base_url, page_size, select): (
+                    0 if as_tree else folder_structure, 1
+                )
+            }
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    log_operation(
+                        "info",
+                        f"Folder crawl cancelled with {len(pending)} listings pending",
+                        operation="crawl_folders",
+                        object=base_url,
+                    )
+                    break
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # The parent is a tree index with as_tree, otherwise its "Subfolders" dict
+                    parent, depth = pending.pop(future)
+                    try:
+                        items = future.result()
+                    except requests.exceptions.RequestException as e:
+                        log_operation(
+                            "error",
+                            f"Error fetching folders: {str(e)}",
+                            operation="crawl_folders",
+                        )
+                        continue
+                    for item in items:
+                        folder_url = self.get_folder_url(item["id"])
+                        if as_tree:
+                            child = tree.add_item(parent, item)
+                        else:
+                            node = {"FolderURL": folder_url, "Subfolders": {}}
+                            parent[item["name"]] = node
+                            child = node["Subfolders"]
+                        if max_depth is None or depth < max_depth:
+                            future = executor.submit(
+                                self.list_child_folders, access_token, folder_url + "/children", page_size, select
+                            )
+                            pending[future] = (child, depth + 1)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return tree if as_tree else folder_structure
+
+    def create_directory(
+        self, access_token: str, folder_name: str, parent_id: str = None, conflict_behavior: str = "rename"
+    ) -> dict:
+        """
+        Create a new directory in the root of OneDrive, or below parent_id if given.
+
+        Args:
+            conflict_behavior (str): "rename", "replace" or "fail" if the name exists.
+        """
+        if parent_id is None:
+            url = f"{self.base_url}root/children"
+        else:
+            url = self.get_folder_url(parent_id) + "/children"
         
         data = {
             "name": folder_name,
             "folder": {},
-            "@microsoft.graph.conflictBehavior": "rename",
+            "@microsoft.graph.conflictBehavior": conflict_behavior,
         }
         try:
-            response = requests.post(url, json=data, headers=get_headers(access_token))
+            response = self.client.post(url, json=data, headers=get_headers(access_token))
             response.raise_for_status()
             folder_id = response.json().get("id")
             log_operation(
@@ -176,9 +566,20 @@ class OneDriveLib:
             )
             return None
 
-    def upload_file_to_directory(self, access_token: str, folder_id: str, file_path: str, file_name: str) -> dict:
+    def upload_file_to_directory(
+        self,
+        access_token: str,
+        folder_id: str,
+        file_path: str,
+        file_name: str,
+        large_file_threshold: int = SIMPLE_UPLOAD_LIMIT,
+        state_file: str = None,
+    ) -> dict:
         """
         Upload a file to a specific directory in OneDrive.
+
+        Files larger than large_file_threshold are sent in chunks through an
+        upload session (see upload_large_file); smaller files use a single PUT.
         """
         if not os.path.isfile(os.path.join(file_path, file_name)):
             log_operation(
@@ -189,11 +590,14 @@ class OneDriveLib:
             )
             return None
 
+        if os.path.getsize(os.path.join(file_path, file_name)) > large_file_threshold:
+            return self.upload_large_file(access_token, folder_id, file_path, file_name, state_file=state_file)
+
         url = self.get_file_url(folder_id, file_name)
         
         try:
             with open(os.path.join(file_path, file_name), "rb") as file_data:
-                response = requests.put(url, data=file_data, headers=get_headers(access_token))
+                response = self.client.put(url, data=file_data, headers=get_headers(access_token))
             response.raise_for_status()
             file_id = response.json().get("id")
             log_operation(
@@ -212,25 +616,351 @@ class OneDriveLib:
             )
             return None
 
+    def create_upload_session(self, access_token: str, folder_id: str, file_name: str) -> dict:
+        """
+        Create an upload session for a file in a folder.
+
+        Returns:
+            dict: The session, including uploadUrl and nextExpectedRanges.
+        """
+        url = f"{self.base_url}items/{folder_id}:/{file_name}:/createUploadSession"
+        data = {"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+        response = self.client.post(url, json=data, headers=get_headers(access_token))
+        response.raise_for_status()
+        return response.json()
+
+    def _get_next_upload_offset(self, upload_url: str) -> int:
+        """
+        Ask the upload session which byte it expects next.
+        """
+        response = self.client.get(upload_url)
+        response.raise_for_status()
+        ranges = response.json().get("nextExpectedRanges") or ["0-"]
+        return int(ranges[0].split("-")[0])
+
+    def _upload_session_ranges(
+        self,
+        upload_url: str,
+        buffer: memoryview,
+        start: int,
+        chunk_size: int,
+        max_retries: int,
+        total: int = None,
+        buffer_offset: int = 0,
+    ) -> dict:
+        """
+        Send the bytes from offset start onwards to an upload session in chunk_size byte ranges.
+
+        A range failing with a connection error, 416, 429 or 5xx is retried up to
+        max_retries times with exponential backoff; before each retry the session is
+        asked for its next expected byte, so a range the server already stored is
+        not sent twice.
+
+        The buffer normally holds the whole upload. For streamed uploads it is a
+        window holding bytes buffer_offset to buffer_offset + len(buffer) of an
+        upload of total bytes.
+
+        Returns:
+            dict: The drive item created once the last range is accepted, or None
+            if the window was sent and the session expects further bytes.
+
+        Raises:
+            ValueError: If the session asks for bytes before the window.
+        """
+        total = len(buffer) if total is None else total
+        window_end = buffer_offset + len(buffer)
+        offset = start
+        attempt = 0
+        while offset < window_end:
+            if offset < buffer_offset:
+                raise ValueError(f"Upload session expects byte {offset}, which is no longer buffered")
+            end = min(offset + chunk_size, window_end)
+            headers = {
+                "Content-Length": str(end - offset),
+                "Content-Range": f"bytes {offset}-{end - 1}/{total}",
+            }
+            try:
+                # The upload URL is pre-authenticated; it must not carry the Authorization header
+                with buffer[offset - buffer_offset:end - buffer_offset] as chunk:
+                    response = self.client.put(upload_url, data=chunk, headers=headers)
+                if response.status_code in (200, 201):
+                    return response.json()
+                response.raise_for_status()
+                ranges = response.json().get("nextExpectedRanges") or [f"{end}-"]
+                offset = int(ranges[0].split("-")[0])
+                attempt = 0
+            except requests.exceptions.RequestException as e:
+                status = getattr(e.response, "status_code", None)
+                retryable = status is None or status >= 500 or status in (416, 429)
+                if not retryable or attempt >= max_retries:
+                    raise
+                attempt += 1
+                log_operation(
+                    "info",
+                    f"Retrying range {offset}-{end - 1} (attempt {attempt}): {str(e)}",
+                    operation="upload_large_file",
+                    object=upload_url,
+                )
+                time.sleep(min(2 ** attempt, 30))
+                try:
+                    offset = self._get_next_upload_offset(upload_url)
+                except requests.exceptions.RequestException:
+                    pass
+        return None
+
+    def _put_content(self, access_token: str, folder_id: str, file_name: str, data, size: int) -> dict:
+        """
+        Upload content with a single PUT, which Graph accepts up to SIMPLE_UPLOAD_LIMIT bytes.
+        """
+        headers = get_headers(access_token)
+        headers["Content-Length"] = str(size)
+        response = self.client.put(self.get_file_url(folder_id, file_name), data=data, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def _upload_buffer(
+        self, access_token: str, folder_id: str, file_name: str, buffer: memoryview,
+        large_file_threshold: int, chunk_size: int, max_retries: int,
+    ) -> dict:
+        """
+        Upload an in-memory buffer with a single PUT or, above large_file_threshold,
+        as ranges of an upload session. Ranges are slices of the buffer, not copies.
+        """
+        if len(buffer) <= large_file_threshold:
+            return self._put_content(access_token, folder_id, file_name, buffer, len(buffer))
+        upload_url = self.create_upload_session(access_token, folder_id, file_name)["uploadUrl"]
+        return self._upload_session_ranges(upload_url, buffer, 0, chunk_size, max_retries)
+
+    def _upload_stream(
+        self, access_token: str, folder_id: str, file_name: str, stream, size: int,
+        large_file_threshold: int, chunk_size: int, max_retries: int,
+    ) -> dict:
+        """
+        Upload size bytes read from a file-like object.
+
+        Small uploads are read whole and sent with a single PUT. Larger ones are
+        read into a reused window of chunk_size bytes, each window sent as one
+        session range, so memory use stays at one chunk regardless of the upload size.
+        """
+        if size <= large_file_threshold:
+            data = read_fully(stream, size)
+            if len(data) < size:
+                raise ValueError(f"Stream ended after {len(data)} of {size} bytes")
+            return self._put_content(access_token, folder_id, file_name, data, size)
+
+        upload_url = self.create_upload_session(access_token, folder_id, file_name)["uploadUrl"]
+        window = bytearray(chunk_size)
+        offset = 0
+        while True:
+            with memoryview(window) as view:
+                filled = 0
+                while filled < chunk_size:
+                    read = stream.readinto(view[filled:])
+                    if not read:
+                        break
+                    filled += read
+                if filled == 0 or (filled < chunk_size and offset + filled < size):
+                    raise ValueError(f"Stream ended after {offset + filled} of {size} bytes")
+                with view[:filled] as chunk:
+                    item = self._upload_session_ranges(
+                        upload_url, chunk, offset, chunk_size, max_retries, total=size, buffer_offset=offset
+                    )
+            if item is not None:
+                return item
+            offset += filled
+
+    def upload_content(
+        self,
+        access_token: str,
+        folder_id: str,
+        file_name: str,
+        content,
+        size: int = None,
+        large_file_threshold: int = SIMPLE_UPLOAD_LIMIT,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 5,
+    ) -> dict:
+        """
+        Upload content that is not a local file, e.g. a generated report.
+
+        Content up to large_file_threshold bytes is sent with a single PUT, larger
+        content through an upload session, without writing it to disk first:
+        bytes-like objects are sliced in place, streams are read one chunk at a time.
+
+        Args:
+            access_token (str): The access token for authentication.
+            folder_id (str): The ID of the target folder.
+            file_name (str): Name of the file in OneDrive.
+            content: bytes, bytearray or memoryview; a binary file-like object
+                (read from its current position); or an iterable of byte chunks.
+            size (int): Number of bytes of a stream or iterable. Determined from the
+                stream if it is seekable; an iterable of unknown size larger than
+                large_file_threshold is spooled to a temporary file, since an upload
+                session needs the total size up front.
+            large_file_threshold (int): Largest size sent with a single PUT.
+            chunk_size (int): Bytes per range, rounded down to a multiple of 320 KiB.
+            max_retries (int): Retries per range before giving up.
+
+        Returns:
+            dict: The uploaded drive item, or None on failure.
+        """
+        chunk_size = max(UPLOAD_FRAGMENT_UNIT, chunk_size - chunk_size % UPLOAD_FRAGMENT_UNIT)
+        try:
+            if isinstance(content, io.BytesIO):
+                content = content.getbuffer()[content.tell():]
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                with memoryview(content) as view, view.cast("B") as buffer:
+                    item = self._upload_buffer(
+                        access_token, folder_id, file_name, buffer, large_file_threshold, chunk_size, max_retries
+                    )
+            else:
+                stream = content if hasattr(content, "read") else io.BufferedReader(ChunkReader(content))
+                if size is None and stream.seekable():
+                    position = stream.tell()
+                    size = stream.seek(0, io.SEEK_END) - position
+                    stream.seek(position)
+                if size is not None:
+                    item = self._upload_stream(
+                        access_token, folder_id, file_name, stream, size, large_file_threshold, chunk_size, max_retries
+                    )
+                else:
+                    head = read_fully(stream, large_file_threshold + 1)
+                    if len(head) <= large_file_threshold:
+                        item = self._put_content(access_token, folder_id, file_name, head, len(head))
+                    else:
+                        with tempfile.TemporaryFile() as spool:
+                            spool.write(head)
+                            shutil.copyfileobj(stream, spool, DOWNLOAD_STREAM_BLOCK)
+                            size = spool.tell()
+                            spool.seek(0)
+                            item = self._upload_stream(
+                                access_token, folder_id, file_name, spool, size,
+                                large_file_threshold, chunk_size, max_retries,
+                            )
+            log_operation(
+                "info",
+                f"File uploaded: {file_name} to folder {folder_id} (ID: {item.get('id')})",
+                operation="upload_content",
+                object=file_name,
+            )
+            return item
+        except (requests.exceptions.RequestException, OSError, ValueError, TypeError) as e:
+            log_operation(
+                "error",
+                f"Error uploading '{file_name}': {str(e)}",
+                operation="upload_content",
+                object=file_name,
+            )
+            return None
+
+    def upload_large_file(
+        self,
+        access_token: str,
+        folder_id: str,
+        file_path: str,
+        file_name: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 5,
+        state_file: str = None,
+    ) -> dict:
+        """
+        Upload a large file to a directory in OneDrive through an upload session.
+
+        The file is memory-mapped and sent in fixed-size byte ranges, so it is never
+        read into memory as a whole. Graph requires the ranges of one session to
+        arrive in order, so they are sent sequentially over the pooled connection.
+
+        Args:
+            access_token (str): The access token for authentication.
+            folder_id (str): The ID of the target folder.
+            file_path (str): Local directory of the file.
+            file_name (str): Name of the file, used locally and in OneDrive.
+            chunk_size (int): Bytes per range, rounded down to a multiple of 320 KiB.
+            max_retries (int): Retries per range before giving up.
+            state_file (str): Optional path where the session is persisted. If the
+                upload is interrupted, calling again with the same state_file resumes
+                at the first byte the server has not received yet.
+
+        Returns:
+            dict: The uploaded drive item, or None on failure.
+        """
+        local_file = os.path.join(file_path, file_name)
+        chunk_size = max(UPLOAD_FRAGMENT_UNIT, chunk_size - chunk_size % UPLOAD_FRAGMENT_UNIT)
+        try:
+            file_size = os.path.getsize(local_file)
+            file_mtime = os.path.getmtime(local_file)
+            upload_url = load_upload_state(state_file, file_size, file_mtime)
+            start = 0
+            if upload_url:
+                try:
+                    start = self._get_next_upload_offset(upload_url)
+                    log_operation(
+                        "info",
+                        f"Resuming upload of {file_name} at byte {start}",
+                        operation="upload_large_file",
+                        object=file_name,
+                    )
+                except requests.exceptions.RequestException:
+                    # Session expired or was cancelled: start a new one
+                    upload_url = None
+            if not upload_url:
+                upload_url = self.create_upload_session(access_token, folder_id, file_name)["uploadUrl"]
+                if state_file:
+                    save_upload_state(state_file, upload_url, file_size, file_mtime)
+
+            with open(local_file, "rb") as file_data, \
+                    mmap.mmap(file_data.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffer = memoryview(mapped)
+                try:
+                    item = self._upload_session_ranges(upload_url, buffer, start, chunk_size, max_retries)
+                finally:
+                    buffer.release()
+
+            if state_file and os.path.isfile(state_file):
+                os.remove(state_file)
+            log_operation(
+                "info",
+                f"File uploaded: {file_name} to folder {folder_id} (ID: {item.get('id')})",
+                operation="upload_large_file",
+                object=file_name,
+            )
+            return item
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            log_operation(
+                "error",
+                f"Error uploading file '{file_name}': {str(e)}",
+                operation="upload_large_file",
+                object=file_name,
+            )
+            return None
+
     def download_file(self, access_token: str, folder_id: str, destination_path: str, file_name: str) -> None:
         """
         Download a file from OneDrive to the specified destination.
+
+        The file is written to a temporary ".part" file that is renamed into place
+        once complete, so an error never leaves a truncated file behind.
         """
         url = self.get_file_url(folder_id, file_name)
+        local_file = os.path.join(destination_path, file_name)
+        part_file = local_file + ".part"
         
         try:
-            response = requests.get(url, headers=get_headers(access_token), stream=True)
+            response = self.client.get(url, headers=get_headers(access_token), stream=True)
             response.raise_for_status()
-            with open(os.path.join(destination_path, file_name), "wb") as file:
-                for chunk in response.iter_content(chunk_size=8192):
+            with open(part_file, "wb") as file:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_STREAM_BLOCK):
                     file.write(chunk)
+            os.replace(part_file, local_file)
             log_operation(
                 "info",
                 f"File downloaded: {file_name} to {destination_path}",
                 operation="download_file",
                 object=file_name,
             )
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, OSError) as e:
+            if os.path.isfile(part_file):
+                os.remove(part_file)
             log_operation(
                 "error",
                 f"Error downloading file '{file_name}': {str(e)}",
@@ -238,20 +968,543 @@ class OneDriveLib:
                 object=file_name,
             )
 
-    def delete_folder_and_contents(self, access_token: str, folder_id: str) -> None:
+    def get_item_by_path(self, access_token: str, folder_id: str, file_name: str) -> dict:
         """
-        Delete a folder and all its contents from OneDrive.
+        Fetch the metadata of a file in a folder, including size, eTag and the
+        pre-authenticated @microsoft.graph.downloadUrl.
         """
-        url = self.get_folder_url(folder_id) + "/children"
-        
+        url = f"{self.base_url}items/{folder_id}:/{file_name}"
+        response = self.client.get(url, headers=get_headers(access_token))
+        response.raise_for_status()
+        return response.json()
+
+    def _download_segment(self, download_url: str, part_file: str, start: int, end: int, max_retries: int) -> None:
+        """
+        Fetch bytes start..end (inclusive) with a Range request and write them at the
+        same offset of the preallocated part file.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self.client.get(download_url, headers={"Range": f"bytes={start}-{end}"}, stream=True)
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise ValueError(f"Server ignored range request (status {response.status_code})")
+                with open(part_file, "r+b") as file:
+                    file.seek(start)
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_STREAM_BLOCK):
+                        file.write(chunk)
+                    if file.tell() != end + 1:
+                        raise requests.exceptions.ChunkedEncodingError(f"Short read for range {start}-{end}")
+                return
+            except requests.exceptions.RequestException as e:
+                if attempt >= max_retries:
+                    raise
+                attempt += 1
+                log_operation(
+                    "info",
+                    f"Retrying range {start}-{end} (attempt {attempt}): {str(e)}",
+                    operation="download_file_ranged",
+                    object=part_file,
+                )
+                time.sleep(min(2 ** attempt, 30))
+
+    def download_file_ranged(
+        self,
+        access_token: str,
+        folder_id: str,
+        destination_path: str,
+        file_name: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = 4,
+        max_retries: int = 3,
+    ) -> str:
+        """
+        Download a file from OneDrive with concurrent HTTP Range requests.
+
+        The file is split into chunk_size segments that are fetched by up to
+        max_workers threads into a preallocated ".part" file. Finished segments are
+        recorded in a ".part.json" file next to it, so a failed or interrupted
+        download resumes with the missing segments only, as long as the remote
+        eTag has not changed. The part file is renamed into place once complete.
+
+        Args:
+            access_token (str): The access token for authentication.
+            folder_id (str): The ID of the folder containing the file.
+            destination_path (str): Local directory to write the file to.
+            file_name (str): Name of the file.
+            chunk_size (int): Bytes per range request.
+            max_workers (int): Maximum number of concurrent range requests.
+            max_retries (int): Retries per segment before giving up.
+
+        Returns:
+            str: Path of the downloaded file, or None on failure.
+        """
+        local_file = os.path.join(destination_path, file_name)
+        part_file = local_file + ".part"
+        state_file = part_file + ".json"
+
+        try:
+            item = self.get_item_by_path(access_token, folder_id, file_name)
+            size = item["size"]
+            download_url = item.get("@microsoft.graph.downloadUrl") or self.get_file_url(folder_id, file_name)
+            state = {"eTag": item.get("eTag"), "size": size, "chunk_size": chunk_size, "done": []}
+
+            if os.path.isfile(state_file) and os.path.isfile(part_file):
+                try:
+                    with open(state_file, "r") as file:
+                        saved = json.load(file)
+                    if all(saved.get(key) == state[key] for key in ("eTag", "size", "chunk_size")):
+                        state = saved
+                except (OSError, json.JSONDecodeError):
+                    pass
+            if not state["done"]:
+                with open(part_file, "wb") as file:
+                    file.truncate(size)
+
+            done = set(state["done"])
+            segments = [
+                (start, min(start + chunk_size, size) - 1)
+                for start in range(0, size, chunk_size)
+                if start not in done
+            ]
+            if segments:
+                log_operation(
+                    "info",
+                    f"Downloading {file_name}: {len(segments)} of {len(range(0, size, chunk_size))} segments",
+                    operation="download_file_ranged",
+                    object=file_name,
+                )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._download_segment, download_url, part_file, start, end, max_retries): start
+                    for start, end in segments
+                }
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        state["done"].append(futures[future])
+                        with open(state_file, "w") as file:
+                            json.dump(state, file)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            os.replace(part_file, local_file)
+            if os.path.isfile(state_file):
+                os.remove(state_file)
+            log_operation(
+                "info",
+                f"File downloaded: {file_name} to {destination_path}",
+                operation="download_file_ranged",
+                object=file_name,
+            )
+            return local_file
+        except (requests.exceptions.RequestException, OSError, ValueError, KeyError) as e:
+            log_operation(
+                "error",
+                f"Error downloading file '{file_name}': {str(e)}",
+                operation="download_file_ranged",
+                object=file_name,
+            )
+            return None
+
+    def get_items_metadata(self, access_token: str, item_ids: list[str]) -> dict:
+        """
+        Fetch the metadata of many drive items through Graph batching.
+
+        Returns:
+            dict: Item ID -> item metadata, for all items that could be fetched.
+        """
+        sub_requests = [
+            {"id": str(index), "method": "GET", "url": self.get_folder_url(item_id)}
+            for index, item_id in enumerate(item_ids)
+        ]
         try:
-            response = requests.get(url, headers=get_headers(access_token))
+            responses = self.client.execute_batch(access_token, sub_requests, graph_root=get_graph_root(self.base_url))
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error fetching metadata for {len(item_ids)} items: {str(e)}",
+                operation="get_items_metadata",
+            )
+            return {}
+        items = {}
+        for index, item_id in enumerate(item_ids):
+            response = responses.get(str(index), {})
+            if response.get("status") == 200:
+                items[item_id] = response["body"]
+            else:
+                log_operation(
+                    "error",
+                    f"Error fetching metadata for item '{item_id}': status {response.get('status')}",
+                    operation="get_items_metadata",
+                    object=item_id,
+                )
+        return items
+
+    def _copy_request(self, item_id: str, parent_id: str, name: str, conflict_behavior: str) -> dict:
+        """
+        Build the $batch sub-request starting a server-side copy.
+        """
+        body = {"parentReference": {"id": parent_id}}
+        if name:
+            body["name"] = name
+        return {
+            "method": "POST",
+            "url": f"{self.get_folder_url(item_id)}/copy?@microsoft.graph.conflictBehavior={conflict_behavior}",
+            "headers": {"Content-Type": "application/json"},
+            "body": body,
+        }
+
+    def start_copy(
+        self, access_token: str, item_id: str, parent_id: str, name: str = None, conflict_behavior: str = "rename"
+    ) -> str:
+        """
+        Start a server-side copy of an item (a folder is copied with its contents).
+
+        Args:
+            access_token (str): The access token for authentication.
+            item_id (str): The ID of the item to copy.
+            parent_id (str): The ID of the destination folder.
+            name (str): Optional new name of the copy.
+            conflict_behavior (str): "rename", "replace" or "fail" if the name is taken.
+
+        Returns:
+            str: The monitor URL to poll with get_copy_status.
+
+        Raises:
+            requests.exceptions.RequestException: If the copy could not be started.
+        """
+        request = self._copy_request(item_id, parent_id, name, conflict_behavior)
+        response = self.client.post(request["url"], json=request["body"], headers=get_headers(access_token))
+        response.raise_for_status()
+        return response.headers["Location"]
+
+    def get_copy_status(self, monitor_url: str) -> dict:
+        """
+        Poll the monitor URL of a server-side copy. The URL is pre-authenticated.
+
+        Once the copy has finished, the monitor may redirect to the new item on
+        Graph, which would need the access token. The redirect is not followed;
+        the item ID is taken from its Location header instead.
+
+        Returns:
+            dict: {"status": "notStarted" | "inProgress" | "completed" | "failed" | ...,
+            "percentageComplete": float, "resourceId": ID of the copy once known}.
+
+        Raises:
+            requests.exceptions.RequestException: If the monitor cannot be reached.
+        """
+        response = self.client.get(monitor_url, allow_redirects=False)
+        if response.is_redirect:
+            location = urlparse(response.headers.get("Location", ""))
+            _, _, item_id = location.path.rpartition("/items/")
+            return {"status": "completed", "percentageComplete": 100.0, "resourceId": item_id.split("/")[0] or None}
+        response.raise_for_status()
+        body = response.json()
+        if "status" not in body:
+            # Some monitors answer with the new item itself
+            return {"status": "completed", "percentageComplete": 100.0, "resourceId": body.get("id")}
+        return {
+            "status": body["status"],
+            "percentageComplete": body.get("percentageComplete", 0.0),
+            "resourceId": body.get("resourceId"),
+        }
+
+    def copy_item(
+        self,
+        access_token: str,
+        item_id: str,
+        parent_id: str,
+        name: str = None,
+        conflict_behavior: str = "rename",
+        poll_interval: float = 1.0,
+        timeout: float = None,
+    ) -> dict:
+        """
+        Copy an item server-side and wait for the copy to finish.
+
+        Returns:
+            dict: The final copy status (see get_copy_status), or None on failure.
+        """
+        results = self.copy_items(
+            access_token,
+            [{"id": item_id, "parent_id": parent_id, "name": name}],
+            conflict_behavior=conflict_behavior,
+            poll_interval=poll_interval,
+            timeout=timeout,
+        )
+        status = results[0]
+        return status if status["status"] == "completed" else None
+
+    def copy_items(
+        self,
+        access_token: str,
+        copies: list[dict],
+        conflict_behavior: str = "rename",
+        max_workers: int = 8,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 15.0,
+        timeout: float = None,
+        progress_callback=None,
+    ) -> list[dict]:
+        """
+        Run many server-side copies and track them until all have finished.
+
+        The copies are started through Graph batching. All running jobs are then
+        polled together: each round polls every pending monitor concurrently, and
+        the pause between rounds grows from poll_interval up to max_poll_interval
+        while no job changes state, so long-running copies cost few requests.
+
+        Args:
+            access_token (str): The access token for authentication.
+            copies (list[dict]): Jobs with "id" (item to copy), "parent_id"
+                (destination folder) and optionally "name".
+            conflict_behavior (str): "rename", "replace" or "fail" if the name is taken.
+            max_workers (int): Number of concurrent monitor polls.
+            poll_interval (float): Initial pause between polling rounds, in seconds.
+            max_poll_interval (float): Longest pause between polling rounds.
+            timeout (float): Give up on jobs still running after this many seconds.
+            progress_callback: Optional callable(index, status) invoked whenever
+                a job's status or progress changes; index is the job's position
+                in copies.
+
+        Returns:
+            list[dict]: The final status of every job, in the order of copies, so
+            one item copied to several destinations gets one entry per copy. Jobs
+            that could not be started or tracked have status "failed", jobs still
+            running at the timeout keep their last status.
+        """
+        results = {}
+        sub_requests = [
+            dict(self._copy_request(copy["id"], copy["parent_id"], copy.get("name"), conflict_behavior), id=str(index))
+            for index, copy in enumerate(copies)
+        ]
+        try:
+            responses = self.client.execute_batch(access_token, sub_requests, graph_root=get_graph_root(self.base_url))
+        except requests.exceptions.RequestException as e:
+            log_operation("error", f"Error starting {len(copies)} copies: {str(e)}", operation="copy_items")
+            return [{"status": "failed", "error": str(e)} for _ in copies]
+
+        # Jobs are keyed by their index, since one item may be copied several times
+        monitors = {}
+        for index, copy in enumerate(copies):
+            response = responses.get(str(index), {})
+            headers = {key.lower(): value for key, value in (response.get("headers") or {}).items()}
+            if response.get("status") == 202 and "location" in headers:
+                monitors[index] = headers["location"]
+                results[index] = {"status": "notStarted", "percentageComplete": 0.0, "resourceId": None}
+            else:
+                results[index] = {"status": "failed", "error": response.get("body")}
+                log_operation(
+                    "error",
+                    f"Error starting copy of '{copy['id']}': status {response.get('status')}",
+                    operation="copy_items",
+                    object=copy["id"],
+                )
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = poll_interval
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while monitors:
+                if deadline is not None and time.monotonic() >= deadline:
+                    log_operation(
+                        "error",
+                        f"Timed out with {len(monitors)} copies still running",
+                        operation="copy_items",
+                    )
+                    break
+                time.sleep(interval)
+                futures = {executor.submit(self.get_copy_status, url): index for index, url in monitors.items()}
+                changed = False
+                for future in as_completed(futures):
+                    index = futures[future]
+                    item_id = copies[index]["id"]
+                    try:
+                        status = future.result()
+                    except requests.exceptions.RequestException as e:
+                        # Transient errors are retried by the client; anything left is final
+                        status = {"status": "failed", "error": str(e)}
+                    if status != results[index]:
+                        changed = True
+                        results[index] = status
+                        if progress_callback is not None:
+                            progress_callback(index, status)
+                    if status["status"] in ("completed", "failed", "cancelled", "deletePending"):
+                        del monitors[index]
+                        log_operation(
+                            "info" if status["status"] == "completed" else "error",
+                            f"Copy of {item_id} {status['status']} (new ID: {status.get('resourceId')})",
+                            operation="copy_items",
+                            object=item_id,
+                        )
+                interval = poll_interval if changed else min(interval * 2, max_poll_interval)
+        return [results[index] for index in range(len(copies))]
+
+    def move_item(self, access_token: str, item_id: str, parent_id: str = None, name: str = None) -> dict:
+        """
+        Move and/or rename an item with a single PATCH; no content is transferred.
+
+        Args:
+            access_token (str): The access token for authentication.
+            item_id (str): The ID of the item to move.
+            parent_id (str): The ID of the destination folder. None keeps the folder.
+            name (str): Optional new name.
+
+        Returns:
+            dict: The updated drive item, or None on failure.
+        """
+        try:
+            response = self.client.patch(
+                self.get_folder_url(item_id), json=self._move_body(parent_id, name), headers=get_headers(access_token)
+            )
             response.raise_for_status()
-            files = response.json().get("value", [])
-            for file in files:
-                file_id = file["id"]
-                file_name = file["name"]
-                self.delete_file(access_token, file_id, file_name)
+            self._record_moved_item(response.json())
+            log_operation(
+                "info",
+                f"Item moved: {item_id} to folder {parent_id}",
+                operation="move_item",
+                object=item_id,
+            )
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error moving item '{item_id}': {str(e)}",
+                operation="move_item",
+                object=item_id,
+            )
+            return None
+
+    def _move_body(self, parent_id: str, name: str) -> dict:
+        body = {}
+        if parent_id:
+            body["parentReference"] = {"id": parent_id}
+        if name:
+            body["name"] = name
+        return body
+
+    def _record_moved_item(self, item: dict) -> None:
+        """
+        Update the metadata store after a move; the store rewrites the paths of
+        rows below a moved folder.
+        """
+        if self.metadata_store is not None:
+            self.metadata_store.upsert_items([item])
+
+    def move_items(self, access_token: str, moves: list[dict]) -> list[dict]:
+        """
+        Move many items through Graph batching, 20 PATCH requests per round trip.
+
+        Args:
+            access_token (str): The access token for authentication.
+            moves (list[dict]): Moves with "id" and "parent_id", optionally "name".
+
+        Returns:
+            list[dict]: The moves that failed.
+        """
+        sub_requests = [
+            {
+                "id": str(index),
+                "method": "PATCH",
+                "url": self.get_folder_url(move["id"]),
+                "headers": {"Content-Type": "application/json"},
+                "body": self._move_body(move.get("parent_id"), move.get("name")),
+            }
+            for index, move in enumerate(moves)
+        ]
+        try:
+            responses = self.client.execute_batch(access_token, sub_requests, graph_root=get_graph_root(self.base_url))
+        except requests.exceptions.RequestException as e:
+            log_operation("error", f"Error moving {len(moves)} items: {str(e)}", operation="move_items")
+            return list(moves)
+        failed = []
+        for index, move in enumerate(moves):
+            response = responses.get(str(index), {})
+            if response.get("status") == 200:
+                self._record_moved_item(response["body"])
+            else:
+                failed.append(move)
+                log_operation(
+                    "error",
+                    f"Error moving item '{move['id']}': status {response.get('status')}",
+                    operation="move_items",
+                    object=move["id"],
+                )
+        log_operation(
+            "info",
+            f"Moved {len(moves) - len(failed)} of {len(moves)} items",
+            operation="move_items",
+        )
+        return failed
+
+    def delete_items_batch(self, access_token: str, items: list[dict]) -> list[dict]:
+        """
+        Delete many drive items through Graph batching.
+
+        Args:
+            access_token (str): The access token for authentication.
+            items (list[dict]): Items with at least "id" and "name".
+
+        Returns:
+            list[dict]: The items that could not be deleted.
+        """
+        sub_requests = [
+            {"id": str(index), "method": "DELETE", "url": self.get_folder_url(item["id"])}
+            for index, item in enumerate(items)
+        ]
+        responses = self.client.execute_batch(access_token, sub_requests, graph_root=get_graph_root(self.base_url))
+        failed = []
+        for index, item in enumerate(items):
+            status = responses.get(str(index), {}).get("status")
+            # 404: already gone
+            if status in (204, 404):
+                if self.metadata_store is not None:
+                    self.metadata_store.delete_item(item["id"])
+                log_operation(
+                    "info",
+                    f"File deleted: {item['name']} (ID: {item['id']})",
+                    operation="delete_items_batch",
+                    object=item["name"],
+                )
+            else:
+                failed.append(item)
+                log_operation(
+                    "error",
+                    f"Error deleting file '{item['name']}': status {status}",
+                    operation="delete_items_batch",
+                    object=item["name"],
+                )
+        return failed
+
+    def delete_folder_and_contents(
+        self, access_token: str, folder_id: str, use_batch: bool = False, recursive: bool = False, **tree_options
+    ):
+        """
+        Delete a folder and all its contents from OneDrive.
+
+        With use_batch, the children are deleted through Graph batching, 20 per
+        round trip, instead of one request each. With recursive, the whole subtree
+        is deleted through delete_tree (tree_options are passed on) and its report
+        is returned.
+        """
+        if recursive:
+            return self.delete_tree(access_token, folder_id, use_batch=use_batch, **tree_options)
+        try:
+            files = list(self.client.iter_collection(
+                self.get_folder_url(folder_id) + "/children",
+                headers=get_headers(access_token),
+                params=get_page_params(select="id,name"),
+            ))
+            if use_batch:
+                self.delete_items_batch(access_token, files)
+            else:
+                for file in files:
+                    file_id = file["id"]
+                    file_name = file["name"]
+                    self.delete_file(access_token, file_id, file_name)
             self.delete_folder(access_token, folder_id)
             log_operation(
                 "info",
@@ -267,6 +1520,141 @@ class OneDriveLib:
                 object=folder_id,
             )
 
+    def _delete_item(self, access_token: str, item: dict) -> bool:
+        """
+        Delete one drive item, returning True if it is gone (404 counts as gone).
+        """
+        try:
+            response = self.client.delete(self.get_folder_url(item["id"]), headers=get_headers(access_token))
+            if response.status_code != 404:
+                response.raise_for_status()
+            if self.metadata_store is not None:
+                self.metadata_store.delete_item(item["id"])
+            return True
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error deleting '{item.get('name')}': {str(e)}",
+                operation="delete_tree",
+                object=item["id"],
+            )
+            return False
+
+    def _delete_items_parallel(
+        self, access_token: str, items: list[dict], executor: ThreadPoolExecutor, use_batch: bool
+    ) -> list[dict]:
+        """
+        Delete items concurrently, in $batch groups of DELETE_BATCH_SIZE if use_batch.
+
+        Returns:
+            list[dict]: The items that could not be deleted.
+        """
+        failed = []
+        if use_batch:
+            groups = [items[start:start + DELETE_BATCH_SIZE] for start in range(0, len(items), DELETE_BATCH_SIZE)]
+            futures = {executor.submit(self.delete_items_batch, access_token, group): group for group in groups}
+            for future in as_completed(futures):
+                try:
+                    failed.extend(future.result())
+                except requests.exceptions.RequestException as e:
+                    log_operation(
+                        "error",
+                        f"Error deleting batch of {len(futures[future])} items: {str(e)}",
+                        operation="delete_tree",
+                    )
+                    failed.extend(futures[future])
+        else:
+            futures = {executor.submit(self._delete_item, access_token, item): item for item in items}
+            failed.extend(futures[future] for future in as_completed(futures) if not future.result())
+        return failed
+
+    def delete_tree(
+        self,
+        access_token: str,
+        folder_id: str,
+        server_side: bool = False,
+        max_workers: int = 8,
+        use_batch: bool = True,
+        max_retries: int = 3,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Delete a folder and everything below it.
+
+        With server_side, a single DELETE on the folder lets OneDrive remove the
+        subtree. Otherwise the whole subtree is listed (all pages, breadth-first) and
+        deleted bottom-up: first all files, then the folders level by level from the
+        deepest up, each group deleted in parallel (via $batch if use_batch). Items
+        that fail are retried up to max_retries more rounds.
+
+        Args:
+            access_token (str): The access token for authentication.
+            folder_id (str): The ID of the folder to delete.
+            server_side (bool): Use one recursive server-side DELETE.
+            max_workers (int): Number of concurrent delete requests (or batches).
+            use_batch (bool): Pack deletes into Graph $batch calls.
+            max_retries (int): Extra rounds for items that failed to delete.
+            progress_callback: Optional callable(deleted, total) invoked after each group.
+
+        Returns:
+            dict: {"deleted": int, "total": int, "failed": [items not deleted]}.
+        """
+        root = {"id": folder_id, "name": folder_id}
+        if server_side:
+            deleted = self._delete_item(access_token, root)
+            return {"deleted": int(deleted), "total": 1, "failed": [] if deleted else [root]}
+
+        files = []
+        folders_by_depth = {0: [root]}
+        pending = [(folder_id, 1)]
+        try:
+            while pending:
+                current_id, depth = pending.pop()
+                url = self.get_folder_url(current_id) + "/children"
+                items = self.client.iter_collection(
+                    url, headers=get_headers(access_token), params=get_page_params(select=FOLDER_TREE_SELECT)
+                )
+                for item in items:
+                    if "folder" in item:
+                        folders_by_depth.setdefault(depth, []).append(item)
+                        pending.append((item["id"], depth + 1))
+                    else:
+                        files.append(item)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error listing folder '{folder_id}' for deletion: {str(e)}",
+                operation="delete_tree",
+                object=folder_id,
+            )
+            return {"deleted": 0, "total": 0, "failed": [root]}
+
+        # Files first, then folders from the deepest level up to the folder itself
+        groups = [files] + [folders_by_depth[depth] for depth in sorted(folders_by_depth, reverse=True)]
+        total = sum(len(group) for group in groups)
+        deleted = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for group in groups:
+                remaining = self._delete_items_parallel(access_token, group, executor, use_batch)
+                for attempt in range(max_retries):
+                    if not remaining:
+                        break
+                    time.sleep(min(2 ** attempt, 30))
+                    remaining = self._delete_items_parallel(access_token, remaining, executor, use_batch)
+                deleted += len(group) - len(remaining)
+                failed.extend(remaining)
+                if progress_callback is not None:
+                    progress_callback(deleted, total)
+
+        log_operation(
+            "info" if not failed else "error",
+            f"Deleted {deleted} of {total} items below {folder_id}, {len(failed)} failed",
+            operation="delete_tree",
+            object=folder_id,
+        )
+        return {"deleted": deleted, "total": total, "failed": failed}
+
     def delete_file(self, access_token: str, file_id: str, file_name: str) -> None:
         """
         Delete a file from OneDrive.
@@ -274,8 +1662,10 @@ class OneDriveLib:
         url = f"{self.base_url}items/{file_id}"
         
         try:
-            response = requests.delete(url, headers=get_headers(access_token))
+            response = self.client.delete(url, headers=get_headers(access_token))
             response.raise_for_status()
+            if self.metadata_store is not None:
+                self.metadata_store.delete_item(file_id)
             log_operation(
                 "info",
                 f"File deleted: {file_name} (ID: {file_id})",
@@ -297,8 +1687,10 @@ class OneDriveLib:
         url = self.get_folder_url(folder_id)
         
         try:
-            response = requests.delete(url, headers=get_headers(access_token))
+            response = self.client.delete(url, headers=get_headers(access_token))
             response.raise_for_status()
+            if self.metadata_store is not None:
+                self.metadata_store.delete_item(folder_id)
             log_operation(
                 "info",
                 f"Folder deleted: {folder_id}",
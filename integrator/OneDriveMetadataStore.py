@@ -0,0 +1,377 @@
+import difflib
+import sqlite3
+import threading
+import time
+from urllib.parse import unquote
+
+from integrator.integrator.logging_config import log_operation
+
+UPSERT_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    name TEXT,
+    path TEXT,
+    is_folder INTEGER NOT NULL DEFAULT 0,
+    size INTEGER,
+    etag TEXT,
+    ctag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_parent_id ON items (parent_id);
+CREATE INDEX IF NOT EXISTS idx_items_path ON items (path);
+CREATE TABLE IF NOT EXISTS listings (
+    folder_id TEXT PRIMARY KEY,
+    resolved_id TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Trigram full-text index over names and paths, kept in sync with the items table by triggers
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    name, path, content='items', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, name, path) VALUES (new.rowid, new.name, new.path);
+END;
+CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, path) VALUES ('delete', old.rowid, old.name, old.path);
+END;
+CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, path ON items
+WHEN old.name IS NOT new.name OR old.path IS NOT new.path BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, path) VALUES ('delete', old.rowid, old.name, old.path);
+    INSERT INTO items_fts (rowid, name, path) VALUES (new.rowid, new.name, new.path);
+END;
+"""
+
+COLUMNS = "id, parent_id, name, path, is_folder, size, etag, ctag, last_modified, fetched_at"
+# Fuzzy search ranks this many trigram candidates per result by string similarity
+FUZZY_CANDIDATES = 20
+
+
+def get_item_path(item: dict) -> str:
+    """
+    Build the drive path of a Graph drive item, e.g. "/Documents/report.pdf".
+    """
+    if "root" in item:
+        return "/"
+    parent_path = unquote(item.get("parentReference", {}).get("path", ""))
+    # parentReference.path looks like "/drive/root:" or "/drive/root:/Documents"
+    _, _, parent_path = parent_path.partition("root:")
+    return f"{parent_path.rstrip('/')}/{item.get('name', '')}"
+
+
+class OneDriveMetadataStore:
+    """
+    On-disk SQLite mirror of drive item metadata.
+
+    Rows are indexed by item ID, parent ID and full path, so path resolution and
+    child listings are index lookups instead of network calls or list scans.
+    Names and paths are also kept in an FTS5 trigram index for search.
+    Nothing is held in memory beyond the current query.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the metadata store.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+        """
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+        self.search_enabled = self._create_search_index()
+        log_operation(
+            "info",
+            f"Metadata store opened: {db_path}",
+            operation="open_metadata_store",
+            object=db_path,
+        )
+
+    def _create_search_index(self) -> bool:
+        """
+        Create the full-text index, indexing existing rows if the database predates it.
+
+        Returns:
+            bool: False if this SQLite build lacks FTS5 or the trigram tokenizer.
+        """
+        try:
+            with self.lock, self.connection:
+                exists = self.connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'"
+                ).fetchone()
+                self.connection.executescript(SEARCH_SCHEMA)
+                if not exists:
+                    self.connection.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            log_operation(
+                "error",
+                f"Search index unavailable: {str(e)}",
+                operation="open_metadata_store",
+                object=self.db_path,
+            )
+            return False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def upsert_items(self, items: list[dict], fetched_at: float = None, paths: dict = None) -> None:
+        """
+        Insert or update Graph drive items.
+
+        When a stored folder comes back with a different path (it was moved or
+        renamed), the paths of everything stored below it are rewritten too.
+
+        Args:
+            items (list[dict]): Graph drive items.
+            fetched_at (float): Timestamp to record. Defaults to now.
+            paths (dict): Optional item ID -> drive path, for items whose
+                parentReference carries no path (e.g. delta responses).
+        """
+        fetched_at = fetched_at or time.time()
+        paths = paths or {}
+        rows = [
+            (
+                item["id"],
+                None if "root" in item else item.get("parentReference", {}).get("id"),
+                item.get("name"),
+                paths.get(item["id"]) or get_item_path(item),
+                int("folder" in item or "root" in item),
+                item.get("size"),
+                item.get("eTag"),
+                item.get("cTag"),
+                item.get("lastModifiedDateTime"),
+                fetched_at,
+            )
+            for item in items
+        ]
+        if not rows:
+            return
+        folder_paths = {row[0]: row[3] for row in rows if row[4]}
+        with self.lock, self.connection:
+            if folder_paths:
+                placeholders = ", ".join("?" * len(folder_paths))
+                moved = [
+                    (old_path, folder_paths[item_id])
+                    for item_id, old_path in self.connection.execute(
+                        f"SELECT id, path FROM items WHERE is_folder = 1 AND id IN ({placeholders})",
+                        list(folder_paths),
+                    )
+                    if old_path != folder_paths[item_id]
+                ]
+                for old_path, new_path in moved:
+                    old_prefix = old_path.rstrip("/") + "/"
+                    self.connection.execute(
+                        "UPDATE items SET path = ? || substr(path, ?) WHERE path >= ? AND path < ?",
+                        (new_path.rstrip("/") + "/", len(old_prefix) + 1, old_prefix, old_prefix[:-1] + "0"),
+                    )
+            # An upsert, unlike INSERT OR REPLACE, keeps the rowid the search index refers to
+            self.connection.executemany(
+                f"INSERT INTO items ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET parent_id = excluded.parent_id, name = excluded.name, "
+                "path = excluded.path, is_folder = excluded.is_folder, size = excluded.size, "
+                "etag = excluded.etag, ctag = excluded.ctag, last_modified = excluded.last_modified, "
+                "fetched_at = excluded.fetched_at",
+                rows,
+            )
+
+    def record_listing(self, folder_id: str, items):
+        """
+        Pass a folder listing through while storing it.
+
+        Items are upserted in batches as they are consumed. Once the listing has been
+        consumed completely, children of the folder that no longer appear in it are
+        removed, for folders together with everything stored below them, and the
+        listing is marked fresh. If iterating items fails, or the caller stops
+        early, the listing is incomplete: nothing is removed and it is not marked.
+
+        Args:
+            folder_id (str): ID of the listed folder (or the alias "root").
+            items: Iterable of Graph drive items, e.g. from GraphClient.iter_collection.
+        """
+        started_at = time.time()
+        resolved_id = None
+        batch = []
+        for item in items:
+            if resolved_id is None:
+                resolved_id = item.get("parentReference", {}).get("id")
+            batch.append(item)
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                self.upsert_items(batch, started_at)
+                batch = []
+            yield item
+        self.upsert_items(batch, started_at)
+
+        resolved_id = resolved_id or self.resolve_folder_id(folder_id)
+        with self.lock, self.connection:
+            removed_folders = self.connection.execute(
+                "SELECT id, path FROM items WHERE parent_id = ? AND fetched_at < ? AND is_folder = 1",
+                (resolved_id, started_at),
+            ).fetchall()
+            self.connection.execute(
+                "DELETE FROM items WHERE parent_id = ? AND fetched_at < ?",
+                (resolved_id, started_at),
+            )
+            for folder in removed_folders:
+                self._delete_subtree(folder["id"], folder["path"])
+            self.connection.execute(
+                "INSERT OR REPLACE INTO listings (folder_id, resolved_id, fetched_at) VALUES (?, ?, ?)",
+                (folder_id, resolved_id, started_at),
+            )
+
+    def resolve_folder_id(self, folder_id: str) -> str:
+        """
+        Map an alias such as "root" to the real folder ID seen in an earlier listing.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT resolved_id FROM listings WHERE folder_id = ?", (folder_id,)
+            ).fetchone()
+        return row["resolved_id"] if row else folder_id
+
+    def get_item(self, item_id: str) -> dict:
+        with self.lock:
+            row = self.connection.execute(f"SELECT {COLUMNS} FROM items WHERE id = ?", (item_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_item_by_path(self, path: str, max_age: float = None) -> dict:
+        """
+        Look up an item by its drive path, e.g. "/Documents/report.pdf".
+
+        Args:
+            path (str): Drive path starting with "/".
+            max_age (float): Ignore rows fetched more than max_age seconds ago.
+        """
+        path = "/" + path.strip("/") if path.strip("/") else "/"
+        with self.lock:
+            row = self.connection.execute(f"SELECT {COLUMNS} FROM items WHERE path = ?", (path,)).fetchone()
+        if row is None or (max_age is not None and time.time() - row["fetched_at"] > max_age):
+            return None
+        return dict(row)
+
+    def list_children(self, folder_id: str, max_age: float = None) -> list[dict]:
+        """
+        List the stored children of a folder.
+
+        Returns:
+            list[dict]: The children, or None if the folder was never listed
+            completely or its listing is older than max_age seconds.
+        """
+        with self.lock:
+            listing = self.connection.execute(
+                "SELECT resolved_id, fetched_at FROM listings WHERE folder_id = ?", (folder_id,)
+            ).fetchone()
+            if listing is None or (max_age is not None and time.time() - listing["fetched_at"] > max_age):
+                return None
+            rows = self.connection.execute(
+                f"SELECT {COLUMNS} FROM items WHERE parent_id = ? ORDER BY name", (listing["resolved_id"],)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_item(self, item_id: str) -> None:
+        """
+        Remove an item and, for folders, everything stored below its path.
+        """
+        item = self.get_item(item_id)
+        if item is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            if item["is_folder"]:
+                self._delete_subtree(item_id, item["path"])
+
+    def _delete_subtree(self, folder_id: str, path: str) -> None:
+        """
+        Remove everything stored below a folder's path, and the listings of the
+        folder and its subfolders. Needs the lock.
+        """
+        prefix = path.rstrip("/") + "/"
+        # "0" sorts directly after "/", so this range covers exactly the subtree
+        subtree = (prefix, prefix[:-1] + "0")
+        folder_ids = [(folder_id,)] + [
+            (row["id"],)
+            for row in self.connection.execute(
+                "SELECT id FROM items WHERE is_folder = 1 AND path >= ? AND path < ?", subtree
+            )
+        ]
+        self.connection.execute("DELETE FROM items WHERE path >= ? AND path < ?", subtree)
+        self.connection.executemany("DELETE FROM listings WHERE resolved_id = ?", folder_ids)
+
+    def search(
+        self, query: str, limit: int = 20, prefix: bool = False, fuzzy: bool = False, folders_only: bool = False
+    ) -> list[dict]:
+        """
+        Search stored items by name and path.
+
+        By default, items whose name or path contains query (case-insensitive) are
+        returned, best matches first. With prefix, only names starting with query
+        match. With fuzzy, names sharing trigrams with query are ranked by string
+        similarity, so misspelled queries still find the item.
+
+        Args:
+            query (str): Text to search for. Substring and fuzzy searches need at
+                least three characters to use the index; shorter queries scan names.
+            limit (int): Maximum number of results.
+            prefix (bool): Match names starting with query.
+            fuzzy (bool): Tolerate typos in query.
+            folders_only (bool): Return folders only.
+
+        Returns:
+            list[dict]: Matching rows, as returned by get_item.
+        """
+        if not self.search_enabled or not query:
+            return []
+        folder_filter = " AND items.is_folder = 1" if folders_only else ""
+        if prefix or len(query) < 3:
+            # The trigram index serves LIKE patterns with three or more characters, but not an ESCAPE clause
+            like = "items_fts.name LIKE ?"
+            if any(char in query for char in "%_\\"):
+                query = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                like += " ESCAPE '\\'"
+            sql = (
+                f"SELECT {self._qualified_columns()} FROM items "
+                f"JOIN items_fts ON items_fts.rowid = items.rowid "
+                f"WHERE {like}{folder_filter} ORDER BY length(items.name), items.name LIMIT ?"
+            )
+            pattern = f"{query}%" if prefix else f"%{query}%"
+            with self.lock:
+                return [dict(row) for row in self.connection.execute(sql, (pattern, limit))]
+
+        if fuzzy:
+            trigrams = {query[index:index + 3].lower() for index in range(len(query) - 2)}
+            match = " OR ".join(self._quote(trigram) for trigram in trigrams)
+            match = f"name : ({match})"
+            fetch_limit = limit * FUZZY_CANDIDATES
+        else:
+            match = self._quote(query)
+            fetch_limit = limit
+        sql = (
+            f"SELECT {self._qualified_columns()} FROM items_fts "
+            f"JOIN items ON items.rowid = items_fts.rowid "
+            f"WHERE items_fts MATCH ?{folder_filter} ORDER BY bm25(items_fts, 10.0, 1.0) LIMIT ?"
+        )
+        with self.lock:
+            rows = [dict(row) for row in self.connection.execute(sql, (match, fetch_limit))]
+        if fuzzy:
+            lowered = query.lower()
+            rows.sort(key=lambda row: -difflib.SequenceMatcher(None, lowered, row["name"].lower()).ratio())
+        return rows[:limit]
+
+    @staticmethod
+    def _quote(text: str) -> str:
+        """Quote text as an FTS5 string."""
+        return '"' + text.replace('"', '""') + '"'
+
+    @staticmethod
+    def _qualified_columns() -> str:
+        return ", ".join(f"items.{column.strip()}" for column in COLUMNS.split(","))
@@ -0,0 +1,167 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneDriveLib import OneDriveLib
+from integrator.integrator.OneLib import (get_headers, get_page_params,
+                                          quick_xor_hash)
+
+# Fields the change detection needs from the remote listing
+MIRROR_SELECT = "id,name,folder,file,size"
+
+
+class OneDriveMirror:
+    """
+    Mirror a local directory tree into a OneDrive folder.
+
+    Only files that are new or whose content differs are uploaded. Files with a
+    different size are uploaded without hashing; for files with the same size, the
+    local quickXorHash is computed in a process pool and compared with the hash
+    OneDrive reports in the listing.
+    """
+
+    def __init__(self, onedrive: OneDriveLib, max_workers: int = 4, hash_workers: int = None):
+        """
+        Args:
+            onedrive (OneDriveLib): Library instance used for listing, folder creation and uploads.
+            max_workers (int): Number of concurrent uploads.
+            hash_workers (int): Number of hashing processes. Defaults to the CPU count.
+        """
+        self.onedrive = onedrive
+        self.max_workers = max_workers
+        self.hash_workers = hash_workers
+
+    def list_remote_tree(self, access_token: str, folder_id: str, select=MIRROR_SELECT) -> dict:
+        """
+        List everything below a OneDrive folder, breadth-first.
+
+        Returns:
+            dict: Relative path ("a/b.txt") -> Graph drive item.
+
+        Raises:
+            requests.exceptions.RequestException: If a listing fails.
+        """
+        remote = {}
+        pending = [("", folder_id)]
+        while pending:
+            rel_dir, current_id = pending.pop()
+            url = self.onedrive.get_folder_url(current_id) + "/children"
+            items = self.onedrive.client.iter_collection(
+                url, headers=get_headers(access_token), params=get_page_params(select=select)
+            )
+            for item in items:
+                rel_path = f"{rel_dir}/{item['name']}" if rel_dir else item["name"]
+                remote[rel_path] = item
+                if "folder" in item:
+                    pending.append((rel_path, item["id"]))
+        return remote
+
+    def _list_local_tree(self, local_dir: str) -> tuple[list[str], dict]:
+        """
+        Return the relative directory paths and a relative path -> absolute path map of files.
+        """
+        local_dirs = []
+        local_files = {}
+        for dir_path, _, file_names in os.walk(local_dir):
+            rel_dir = os.path.relpath(dir_path, local_dir)
+            rel_dir = "" if rel_dir == "." else rel_dir.replace(os.sep, "/")
+            if rel_dir:
+                local_dirs.append(rel_dir)
+            for file_name in file_names:
+                rel_path = f"{rel_dir}/{file_name}" if rel_dir else file_name
+                local_files[rel_path] = os.path.join(dir_path, file_name)
+        return local_dirs, local_files
+
+    def find_changed_files(self, local_files: dict, remote: dict) -> tuple[list[str], int]:
+        """
+        Compare local files with the remote listing.
+
+        Returns:
+            tuple[list[str], int]: Relative paths to upload, and the number of unchanged files.
+        """
+        changed = []
+        same_size = []
+        for rel_path, local_path in local_files.items():
+            item = remote.get(rel_path)
+            remote_hash = (item or {}).get("file", {}).get("hashes", {}).get("quickXorHash")
+            if item is None or remote_hash is None or item.get("size") != os.path.getsize(local_path):
+                changed.append(rel_path)
+            else:
+                same_size.append(rel_path)
+
+        unchanged = 0
+        if same_size:
+            with ProcessPoolExecutor(max_workers=self.hash_workers) as executor:
+                hashes = executor.map(quick_xor_hash, [local_files[rel_path] for rel_path in same_size], chunksize=8)
+                for rel_path, local_hash in zip(same_size, hashes):
+                    if local_hash == remote[rel_path]["file"]["hashes"]["quickXorHash"]:
+                        unchanged += 1
+                    else:
+                        changed.append(rel_path)
+        return changed, unchanged
+
+    def mirror_directory(self, access_token: str, local_dir: str, folder_id: str) -> dict:
+        """
+        Upload new and changed files of local_dir into the OneDrive folder folder_id,
+        creating missing folders on the way. Remote files that do not exist
+        locally are left untouched.
+
+        Returns:
+            dict: {"uploaded": [...], "failed": [...], "created_folders": [...],
+            "unchanged": int}, or None if the remote folder could not be listed.
+        """
+        try:
+            remote = self.list_remote_tree(access_token, folder_id)
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error listing remote folder '{folder_id}': {str(e)}",
+                operation="mirror_directory",
+                object=folder_id,
+            )
+            return None
+
+        local_dirs, local_files = self._list_local_tree(local_dir)
+        changed, unchanged = self.find_changed_files(local_files, remote)
+        report = {"uploaded": [], "failed": [], "created_folders": [], "unchanged": unchanged}
+
+        folder_ids = {rel_path: item["id"] for rel_path, item in remote.items() if "folder" in item}
+        folder_ids[""] = folder_id
+        # Parents sort before their children, so every parent exists when its child is created
+        for rel_dir in sorted(local_dirs, key=lambda path: path.count("/")):
+            parent, _, name = rel_dir.rpartition("/")
+            if rel_dir in folder_ids or parent not in folder_ids:
+                continue
+            folder = self.onedrive.create_directory(
+                access_token, name, parent_id=folder_ids[parent], conflict_behavior="fail"
+            )
+            if folder:
+                folder_ids[rel_dir] = folder["id"]
+                report["created_folders"].append(rel_dir)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for rel_path in changed:
+                parent, _, name = rel_path.rpartition("/")
+                if parent not in folder_ids:
+                    report["failed"].append(rel_path)
+                    continue
+                local_path = local_files[rel_path]
+                future = executor.submit(
+                    self.onedrive.upload_file_to_directory,
+                    access_token, folder_ids[parent], os.path.dirname(local_path), name,
+                )
+                futures[future] = rel_path
+            for future, rel_path in futures.items():
+                report["uploaded" if future.result() else "failed"].append(rel_path)
+
+        log_operation(
+            "info",
+            f"Mirrored {local_dir}: {len(report['uploaded'])} uploaded, {unchanged} unchanged, "
+            f"{len(report['failed'])} failed",
+            operation="mirror_directory",
+            object=folder_id,
+        )
+        return report
@@ -1,6 +1,13 @@
+import base64
+import io
 import re
 from urllib.parse import parse_qs, urlparse
 
+QUICKXOR_WIDTH_BITS = 160
+QUICKXOR_SHIFT = 11
+# Bytes hashed per read; a multiple of 160 so every read starts at the same bit offset
+QUICKXOR_READ_SIZE = 160 * 8192
+
 
 def extract_folder_id(url: str) -> str:
     # Parse the URL and extract the query parameters
@@ -25,6 +32,72 @@ def list_all_attributes(obj) -> str:
 def get_headers(access_token):
     return {"Authorization": f"Bearer {access_token}"}
 
+def get_page_params(page_size: int = None, select=None, expand=None) -> dict:
+    """
+    Build the query parameters for a paged Graph listing.
+
+    Args:
+        page_size (int): Items per page ($top). None keeps the Graph default.
+        select (str | Iterable[str]): Properties to return ($select), e.g. "id,name,folder".
+        expand (str | Iterable[str]): Relationships to inline ($expand).
+    """
+    params = {"$top": page_size} if page_size else {}
+    if select:
+        params["$select"] = select if isinstance(select, str) else ",".join(select)
+    if expand:
+        params["$expand"] = expand if isinstance(expand, str) else ",".join(expand)
+    return params
+
+def merge_select(select, required) -> str:
+    """
+    Combine a $select projection with fields a caller needs. None (all fields) stays None.
+    """
+    if not select:
+        return select
+    fields = select.split(",") if isinstance(select, str) else list(select)
+    fields += [field for field in required.split(",") if field not in fields]
+    return ",".join(fields)
+
+class ChunkReader(io.RawIOBase):
+    """
+    Read-only, non-seekable file object over an iterable of byte chunks, such
+    as a generator producing a report.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.pending:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            self.pending = memoryview(chunk).cast("B")
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+def read_fully(stream, size: int) -> bytes:
+    """Read up to size bytes from a stream, across short reads, stopping early only at EOF."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+def get_graph_root(url: str) -> str:
+    """Return the versioned Graph root of a URL, e.g. https://graph.microsoft.com/v1.0."""
+    parsed_url = urlparse(url)
+    version = parsed_url.path.strip("/").split("/")[0]
+    return f"{parsed_url.scheme}://{parsed_url.netloc}/{version}"
+
 def is_notebook(obj):
     """Identify OneDrive objects."""
     # Check if 'package' exists and its 'type' is 'oneNote'
@@ -49,3 +122,49 @@ def get_id_from_dict(items: list[dict], item_name: str, key: str = "name") -> st
         if item.get(key) == item_name:
             return item.get("id")
     return None
+
+def quick_xor_hash(file_path: str) -> str:
+    """
+    Compute OneDrive's quickXorHash of a local file (base64, as in file.hashes.quickXorHash).
+
+    Byte i of the input is XORed into a 160-bit ring at bit (i * 11) mod 160, so all
+    bytes whose index is congruent modulo 160 land at the same position. The file is
+    therefore first XOR-folded into a single 160-byte block using big-integer
+    arithmetic, and only those 160 bytes are placed into the ring one by one.
+    """
+    block_bits = QUICKXOR_WIDTH_BITS * 8
+    folded = 0
+    length = 0
+    with open(file_path, "rb") as file:
+        while True:
+            data = file.read(QUICKXOR_READ_SIZE)
+            if not data:
+                break
+            length += len(data)
+            # Zero padding does not change the XOR but keeps the block alignment
+            data += bytes(-len(data) % QUICKXOR_WIDTH_BITS)
+            value = int.from_bytes(data, "little")
+            blocks = len(data) // QUICKXOR_WIDTH_BITS
+            while blocks > 1:
+                if blocks % 2:
+                    blocks -= 1
+                    folded ^= value >> (blocks * block_bits)
+                    value &= (1 << (blocks * block_bits)) - 1
+                else:
+                    blocks //= 2
+                    half_bits = blocks * block_bits
+                    value = (value & ((1 << half_bits) - 1)) ^ (value >> half_bits)
+            folded ^= value
+
+    ring_mask = (1 << QUICKXOR_WIDTH_BITS) - 1
+    ring = 0
+    for index in range(QUICKXOR_WIDTH_BITS):
+        byte = (folded >> (8 * index)) & 0xFF
+        if byte:
+            shift = (index * QUICKXOR_SHIFT) % QUICKXOR_WIDTH_BITS
+            ring ^= ((byte << shift) | (byte >> (QUICKXOR_WIDTH_BITS - shift))) & ring_mask
+
+    digest = bytearray(ring.to_bytes(QUICKXOR_WIDTH_BITS // 8, "little"))
+    for index, byte in enumerate(length.to_bytes(8, "little")):
+        digest[QUICKXOR_WIDTH_BITS // 8 - 8 + index] ^= byte
+    return base64.b64encode(bytes(digest)).decode("ascii")
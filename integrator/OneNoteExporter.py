@@ -0,0 +1,335 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneLib import get_headers
+from integrator.integrator.OneNoteLib import (ONENOTE_MAX_PAGE_SIZE,
+                                             PAGE_SUMMARY_SELECT, OneNoteLib)
+from integrator.integrator.OneNoteStructure import OneNotePage
+
+MANIFEST_NAME = "onenote_export.json"
+# Write the manifest after this many finished pages, so a crash loses little work
+MANIFEST_SAVE_INTERVAL = 100
+RESOURCE_STREAM_BLOCK = 1024 * 1024
+# Images and attachments are referenced as .../onenote/resources/{id}/$value (or /content)
+RESOURCE_URL_PATTERN = re.compile(r'"(https?://[^"]+/onenote/resources/([^/"]+)/(?:\$value|content))"')
+UNSAFE_NAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+MAX_NAME_LENGTH = 80
+
+
+class ExportCancelled(Exception):
+    """Raised inside a page export when the export is cancelled."""
+
+
+def safe_name(name: str, default: str = "Untitled") -> str:
+    """Turn a page or section name into a file name valid on all platforms."""
+    name = UNSAFE_NAME_CHARS.sub("_", name or "").strip(" .")
+    return name[:MAX_NAME_LENGTH] or default
+
+
+class OneNoteExporter:
+    """
+    Export OneNote pages to local HTML files with a bounded pool of worker threads.
+
+    Every page is written as "<title> [<hash>].html" with its images and
+    attachments in a "<title> [<hash>]_files" folder next to it, and the HTML
+    references rewritten to the local copies. A manifest in the destination
+    directory records the lastModifiedDateTime of every exported page, so
+    running an interrupted export again only fetches new and changed pages.
+    """
+
+    def __init__(self, onenote: OneNoteLib, max_workers: int = 8, download_resources: bool = True):
+        """
+        Args:
+            onenote (OneNoteLib): Library instance used for listings and page content.
+            max_workers (int): Number of pages exported concurrently.
+            download_resources (bool): Also download images and attachments;
+                otherwise the HTML keeps the Graph resource URLs.
+        """
+        self.onenote = onenote
+        self.max_workers = max_workers
+        self.download_resources = download_resources
+
+    @staticmethod
+    def _page_file_stem(page: OneNotePage) -> str:
+        # Titles are not unique, so a short hash of the ID keeps the file names apart
+        digest = hashlib.sha1(page.id.encode("utf-8")).hexdigest()[:8]
+        return f"{safe_name(page.title)} [{digest}]"
+
+    @staticmethod
+    def _load_manifest(destination_dir: str) -> dict:
+        try:
+            with open(os.path.join(destination_dir, MANIFEST_NAME), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log_operation(
+                "error",
+                f"Ignoring unreadable export manifest: {str(e)}",
+                operation="export_pages",
+                object=destination_dir,
+            )
+            return {}
+
+    @staticmethod
+    def _save_manifest(destination_dir: str, manifest: dict) -> None:
+        manifest_path = os.path.join(destination_dir, MANIFEST_NAME)
+        with open(manifest_path + ".part", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, separators=(",", ":"))
+        os.replace(manifest_path + ".part", manifest_path)
+
+    def _download_resource(self, access_token: str, url: str, resource_dir: str, resource_id: str) -> tuple[str, int]:
+        """
+        Stream one image or attachment into resource_dir.
+
+        Returns:
+            tuple[str, int]: The file name and the number of bytes written.
+        """
+        with self.onenote.client.get(url, headers=get_headers(access_token), stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+            file_name = safe_name(resource_id, "resource") + (mimetypes.guess_extension(content_type) or "")
+            written = 0
+            with open(os.path.join(resource_dir, file_name), "wb") as file:
+                for chunk in response.iter_content(chunk_size=RESOURCE_STREAM_BLOCK):
+                    file.write(chunk)
+                    written += len(chunk)
+        return file_name, written
+
+    def _export_page(
+        self, access_token: str, page: OneNotePage, html_path: str, cancel_event: threading.Event
+    ) -> tuple[int, int]:
+        """
+        Download the HTML of a page and its resources, and write them next to html_path.
+
+        Returns:
+            tuple[int, int]: The number of bytes written and the number of resources.
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled(page.id)
+        response = self.onenote.client.get(
+            f"{self.onenote.get_page_url(page.id)}/content", headers=get_headers(access_token)
+        )
+        response.raise_for_status()
+        html = response.text
+        written = 0
+
+        resources = {}
+        if self.download_resources:
+            for match in RESOURCE_URL_PATTERN.finditer(html):
+                resources.setdefault(match.group(1), match.group(2))
+        resource_dir = os.path.splitext(html_path)[0] + "_files"
+        try:
+            if resources:
+                os.makedirs(resource_dir, exist_ok=True)
+            for url, resource_id in resources.items():
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled(page.id)
+                file_name, size = self._download_resource(access_token, url, resource_dir, resource_id)
+                written += size
+                html = html.replace(url, f"{os.path.basename(resource_dir)}/{file_name}")
+
+            data = html.encode("utf-8")
+            with open(html_path + ".part", "wb") as file:
+                file.write(data)
+            os.replace(html_path + ".part", html_path)
+            return written + len(data), len(resources)
+        except BaseException:
+            # Keep the resources of an earlier export, which its HTML still references
+            if not os.path.isfile(html_path):
+                shutil.rmtree(resource_dir, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _remove_page_files(destination_dir: str, rel_path: str) -> None:
+        html_path = os.path.join(destination_dir, *rel_path.split("/"))
+        if os.path.isfile(html_path):
+            os.remove(html_path)
+        shutil.rmtree(os.path.splitext(html_path)[0] + "_files", ignore_errors=True)
+
+    def export_pages(
+        self,
+        access_token: str,
+        pages,
+        destination_dir: str,
+        cancel_event: threading.Event = None,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Export pages into destination_dir, skipping pages already exported unchanged.
+
+        Args:
+            access_token (str): The access token for authentication.
+            pages: Iterable of (folder, OneNotePage) tuples; folder is the relative
+                directory of the page, "" for destination_dir itself. It is
+                consumed lazily, so pages are exported while the listing is paged.
+            destination_dir (str): Local directory to export into.
+            cancel_event (threading.Event): When set, running page exports are aborted
+                (and reported as cancelled) and no new ones are started; call
+                again to resume.
+            progress_callback: Optional callable(pages_done, bytes_done) invoked
+                after each page.
+
+        Returns:
+            dict: {"exported", "skipped", "failed", "cancelled"} lists of page IDs,
+            "complete" (False if the page listing failed), plus "bytes",
+            "resources", "seconds" and "pages_per_second".
+        """
+        os.makedirs(destination_dir, exist_ok=True)
+        manifest = self._load_manifest(destination_dir)
+        report = {"exported": [], "skipped": [], "failed": [], "cancelled": [], "complete": True, "bytes": 0, "resources": 0}
+        started = time.perf_counter()
+        pages = iter(pages)
+        listing_done = False
+        unsaved = 0
+        done = 0
+
+        def is_cancelled():
+            return cancel_event is not None and cancel_event.is_set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while not listing_done or running:
+                # Keep a bounded number of futures queued so cancelling is immediate
+                while not listing_done and len(running) < 2 * self.max_workers and not is_cancelled():
+                    try:
+                        folder, page = next(pages)
+                    except StopIteration:
+                        listing_done = True
+                        break
+                    except requests.exceptions.RequestException as e:
+                        listing_done = True
+                        report["complete"] = False
+                        log_operation(
+                            "error",
+                            f"Error listing pages to export: {str(e)}",
+                            operation="export_pages",
+                            object=destination_dir,
+                        )
+                        break
+                    rel_path = "/".join(filter(None, [folder, self._page_file_stem(page) + ".html"]))
+                    html_path = os.path.join(destination_dir, *rel_path.split("/"))
+                    entry = manifest.get(page.id)
+                    if entry and entry["last_modified"] == page.last_modified and os.path.isfile(
+                        os.path.join(destination_dir, *entry["path"].split("/"))
+                    ):
+                        report["skipped"].append(page.id)
+                        done += 1
+                        continue
+                    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+                    future = executor.submit(self._export_page, access_token, page, html_path, cancel_event)
+                    running[future] = (page, rel_path)
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page, rel_path = running.pop(future)
+                    try:
+                        written, resources = future.result()
+                    except ExportCancelled:
+                        report["cancelled"].append(page.id)
+                        continue
+                    except (requests.exceptions.RequestException, OSError) as e:
+                        report["failed"].append(page.id)
+                        log_operation(
+                            "error",
+                            f"Error exporting page '{page.title}': {str(e)}",
+                            operation="export_pages",
+                            object=page.id,
+                        )
+                    else:
+                        previous = manifest.get(page.id)
+                        if previous and previous["path"] != rel_path:
+                            # The page was renamed or moved since the last export
+                            self._remove_page_files(destination_dir, previous["path"])
+                        manifest[page.id] = {"title": page.title, "path": rel_path, "last_modified": page.last_modified}
+                        report["exported"].append(page.id)
+                        report["bytes"] += written
+                        report["resources"] += resources
+                        unsaved += 1
+                        if unsaved >= MANIFEST_SAVE_INTERVAL:
+                            self._save_manifest(destination_dir, manifest)
+                            unsaved = 0
+                    done += 1
+                    if progress_callback is not None:
+                        progress_callback(done, report["bytes"])
+
+        self._save_manifest(destination_dir, manifest)
+        seconds = time.perf_counter() - started
+        report["seconds"] = seconds
+        report["pages_per_second"] = len(report["exported"]) / seconds if seconds else 0.0
+        log_operation(
+            "info",
+            f"Exported {len(report['exported'])} pages with {report['resources']} resources "
+            f"({report['bytes'] / 2**20:.1f} MiB, {report['pages_per_second']:.1f} pages/s), "
+            f"{len(report['skipped'])} up to date, {len(report['failed'])} failed, "
+            f"{len(report['cancelled'])} cancelled",
+            operation="export_pages",
+            object=destination_dir,
+        )
+        return report
+
+    def export_section(
+        self,
+        access_token: str,
+        section_id: str,
+        destination_dir: str,
+        cancel_event: threading.Event = None,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Export all pages of a section into destination_dir. Pages are exported
+        while the section listing is still being paged.
+
+        Returns:
+            dict: The report of export_pages.
+        """
+        listing = self.onenote.client.iter_collection(
+            f"{self.onenote.get_section_url(section_id)}/pages",
+            headers=get_headers(access_token),
+            params={"$top": ONENOTE_MAX_PAGE_SIZE, "$select": PAGE_SUMMARY_SELECT},
+        )
+        pages = (("", OneNotePage.from_graph(page)) for page in listing)
+        return self.export_pages(access_token, pages, destination_dir, cancel_event, progress_callback)
+
+    def export_notebook(
+        self,
+        access_token: str,
+        notebook_id: str,
+        destination_dir: str,
+        cancel_event: threading.Event = None,
+        progress_callback=None,
+    ) -> dict:
+        """
+        Export all pages of a notebook into destination_dir, with one directory
+        per section group and section.
+
+        Returns:
+            dict: The report of export_pages, or None if the notebook could not be listed.
+        """
+        notebook = self.onenote.get_notebook_tree(access_token, notebook_id)
+        if notebook is None:
+            return None
+
+        def iter_group(group, folder):
+            for section in group.sections:
+                section_folder = "/".join(filter(None, [folder, safe_name(section.name)]))
+                for page in section.pages:
+                    yield section_folder, page
+            for child in group.section_groups:
+                yield from iter_group(child, "/".join(filter(None, [folder, safe_name(child.name)])))
+
+        return self.export_pages(
+            access_token, iter_group(notebook, ""), destination_dir, cancel_event, progress_callback
+        )
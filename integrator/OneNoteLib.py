@@ -1,9 +1,22 @@
+import base64
 import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from integrator.integrator.GraphClient import GraphClient, get_default_client
 from integrator.integrator.logging_config import log_operation
-from integrator.integrator.OneLib import get_headers
+from integrator.integrator.MultipartStream import MultipartStream
+from integrator.integrator.OneLib import (get_graph_root, get_headers,
+                                          get_page_params)
+from integrator.integrator.OneNotePageTemplate import (OneNotePageTemplate,
+                                                       render_page)
+from integrator.integrator.OneNoteStructure import (OneNoteNotebook,
+                                                    OneNotePage,
+                                                    OneNoteSection,
+                                                    OneNoteSectionGroup)
+from integrator.integrator.PageContentCache import PageContentCache
 
 #
 # For Testing the URLs: https://developer.microsoft.com/en-us/graph/graph-explorer?request=me/onenote/pages&version=v1.0
@@ -14,20 +27,40 @@ from integrator.integrator.OneLib import get_headers
 ONENOTE_NOTEBOOK_BASE_URL = "https://graph.microsoft.com/v1.0/me/onenote/notebooks"
 ONENOTE_SECTION_BASE_URL = f"https://graph.microsoft.com/v1.0/me/onenote/sections"
 ONENOTE_PAGE_BASE_URL = f"https://graph.microsoft.com/v1.0/me/onenote/pages"
+ONENOTE_SECTION_GROUP_BASE_URL = "https://graph.microsoft.com/v1.0/me/onenote/sectionGroups"
+# OneNote returns at most 100 pages per request
+ONENOTE_MAX_PAGE_SIZE = 100
+PAGE_SUMMARY_SELECT = "id,title,createdDateTime,lastModifiedDateTime"
+# Sections with their pages, plus two levels of section groups with theirs
+SECTIONS_EXPAND = f"sections($select=id,displayName;$expand=pages($select={PAGE_SUMMARY_SELECT}))"
+STRUCTURE_EXPAND = (
+    f"{SECTIONS_EXPAND},sectionGroups($select=id,displayName;$expand={SECTIONS_EXPAND},"
+    "sectionGroups($select=id,displayName))"
+)
+STRUCTURE_EXPAND_NO_PAGES = (
+    "sections($select=id,displayName),sectionGroups($select=id,displayName;"
+    "$expand=sections($select=id,displayName),sectionGroups($select=id,displayName))"
+)
+# Default $select projection for notebook and section listings, which only return names and IDs
+ONENOTE_NAME_SELECT = "id,displayName"
 
 
 
 class OneNoteLib:
-    def __init__(self):
+    def __init__(self, client: GraphClient = None, content_cache: PageContentCache = None):
         """
         Initialize the OneNoteLib instance with a base URL.
 
         Args:
-            base_url (str): The base URL for OneNote API. Defaults to Microsoft Graph API endpoint for OneNote.
+            client (GraphClient): Shared HTTP transport. Defaults to the process-wide client.
+            content_cache (PageContentCache): Optional cache for get_page_content.
         """
+        self.client = client or get_default_client()
+        self.content_cache = content_cache
         self.notebook_base_url = ONENOTE_NOTEBOOK_BASE_URL
         self.section_base_url = ONENOTE_SECTION_BASE_URL
         self.page_base_url = ONENOTE_PAGE_BASE_URL
+        self.section_group_base_url = ONENOTE_SECTION_GROUP_BASE_URL
 
     def get_notebook_url(self, notebook_id: str) -> str:
         """
@@ -47,24 +80,23 @@ class OneNoteLib:
         """
         return f"{self.page_base_url}/{page_id}"
 
-    def get_notebooks(self, access_token: str) -> dict:
+    def get_notebooks(self, access_token: str, select=ONENOTE_NAME_SELECT) -> dict:
         """
-        Retrieve all notebooks for the authenticated user.
+        Retrieve all notebooks for the authenticated user, following @odata.nextLink.
+        Returns an empty list if any page could not be fetched.
         """
         
         try:
-            response = requests.get(self.notebook_base_url, headers=get_headers(access_token), timeout=10)
-            response.raise_for_status()
-            
-            notebooks = response.json()
-            if 'value' not in notebooks:
-                log_operation(
-                    "error",
-                    "No 'value' key in API response",
-                    operation="get_notebooks",
-                    object="notebooks"
-                )
-                return []
+            notebooks = self.client.iter_collection(
+                self.notebook_base_url,
+                headers=get_headers(access_token),
+                params=get_page_params(select=select),
+                timeout=10,
+            )
+            notebook_list = [
+                {"name": notebook.get('displayName', 'Unnamed'), "id": notebook.get('id')}
+                for notebook in notebooks
+            ]
 
             log_operation(
                 "info",
@@ -72,11 +104,6 @@ class OneNoteLib:
                 operation="get_notebooks",
                 object="notebooks"
             )
-
-            notebook_list = [
-                {"name": notebook.get('displayName', 'Unnamed'), "id": notebook.get('id')}
-                for notebook in notebooks['value']
-            ]
             return notebook_list
 
         except requests.exceptions.RequestException as e:
@@ -88,13 +115,14 @@ class OneNoteLib:
             )
             return []
 
-    def list_sections(self, access_token: str, notebook_id: str) -> list[dict[str, str]]:
+    def list_sections(self, access_token: str, notebook_id: str, select=ONENOTE_NAME_SELECT) -> list[dict[str, str]]:
         """
         List all sections in a OneNote notebook.
 
         Args:
             access_token (str): The access token for authentication.
             notebook_id (str): The ID of the OneNote notebook.
+            select (str | list[str]): Section properties to fetch ($select).
 
         Returns:
             list[dict[str, str]]: A list of sections with their names and IDs.
@@ -106,11 +134,9 @@ class OneNoteLib:
         url = f"{self.notebook_base_url}/{notebook_id}/sections"
         try:
             headers = get_headers(access_token) or {}
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            sections = self.client.iter_collection(url, headers=headers, params=get_page_params(select=select))
 
             # Extract and format section information
-            sections = response.json().get("value", [])
             section_info = [
                 {"name": section.get("displayName", "Unnamed Section"), "id": section.get("id", "")}
                 for section in sections
@@ -126,6 +152,7 @@ class OneNoteLib:
 
         except requests.exceptions.RequestException as e:
             error_message = f"Error listing sections for notebook '{notebook_id}': {str(e)}"
+            response = getattr(e, "response", None)
             if response is not None:
                 error_message += f" (Status Code: {response.status_code}, Response: {response.text})"
 
@@ -137,17 +164,30 @@ class OneNoteLib:
             )
             return []
         
-    def list_pages(self, access_token, section_id: str = None):
-        """List all pages in a OneNote section."""
+    def iter_pages(self, access_token, section_id: str = None, page_size: int = None, select=None, expand=None):
+        """
+        Lazily yield all pages in a OneNote section (or of the user if no section
+        is given), following @odata.nextLink.
+
+        Args:
+            access_token (str): The access token for authentication.
+            section_id (str): The ID of the section. None lists all pages.
+            page_size (int): Pages per request ($top, at most 100 for OneNote).
+            select (str | list[str]): Page properties to return ($select). None returns all.
+            expand (str | list[str]): Relationships to inline ($expand), e.g. "parentSection".
+
+        Raises:
+            requests.exceptions.RequestException: If fetching any page fails.
+        """
         if section_id is None:
             url = f"{self.page_base_url}"
         else:
             url = f"{self.section_base_url}/{section_id}/pages"
 
         try:
-            response = requests.get(url, headers=get_headers(access_token))
-            response.raise_for_status()
-            return response.json().get("value", [])
+            yield from self.client.iter_collection(
+                url, headers=get_headers(access_token), params=get_page_params(page_size, select, expand)
+            )
         except requests.exceptions.RequestException as e:
             log_operation(
                 "error",
@@ -155,70 +195,282 @@ class OneNoteLib:
                 operation="list_pages",
                 object=section_id
             )
+            raise
+
+    def list_pages(self, access_token, section_id: str = None, page_size: int = None, select=None, expand=None):
+        """List all pages in a OneNote section, or an empty list if any page could not be fetched."""
+        try:
+            return list(self.iter_pages(access_token, section_id, page_size, select, expand))
+        except requests.exceptions.RequestException:
             return []
    
-    def get_notebook_structure(self, access_token: str, notebook_id: str) -> dict:
+    def get_pages_by_id(self, access_token: str, page_ids: list[str]) -> dict:
         """
-        Get the structure of a notebook, including sections and pages.
+        Fetch the metadata of many pages through Graph batching.
+
+        Returns:
+            dict: Page ID -> page metadata, for all pages that could be fetched.
+        """
+        sub_requests = [
+            {"id": str(index), "method": "GET", "url": self.get_page_url(page_id)}
+            for index, page_id in enumerate(page_ids)
+        ]
+        try:
+            responses = self.client.execute_batch(
+                access_token, sub_requests, graph_root=get_graph_root(self.page_base_url)
+            )
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error fetching {len(page_ids)} pages: {str(e)}",
+                operation="get_pages_by_id"
+            )
+            return {}
+        pages = {}
+        for index, page_id in enumerate(page_ids):
+            response = responses.get(str(index), {})
+            if response.get("status") == 200:
+                pages[page_id] = response["body"]
+            else:
+                log_operation(
+                    "error",
+                    f"Error fetching page '{page_id}': status {response.get('status')}",
+                    operation="get_pages_by_id",
+                    object=page_id
+                )
+        return pages
+
+    def get_page_content(self, access_token: str, page_id: str, last_modified: str = None) -> str:
+        """
+        Retrieve the HTML body of a page. Images and attachments are referenced
+        by resource URLs that need the access token as well.
+
+        With a content cache, unchanged pages are served from the cache. Pass the
+        page's lastModifiedDateTime from a listing (e.g. iter_pages) as
+        last_modified; otherwise it is looked up with a small metadata request.
+
+        Returns:
+            str: The page HTML, or None on failure.
         """
-        url = f"{self.notebook_base_url}/{notebook_id}/sections"
-        print(url)
-        
         try:
-            response = requests.get(url, headers=get_headers(access_token))
-            print
+            if self.content_cache is not None:
+                if last_modified is None:
+                    response = self.client.get(
+                        self.get_page_url(page_id),
+                        headers=get_headers(access_token),
+                        params={"$select": "id,lastModifiedDateTime"},
+                    )
+                    response.raise_for_status()
+                    last_modified = response.json().get("lastModifiedDateTime")
+                content = self.content_cache.get(page_id, last_modified)
+                if content is not None:
+                    return content
+
+            response = self.client.get(f"{self.get_page_url(page_id)}/content", headers=get_headers(access_token))
             response.raise_for_status()
-            
-            sections = response.json().get("value", [])
-            notebook_structure = {}
-            for section in sections:
-                section_id = section['id']
-                section_name = section['displayName']
-                pages_url = f"{self.base_url}sections/{section_id}/pages"
-                pages_response = requests.get(pages_url, headers=get_headers(access_token))
-                pages_response.raise_for_status()
-                pages = pages_response.json().get("value", [])
-                notebook_structure[section_name] = [
-                    {'page_id': page['id'], 'page_title': page['title']} for page in pages
-                ]
+            if self.content_cache is not None:
+                self.content_cache.put(page_id, last_modified, response.text)
+            return response.text
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error retrieving content of page '{page_id}': {str(e)}",
+                operation="get_page_content",
+                object=page_id
+            )
+            return None
+
+    def _parse_group(self, data: dict, group, pending_groups: list, pending_sections: list):
+        """
+        Fill a notebook or section group from an expanded Graph response.
+
+        Section groups whose contents were not expanded are queued in pending_groups,
+        sections whose pages were not expanded completely in pending_sections.
+        """
+        for section_data in data.get("sections", []):
+            section = OneNoteSection(section_data["id"], section_data.get("displayName", ""))
+            group.sections.append(section)
+            if "pages" in section_data and "pages@odata.nextLink" not in section_data:
+                section.pages = [OneNotePage.from_graph(page) for page in section_data["pages"]]
+            else:
+                pending_sections.append(section)
+        for group_data in data.get("sectionGroups", []):
+            child = OneNoteSectionGroup(group_data["id"], group_data.get("displayName", ""))
+            group.section_groups.append(child)
+            if "sections" in group_data:
+                self._parse_group(group_data, child, pending_groups, pending_sections)
+            else:
+                pending_groups.append(child)
+
+    def _get_expanded(self, access_token: str, url: str, expand_pages: bool) -> dict:
+        """
+        Fetch a notebook or section group with two levels of contents expanded.
+        """
+        response = self.client.get(
+            url,
+            headers=get_headers(access_token),
+            params={"$expand": STRUCTURE_EXPAND if expand_pages else STRUCTURE_EXPAND_NO_PAGES},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_notebook_tree(self, access_token: str, notebook_id: str, max_workers: int = 4) -> OneNoteNotebook:
+        """
+        Load a notebook with all section groups, sections and pages.
+
+        One request with nested $expand returns the notebook with its sections,
+        their pages and two levels of section groups. Deeper section groups are
+        loaded the same way, and sections whose expanded page list is incomplete
+        (or every section, if the service rejects expanding pages) are paged
+        concurrently.
+
+        Args:
+            access_token (str): The access token for authentication.
+            notebook_id (str): The ID of the notebook.
+            max_workers (int): Number of concurrent follow-up requests.
+
+        Returns:
+            OneNoteNotebook: The notebook tree, or None on failure.
+        """
+        try:
+            expand_pages = True
+            try:
+                data = self._get_expanded(access_token, self.get_notebook_url(notebook_id), expand_pages)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                log_operation(
+                    "info",
+                    f"Expanding pages rejected, paging sections instead: {str(e)}",
+                    operation="get_notebook_tree",
+                    object=notebook_id,
+                )
+                expand_pages = False
+                data = self._get_expanded(access_token, self.get_notebook_url(notebook_id), expand_pages)
+
+            notebook = OneNoteNotebook(data["id"], data.get("displayName", ""))
+            pending_groups = []
+            pending_sections = []
+            self._parse_group(data, notebook, pending_groups, pending_sections)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while pending_groups:
+                    groups, pending_groups = pending_groups, []
+                    responses = executor.map(
+                        lambda group: self._get_expanded(
+                            access_token, f"{self.section_group_base_url}/{group.id}", expand_pages
+                        ),
+                        groups,
+                    )
+                    for group, group_data in zip(groups, responses):
+                        self._parse_group(group_data, group, pending_groups, pending_sections)
+
+                def fetch_pages(section):
+                    url = f"{self.section_base_url}/{section.id}/pages"
+                    params = get_page_params(ONENOTE_MAX_PAGE_SIZE, PAGE_SUMMARY_SELECT)
+                    return [
+                        OneNotePage.from_graph(page)
+                        for page in self.client.iter_collection(url, headers=get_headers(access_token), params=params)
+                    ]
+
+                for section, pages in zip(pending_sections, executor.map(fetch_pages, pending_sections)):
+                    section.pages = pages
+
             log_operation(
                 "info",
-                f"Structure retrieved for notebook {notebook_id}",
-                operation="get_notebook_structure",
+                f"Structure retrieved for notebook {notebook_id} "
+                f"({len(pending_sections)} sections paged, {sum(1 for _ in notebook.iter_sections())} sections)",
+                operation="get_notebook_tree",
                 object=notebook_id
             )
-            return notebook_structure
+            return notebook
         except requests.exceptions.RequestException as e:
             log_operation(
                 "error",
                 f"Error retrieving structure for notebook '{notebook_id}': {str(e)}",
-                operation="get_notebook_structure",
+                operation="get_notebook_tree",
                 object=notebook_id
             )
             return None
 
-    def create_page(self, access_token: str, section_id: str, title: str, content_html: str) -> dict:
+    def get_notebook_structure(self, access_token: str, notebook_id: str) -> dict:
         """
-        Create a page in a specific section of a OneNote notebook.
+        Get the structure of a notebook, including sections and pages.
+
+        Returns:
+            dict: Name of each section directly in the notebook -> list of
+            {"page_id", "page_title"}, or None on failure. Use get_notebook_tree
+            for section groups and page timestamps.
         """
-        url = f"{self.notebook_base_url}sections/{section_id}/pages"
-        
-        data = {
-            "title": title,
-            "content": content_html
+        notebook = self.get_notebook_tree(access_token, notebook_id)
+        if notebook is None:
+            return None
+        return {
+            section.name: [{"page_id": page.id, "page_title": page.title} for page in section.pages]
+            for section in notebook.sections
         }
-        try:
-            response = requests.post(url, json=data, headers=get_headers(access_token))
+
+    def _post_page(self, access_token: str, section_id: str, page_html: str, attachments: dict = None) -> dict:
+        """
+        POST the XHTML of a new page to a section. With attachments, the page is
+        sent as a streamed multipart/form-data body with one binary part per
+        attachment, which the HTML references as "name:<part name>".
+
+        Raises:
+            requests.exceptions.RequestException: If the page cannot be created.
+        """
+        url = f"{self.get_section_url(section_id)}/pages"
+        headers = get_headers(access_token)
+        if not attachments:
+            headers["Content-Type"] = "application/xhtml+xml"
+            response = self.client.post(url, data=page_html.encode("utf-8"), headers=headers)
             response.raise_for_status()
-            page_id = response.json().get("id")
+            return response.json()
+
+        with MultipartStream() as body:
+            body.add_part("Presentation", page_html.encode("utf-8"), "application/xhtml+xml")
+            for name, attachment in attachments.items():
+                content_type = None
+                if isinstance(attachment, tuple):
+                    attachment, content_type = attachment
+                if isinstance(attachment, str):
+                    attachment = pathlib.Path(attachment)
+                body.add_part(name, attachment, content_type, filename=getattr(attachment, "name", None))
+            headers["Content-Type"] = body.content_type
+            response = self.client.post(url, data=body, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def create_page(
+        self, access_token: str, section_id: str, title: str, content_html: str, attachments: dict = None
+    ) -> dict:
+        """
+        Create a page in a specific section of a OneNote notebook.
+
+        Args:
+            access_token (str): The access token for authentication.
+            section_id (str): The ID of the section.
+            title (str): Page title.
+            content_html (str): Body HTML. Images and files from attachments are
+                referenced by part name, e.g. <img src="name:chart" /> or
+                <object data="name:report" data-attachment="report.pdf" type="application/pdf" />.
+            attachments (dict): Optional part name -> file path, bytes-like object
+                or binary file object, or a (source, content_type) tuple. They are
+                streamed from disk or the buffer instead of being inlined as base64.
+                The content type is otherwise guessed from the file name.
+
+        Returns:
+            dict: The created page, or None on failure.
+        """
+        try:
+            page = self._post_page(access_token, section_id, render_page(title, content_html), attachments)
             log_operation(
                 "info",
-                f"Page created: {title} (ID: {page_id})",
+                f"Page created: {title} (ID: {page.get('id')})",
                 operation="create_page",
                 object=title
             )
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return page
+        except (requests.exceptions.RequestException, OSError) as e:
             log_operation(
                 "error",
                 f"Error creating page '{title}': {str(e)}",
@@ -227,25 +479,176 @@ class OneNoteLib:
             )
             return None
 
+    def _create_pages_batched(self, access_token: str, section_ids: list[str], rendered: list[str]) -> list[dict]:
+        """
+        Create pages through Graph batching. Each page depends on the previous page
+        of its section, so Graph creates the pages of a section one after another.
+
+        A failed page makes Graph answer 424 (Failed Dependency) for the pages
+        queued behind it. Those pages are sent again in a further round, chained
+        to each other only, so one failure does not drop the rest of its section,
+        as with the concurrent path. Only a missing section (404) stops its pages.
+        """
+        results = [None] * len(rendered)
+        pending = list(range(len(rendered)))
+        while pending:
+            sub_requests = []
+            previous = {}
+            for index in pending:
+                section_id = section_ids[index]
+                sub_request = {
+                    "id": str(index),
+                    "method": "POST",
+                    "url": f"{self.get_section_url(section_id)}/pages",
+                    "headers": {"Content-Type": "application/xhtml+xml"},
+                    # Batch bodies that are not JSON are sent base64-encoded
+                    "body": base64.b64encode(rendered[index].encode("utf-8")).decode("ascii"),
+                }
+                if section_id in previous:
+                    sub_request["dependsOn"] = [previous[section_id]]
+                previous[section_id] = str(index)
+                sub_requests.append(sub_request)
+
+            responses = self.client.execute_batch(
+                access_token, sub_requests, graph_root=get_graph_root(self.section_base_url)
+            )
+            retry = []
+            missing_sections = set()
+            for index in pending:
+                response = responses.get(str(index), {})
+                status = response.get("status")
+                if status == 201:
+                    results[index] = response["body"]
+                    continue
+                if status == 424 and section_ids[index] not in missing_sections:
+                    retry.append(index)
+                    continue
+                if status == 404:
+                    missing_sections.add(section_ids[index])
+                log_operation(
+                    "error",
+                    f"Error creating page {index} in section '{section_ids[index]}': status {status}",
+                    operation="create_pages",
+                    object=section_ids[index]
+                )
+            if len(retry) == len(pending):
+                # Nothing was created or failed outright, so another round would not progress
+                for index in retry:
+                    log_operation(
+                        "error",
+                        f"Error creating page {index} in section '{section_ids[index]}': status 424",
+                        operation="create_pages",
+                        object=section_ids[index]
+                    )
+                break
+            # Pages of a missing section come after the 404 in input order and were logged above
+            pending = retry
+        return results
+
+    def _create_pages_concurrently(
+        self, access_token: str, section_ids: list[str], rendered: list[str], attachments: list, max_workers: int
+    ) -> list[dict]:
+        """
+        Create pages with one worker per section; the pages of a section are posted in order.
+        """
+        results = [None] * len(rendered)
+        by_section = {}
+        for index, section_id in enumerate(section_ids):
+            by_section.setdefault(section_id, []).append(index)
+
+        def create_section_pages(section_id):
+            for index in by_section[section_id]:
+                try:
+                    results[index] = self._post_page(access_token, section_id, rendered[index], attachments[index])
+                except (requests.exceptions.RequestException, OSError) as e:
+                    log_operation(
+                        "error",
+                        f"Error creating page {index} in section '{section_id}': {str(e)}",
+                        operation="create_pages",
+                        object=section_id
+                    )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(create_section_pages, by_section))
+        return results
+
+    def create_pages(
+        self,
+        access_token: str,
+        pages: list[dict],
+        template: OneNotePageTemplate = None,
+        use_batch: bool = True,
+        max_workers: int = 4,
+    ) -> list[dict]:
+        """
+        Create many pages, keeping their order within each section.
+
+        All pages are rendered with one precompiled template before any request
+        is sent. They are then created through Graph batching (up to 20 pages
+        per round trip), or by one worker per section. Pages with attachments
+        are streamed as multipart bodies, which batching cannot carry, so any
+        attachment switches the whole run to the workers.
+
+        Args:
+            access_token (str): The access token for authentication.
+            pages (list[dict]): One dict per page with "section_id" and "title",
+                plus "content_html" and/or the variables of the template's body,
+                and optionally "attachments" as accepted by create_page.
+            template (OneNotePageTemplate): Template to render the pages with.
+                Defaults to a page whose body is content_html.
+            use_batch (bool): Create the pages through Graph batching.
+            max_workers (int): Number of sections filled concurrently without batching.
+
+        Returns:
+            list[dict]: The created page (or None if it failed) for every input
+            page, in input order.
+        """
+        template = template or OneNotePageTemplate()
+        section_ids = [page["section_id"] for page in pages]
+        attachments = [page.get("attachments") for page in pages]
+        rendered = [
+            template.render(**{key: value for key, value in page.items() if key not in ("section_id", "attachments")})
+            for page in pages
+        ]
+        if use_batch and not any(attachments):
+            try:
+                results = self._create_pages_batched(access_token, section_ids, rendered)
+            except requests.exceptions.RequestException as e:
+                log_operation(
+                    "error",
+                    f"Error creating {len(pages)} pages: {str(e)}",
+                    operation="create_pages"
+                )
+                return [None] * len(pages)
+        else:
+            results = self._create_pages_concurrently(access_token, section_ids, rendered, attachments, max_workers)
+
+        log_operation(
+            "info",
+            f"Created {sum(1 for page in results if page is not None)} of {len(pages)} pages "
+            f"in {len(set(section_ids))} sections",
+            operation="create_pages"
+        )
+        return results
+
     def add_text_to_page(self, access_token: str, page_id: str, content_html: str) -> dict:
         """
-        Add content to an existing OneNote page.
+        Append content to the body of an existing OneNote page.
         """
-        url = f"{self.notebook_base_url}pages/{page_id}/content"
-        
-        data = {
-            "content": content_html
-        }
+        url = f"{self.get_page_url(page_id)}/content"
+        data = [{"target": "body", "action": "append", "content": content_html}]
         try:
-            response = requests.patch(url, json=data, headers=get_headers(access_token))
+            response = self.client.patch(url, json=data, headers=get_headers(access_token))
             response.raise_for_status()
+            if self.content_cache is not None:
+                self.content_cache.invalidate(page_id)
             log_operation(
                 "info",
                 f"Text added to page: {page_id}",
                 operation="add_text_to_page",
                 object=page_id
             )
-            return response.json()
+            return {"id": page_id, "status": response.status_code}
         except requests.exceptions.RequestException as e:
             log_operation(
                 "error",
@@ -253,4 +656,4 @@ class OneNoteLib:
                 operation="add_text_to_page",
                 object=page_id
             )
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,64 @@
+from jinja2 import Environment
+from markupsafe import Markup
+
+# XHTML skeleton of a new page; OneNote takes the title and creation date from the head
+PAGE_SKELETON = """<!DOCTYPE html>
+<html>
+<head>
+<title>{{ title }}</title>
+{% if created %}
+<meta name="created" content="{{ created }}" />
+{% endif %}
+</head>
+<body>
+{{ body }}
+</body>
+</html>
+"""
+
+# Autoescaping makes every variable safe for XHTML, except values marked as Markup
+_environment = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+_page_skeleton = _environment.from_string(PAGE_SKELETON)
+
+
+class OneNotePageTemplate:
+    """
+    Renders the XHTML of new OneNote pages.
+
+    Templates are compiled once when the object is created, so rendering
+    thousands of pages only fills in the variables. All variables, including
+    the title, are escaped; content_html is inserted as trusted HTML.
+    """
+
+    def __init__(self, body_template: str = None):
+        """
+        Args:
+            body_template (str): Optional Jinja2 template of the page body. It is
+                rendered with the title and the keyword arguments of render.
+                Without it, the body is the content_html passed to render.
+        """
+        self.body_template = _environment.from_string(body_template) if body_template else None
+
+    def render(self, title: str, content_html: str = None, created: str = None, **context) -> str:
+        """
+        Render a complete page.
+
+        Args:
+            title (str): Page title; escaped.
+            content_html (str): Body HTML, used as is when there is no body template.
+            created (str): Optional ISO 8601 creation date shown on the page.
+            **context: Variables of the body template; escaped.
+        """
+        if self.body_template is not None:
+            body = Markup(self.body_template.render(title=title, content_html=Markup(content_html or ""), **context))
+        else:
+            body = Markup(content_html or "")
+        return _page_skeleton.render(title=title, body=body, created=created)
+
+
+_default_template = OneNotePageTemplate()
+
+
+def render_page(title: str, content_html: str, created: str = None) -> str:
+    """Render a page with the given title and body HTML."""
+    return _default_template.render(title, content_html, created)
@@ -0,0 +1,51 @@
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class OneNotePage:
+    id: str
+    title: str
+    created: str = None
+    last_modified: str = None
+
+    @classmethod
+    def from_graph(cls, page: dict) -> "OneNotePage":
+        return cls(page["id"], page.get("title") or "", page.get("createdDateTime"), page.get("lastModifiedDateTime"))
+
+
+@dataclass
+class OneNoteSection:
+    id: str
+    name: str
+    pages: list[OneNotePage] = field(default_factory=list)
+
+
+@dataclass
+class OneNoteSectionGroup:
+    id: str
+    name: str
+    sections: list[OneNoteSection] = field(default_factory=list)
+    section_groups: list["OneNoteSectionGroup"] = field(default_factory=list)
+
+    def iter_sections(self):
+        """Yield all sections, including those in nested section groups."""
+        yield from self.sections
+        for group in self.section_groups:
+            yield from group.iter_sections()
+
+    def iter_pages(self):
+        """Yield all pages of all sections."""
+        for section in self.iter_sections():
+            yield from section.pages
+
+    def find_section(self, name: str) -> OneNoteSection:
+        """Return the first section with the given name, searching nested groups too."""
+        return next((section for section in self.iter_sections() if section.name == name), None)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class OneNoteNotebook(OneNoteSectionGroup):
+    """A notebook: sections and section groups, like a section group at the top level."""
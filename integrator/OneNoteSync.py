@@ -0,0 +1,227 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from integrator.integrator.logging_config import log_operation
+from integrator.integrator.OneLib import get_headers
+from integrator.integrator.OneNoteLib import (ONENOTE_MAX_PAGE_SIZE,
+                                             PAGE_SUMMARY_SELECT, OneNoteLib)
+
+# Full listings that catch deleted pages, which a lastModifiedDateTime filter never returns
+DEFAULT_RECONCILE_INTERVAL = 24 * 3600
+CHANGED_PAGES_EXPAND = "parentSection($select=id)"
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a Graph timestamp such as "2024-05-01T10:00:00.123Z"."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_timestamp(timestamp: float) -> str:
+    """Format a POSIX timestamp the way Graph expects it in $filter."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class OneNoteSync:
+    """
+    Incremental sync of the pages of OneNote notebooks.
+
+    The first sync of a notebook lists all of its pages. Later syncs ask Graph
+    only for pages of that notebook modified since its own watermark, the
+    newest lastModifiedDateTime seen (or, for a notebook without pages, the
+    time of its last sync). Deleted pages do not show up in that query, so
+    every reconcile_interval seconds a notebook is listed completely again to
+    find them.
+    """
+
+    def __init__(self, onenote: OneNoteLib, state_file: str, reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL):
+        """
+        Initialize the sync and load a previously persisted state.
+
+        Args:
+            onenote (OneNoteLib): Library instance providing base URLs and HTTP client.
+            state_file (str): JSON file holding the watermarks and the known pages.
+            reconcile_interval (float): Seconds between full listings of a notebook.
+        """
+        self.onenote = onenote
+        self.state_file = state_file
+        self.reconcile_interval = reconcile_interval
+        # notebook ID -> {"watermark", "reconciled_at", "pages": {page ID -> {"title", "section_id", "last_modified"}}}
+        self.notebooks = {}
+        self.load_state()
+
+    def load_state(self) -> None:
+        """
+        Load watermarks and known pages from the state file, if present.
+        """
+        self.notebooks = {}
+        if not os.path.isfile(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r") as file:
+                self.notebooks = json.load(file).get("notebooks", {})
+        except (OSError, json.JSONDecodeError) as e:
+            log_operation(
+                "error",
+                f"Ignoring unreadable OneNote sync state {self.state_file}: {str(e)}",
+                operation="load_onenote_sync_state",
+                object=self.state_file,
+            )
+            self.notebooks = {}
+
+    def save_state(self) -> None:
+        """
+        Persist watermarks and known pages, replacing the state file atomically.
+        """
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, "w") as file:
+            json.dump({"notebooks": self.notebooks}, file)
+        os.replace(temp_file, self.state_file)
+
+    def reset(self, notebook_id: str = None) -> None:
+        """
+        Forget one notebook (or all); the next sync lists it completely again.
+        """
+        if notebook_id is None:
+            self.notebooks = {}
+        else:
+            self.notebooks.pop(notebook_id, None)
+
+    @staticmethod
+    def _apply(state: dict, notebook_id: str, page: dict, section_id: str) -> dict:
+        """
+        Record one listed page in a notebook's state and describe the change.
+        """
+        known = state["pages"].get(page["id"])
+        entry = {"title": page.get("title"), "section_id": section_id, "last_modified": page.get("lastModifiedDateTime")}
+        state["pages"][page["id"]] = entry
+        if entry["last_modified"] and (
+            state["watermark"] is None or parse_timestamp(entry["last_modified"]) > parse_timestamp(state["watermark"])
+        ):
+            state["watermark"] = entry["last_modified"]
+        if known is not None and known["last_modified"] == entry["last_modified"] and known["section_id"] == section_id:
+            return None
+        return {"type": "created" if known is None else "changed", "id": page["id"], "notebook_id": notebook_id, **entry}
+
+    def _reconcile(self, access_token: str, notebook_id: str) -> list[dict]:
+        """
+        List all pages of a notebook and compare them with the known pages.
+
+        Raises:
+            requests.exceptions.RequestException: If the notebook cannot be listed.
+        """
+        notebook = self.onenote.get_notebook_tree(access_token, notebook_id)
+        if notebook is None:
+            raise requests.exceptions.RequestException(f"Notebook '{notebook_id}' could not be listed")
+        previous = self.notebooks.get(notebook_id, {}).get("pages", {})
+        state = {"watermark": None, "reconciled_at": time.time(), "pages": dict(previous)}
+        changes = []
+        listed = set()
+        for section in notebook.iter_sections():
+            for page in section.pages:
+                listed.add(page.id)
+                page_data = {"id": page.id, "title": page.title, "lastModifiedDateTime": page.last_modified}
+                change = self._apply(state, notebook_id, page_data, section.id)
+                if change:
+                    changes.append(change)
+        for page_id in set(previous).difference(listed):
+            entry = state["pages"].pop(page_id)
+            changes.append({"type": "deleted", "id": page_id, "notebook_id": notebook_id, **entry})
+        self.notebooks[notebook_id] = state
+        return changes
+
+    def _fetch_changed_pages(self, access_token: str, notebook_id: str, watermark: str):
+        """
+        Yield the pages of a notebook modified at or after watermark, oldest
+        first, with their section IDs expanded.
+        """
+        params = {
+            "$filter": f"lastModifiedDateTime ge {watermark} and parentNotebook/id eq '{notebook_id}'",
+            "$orderby": "lastModifiedDateTime asc",
+            "$select": PAGE_SUMMARY_SELECT,
+            "$expand": CHANGED_PAGES_EXPAND,
+            "$top": ONENOTE_MAX_PAGE_SIZE,
+        }
+        yield from self.onenote.client.iter_collection(
+            self.onenote.page_base_url, headers=get_headers(access_token), params=params
+        )
+
+    def sync(self, access_token: str, notebook_ids: list[str] = None, reconcile: bool = False) -> list[dict]:
+        """
+        Fetch the pages created or changed since the last sync.
+
+        Notebooks synced for the first time, and notebooks whose last full
+        listing is older than reconcile_interval (or all, with reconcile), are
+        listed completely, which also reports deleted pages. All others are
+        queried for their pages modified since their own watermark. Pages
+        modified exactly at a watermark are returned again by Graph, but are
+        only reported if they differ from the known state.
+
+        Args:
+            access_token (str): The access token for authentication.
+            notebook_ids (list[str]): Notebooks to sync. Defaults to all notebooks
+                synced before.
+            reconcile (bool): List all notebooks completely.
+
+        Returns:
+            list[dict]: One entry per change with "type" (created, changed or
+            deleted), "id", "notebook_id", "section_id", "title" and
+            "last_modified". Empty if nothing changed or the requests failed.
+        """
+        if notebook_ids is None:
+            notebook_ids = list(self.notebooks)
+        now = time.time()
+        full = [
+            notebook_id
+            for notebook_id in notebook_ids
+            if reconcile
+            or notebook_id not in self.notebooks
+            or self.notebooks[notebook_id]["watermark"] is None
+            or now - self.notebooks[notebook_id]["reconciled_at"] >= self.reconcile_interval
+        ]
+        incremental = [notebook_id for notebook_id in notebook_ids if notebook_id not in full]
+
+        changes = []
+        try:
+            for notebook_id in full:
+                changes.extend(self._reconcile(access_token, notebook_id))
+            for notebook_id in incremental:
+                state = self.notebooks[notebook_id]
+                watermark = state["watermark"]
+                fetched = 0
+                for page in self._fetch_changed_pages(access_token, notebook_id, watermark):
+                    fetched += 1
+                    section_id = (page.get("parentSection") or {}).get("id")
+                    change = self._apply(state, notebook_id, page, section_id)
+                    if change:
+                        changes.append(change)
+                log_operation(
+                    "info",
+                    f"Fetched {fetched} pages of notebook {notebook_id} modified since {watermark}",
+                    operation="onenote_sync",
+                    object=notebook_id,
+                )
+        except requests.exceptions.RequestException as e:
+            log_operation(
+                "error",
+                f"Error syncing OneNote pages: {str(e)}",
+                operation="onenote_sync",
+            )
+            # Keep the previous watermarks so the next run fetches the same changes
+            self.load_state()
+            return []
+
+        for notebook_id in notebook_ids:
+            # A notebook without pages has no lastModifiedDateTime to continue from
+            if self.notebooks[notebook_id]["watermark"] is None:
+                self.notebooks[notebook_id]["watermark"] = format_timestamp(now)
+        self.save_state()
+        log_operation(
+            "info",
+            f"OneNote sync found {len(changes)} changes ({len(full)} notebooks listed completely)",
+            operation="onenote_sync",
+        )
+        return changes
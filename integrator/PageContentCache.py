@@ -0,0 +1,163 @@
+import sqlite3
+import threading
+import zlib
+
+from integrator.integrator.logging_config import log_operation
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    last_modified TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages (last_used);
+"""
+
+
+class PageContentCache:
+    """
+    On-disk LRU cache of OneNote page HTML.
+
+    Entries are keyed by page ID and valid only for the lastModifiedDateTime
+    they were stored with, which callers take from page listings; a page that
+    was edited since is a miss. Contents are stored zlib-compressed, and the
+    least recently used pages are evicted once the compressed contents exceed
+    max_bytes.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+            max_bytes (int): Upper bound for the stored (compressed) page contents.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+            total, clock = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM pages"
+            ).fetchone()
+        self.total_bytes = total
+        # Access counter for the LRU order; unlike wall-clock time it never repeats or goes back
+        self._clock = clock
+        log_operation(
+            "info",
+            f"Page content cache opened: {db_path} ({total / 2**20:.1f} MiB)",
+            operation="open_page_cache",
+            object=db_path,
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, page_id: str, last_modified: str) -> str:
+        """
+        Return the cached content of a page if it was stored for last_modified.
+
+        Returns:
+            str: The page HTML, or None on a miss. Outdated entries are removed;
+            with an unknown last_modified (None) the entry is kept, since it
+            cannot be told whether it is outdated.
+        """
+        if last_modified is None:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT last_modified, content, size FROM pages WHERE page_id = ?", (page_id,)
+            ).fetchone()
+            if row is None or row[0] != last_modified:
+                self.misses += 1
+                if row is not None:
+                    self.connection.execute("DELETE FROM pages WHERE page_id = ?", (page_id,))
+                    self.total_bytes -= row[2]
+                return None
+            self.hits += 1
+            self._clock += 1
+            self.connection.execute("UPDATE pages SET last_used = ? WHERE page_id = ?", (self._clock, page_id))
+        return zlib.decompress(row[1]).decode("utf-8")
+
+    def put(self, page_id: str, last_modified: str, content: str) -> None:
+        """
+        Store the content of a page, evicting least recently used pages if needed.
+        Contents larger than max_bytes on their own are not cached.
+        """
+        if last_modified is None:
+            return
+        data = zlib.compress(content.encode("utf-8"))
+        if len(data) > self.max_bytes:
+            return
+        with self.lock, self.connection:
+            previous = self.connection.execute("SELECT size FROM pages WHERE page_id = ?", (page_id,)).fetchone()
+            self._clock += 1
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages (page_id, last_modified, content, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (page_id, last_modified, data, len(data), self._clock),
+            )
+            self.total_bytes += len(data) - (previous[0] if previous else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used pages until the contents fit into max_bytes. Needs the lock."""
+        evicted = []
+        for page_id, size in self.connection.execute("SELECT page_id, size FROM pages ORDER BY last_used"):
+            if self.total_bytes <= self.max_bytes:
+                break
+            evicted.append((page_id,))
+            self.total_bytes -= size
+        self.connection.executemany("DELETE FROM pages WHERE page_id = ?", evicted)
+        self.evictions += len(evicted)
+
+    def invalidate(self, page_id: str) -> None:
+        """Remove a page, e.g. after changing it."""
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT size FROM pages WHERE page_id = ?", (page_id,)).fetchone()
+            if row is not None:
+                self.connection.execute("DELETE FROM pages WHERE page_id = ?", (page_id,))
+                self.total_bytes -= row[0]
+
+    def clear(self) -> None:
+        """Remove all pages and reset the counters."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM pages")
+            self.total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: "hits", "misses", "hit_rate", "evictions", "entries" and "bytes"
+            (compressed size of the cached contents).
+        """
+        with self.lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self.total_bytes,
+            }
@@ -0,0 +1,67 @@
+import time
+import tracemalloc
+
+from integrator.integrator.DriveItemTree import DriveItemTree
+
+FOLDER_URL = "https://graph.microsoft.com/v1.0/me/drive/items/"
+# 10 * 10^2 + ... + 10^5 folders, about 111,000 nodes
+FAN_OUT = 10
+DEPTH = 5
+
+
+def iter_synthetic_folders():
+    """Yield (parent key, item) pairs of a synthetic tree with repeating folder names, parents first."""
+    pending = [("root", 1)]
+    counter = 0
+    while pending:
+        parent_id, depth = pending.pop()
+        for position in range(FAN_OUT):
+            counter += 1
+            item = {"id": f"0123456789ABCDEF!{counter}", "name": f"Folder {position}", "folder": {}}
+            yield parent_id, item
+            if depth < DEPTH:
+                pending.append((item["id"], depth + 1))
+
+
+def build_nested_dicts() -> dict:
+    folder_structure = {}
+    subfolders_by_id = {"root": folder_structure}
+    for parent_id, item in iter_synthetic_folders():
+        node = {"FolderURL": FOLDER_URL + item["id"], "Subfolders": {}}
+        subfolders_by_id[parent_id][item["name"]] = node
+        subfolders_by_id[item["id"]] = node["Subfolders"]
+    return folder_structure
+
+
+def build_tree() -> DriveItemTree:
+    tree = DriveItemTree()
+    index_by_id = {"root": 0}
+    for parent_id, item in iter_synthetic_folders():
+        index_by_id[item["id"]] = tree.add_item(index_by_id[parent_id], item)
+    return tree
+
+
+def measure(label: str, build) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    # Helper maps used while building are freed by now; only the result is still allocated
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} retained {current / 2**20:7.1f} MiB  peak {peak / 2**20:7.1f} MiB  build {elapsed:5.2f} s")
+    return result
+
+
+def benchmark_drive_item_tree():
+    """
+    Compare the memory held by the nested get_folders dictionaries with a
+    DriveItemTree of the same folders.
+    """
+    measure("nested dicts", build_nested_dicts)
+    tree = measure("DriveItemTree", build_tree)
+    print(f"{len(tree) - 1} folders")
+
+
+if __name__ == "__main__":
+    benchmark_drive_item_tree()
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from integrator.integrator.GraphClient import GraphClient
+
+REQUEST_COUNT = 500
+
+
+class StandInGraphHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for graph.microsoft.com answering every GET with a small listing."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    connections_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInGraphHandler.connections_lock:
+            StandInGraphHandler.connections += 1
+
+    def do_GET(self):
+        body = json.dumps({"value": [{"id": "1", "name": "Folder", "folder": {"childCount": 0}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_requests(get, url):
+    latencies = []
+    for _ in range(REQUEST_COUNT):
+        start = time.perf_counter()
+        response = get(url)
+        response.raise_for_status()
+        response.json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies, connections):
+    latencies.sort()
+    mean_ms = sum(latencies) / len(latencies) * 1000
+    p95_ms = latencies[int(len(latencies) * 0.95)] * 1000
+    print(f"{label:<28} mean {mean_ms:7.3f} ms  p95 {p95_ms:7.3f} ms  connections {connections}")
+
+
+def benchmark_graph_client():
+    """
+    Compare per-request latency of module-level requests.get (new connection per
+    call) with the pooled GraphClient against a local stand-in server.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInGraphHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1.0/me/drive/root/children"
+
+    try:
+        StandInGraphHandler.connections = 0
+        latencies = run_requests(requests.get, url)
+        report("requests.get (before)", latencies, StandInGraphHandler.connections)
+
+        StandInGraphHandler.connections = 0
+        # Without the shared rate limiter, which would cap the measured request rate
+        with GraphClient(rate_limiter=None) as client:
+            latencies = run_requests(client.get, url)
+        report("GraphClient pooled (after)", latencies, StandInGraphHandler.connections)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    benchmark_graph_client()
@@ -0,0 +1,73 @@
+import json
+import time
+
+from integrator.integrator.OneDriveLib import FOLDER_TREE_SELECT, METADATA_SELECT
+
+PAGE_SIZE = 200
+PARSE_ROUNDS = 200
+
+
+def recorded_drive_item(index: int) -> dict:
+    """A children listing entry shaped like a full Graph response, with personal data replaced."""
+    identity = {"user": {"email": "user@example.com", "id": "0123456789abcdef", "displayName": "Example User"}}
+    item = {
+        "@microsoft.graph.downloadUrl": f"https://public.bn.files.1drv.com/y4m{'x' * 180}{index}",
+        "createdBy": {"application": {"id": "4c1d2f3a", "displayName": "OneDrive"}, **identity},
+        "createdDateTime": "2024-03-01T09:15:42Z",
+        "cTag": f"\"c:{{9A1F7C3E-2B4D-4E6F-8A0B-{index:012d}}},2\"",
+        "eTag": f"\"{{9A1F7C3E-2B4D-4E6F-8A0B-{index:012d}}},3\"",
+        "id": f"0123456789ABCDEF!{1000 + index}",
+        "lastModifiedBy": {"application": {"id": "4c1d2f3a", "displayName": "OneDrive"}, **identity},
+        "lastModifiedDateTime": "2024-05-17T18:02:11Z",
+        "name": f"Document {index:05d}.docx",
+        "parentReference": {
+            "driveType": "personal",
+            "driveId": "0123456789abcdef",
+            "id": "0123456789ABCDEF!101",
+            "name": "Documents",
+            "path": "/drive/root:/Documents",
+        },
+        "size": 18_000 + index,
+        "webUrl": f"https://1drv.ms/w/s!AbCdEfGhIjKlMnOp{index}",
+        "fileSystemInfo": {"createdDateTime": "2024-03-01T09:15:42Z", "lastModifiedDateTime": "2024-05-17T18:02:11Z"},
+        "reactions": {"commentCount": 0},
+        "shared": {"effectiveRoles": ["write"], "owner": identity, "scope": "users"},
+    }
+    if index % 4 == 0:
+        item["folder"] = {"childCount": index % 17, "view": {"viewType": "thumbnails", "sortBy": "name", "sortOrder": "ascending"}}
+    else:
+        item["file"] = {
+            "mimeType": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "hashes": {"quickXorHash": "AAAAAAAAAAAAAAAAAAAAAAAAAAA=", "sha1Hash": "DA39A3EE5E6B4B0D3255BFEF95601890AFD80709"},
+        }
+    return item
+
+
+def project(item: dict, select: str) -> dict:
+    """Keep the properties Graph returns for a $select projection."""
+    fields = select.split(",")
+    return {key: value for key, value in item.items() if key in fields}
+
+
+def measure(label: str, page: dict) -> None:
+    body = json.dumps(page).encode()
+    start = time.perf_counter()
+    for _ in range(PARSE_ROUNDS):
+        json.loads(body)
+    parse_ms = (time.perf_counter() - start) / PARSE_ROUNDS * 1000
+    print(f"{label:<34} {len(body) / 1024:8.1f} KiB/page  parse {parse_ms:6.3f} ms/page")
+
+
+def benchmark_listing_payload():
+    """
+    Compare the size and parse time of a full children page with the compact
+    projections used by get_folders and the metadata store.
+    """
+    items = [recorded_drive_item(index) for index in range(PAGE_SIZE)]
+    measure("full items", {"value": items})
+    measure(f"$select={METADATA_SELECT[:20]}...", {"value": [project(item, METADATA_SELECT) for item in items]})
+    measure(f"$select={FOLDER_TREE_SELECT}", {"value": [project(item, FOLDER_TREE_SELECT) for item in items]})
+
+
+if __name__ == "__main__":
+    benchmark_listing_payload()
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from integrator.integrator.AsyncGraphClient import AsyncGraphClient
+from integrator.integrator.GraphClient import (GraphClient,
+                                              get_default_rate_limiter)
+from integrator.integrator.GraphThrottle import RetryPolicy, TokenBucket
+
+
+class TestAsyncGraphClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.limiter = TokenBucket(rate=1000, capacity=100)
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            self.requests.append((request.url.path, time.monotonic()))
+            if request.url.path == "/throttled":
+                return httpx.Response(429, headers={"Retry-After": "0.3"})
+            return httpx.Response(200, json={})
+
+        self.client = AsyncGraphClient(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handle)),
+            retry_policy=RetryPolicy(max_retries=0),
+            rate_limiter=self.limiter,
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_throttle_pauses_parallel_requests(self):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        response = await self.client.get("https://graph.example/throttled")
+        throttled_at = time.monotonic()
+        self.assertEqual(response.status_code, 429)
+        responses = await asyncio.gather(*(self.client.get(f"https://graph.example/item/{index}") for index in range(5)))
+        ticker.cancel()
+
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertTrue(all(sent_at >= throttled_at + 0.25 for path, sent_at in self.requests[1:]))
+        # Waiting for the limiter happens off the event loop
+        self.assertGreater(ticks, 10)
+
+    async def test_shares_the_default_rate_limiter(self):
+        async with AsyncGraphClient() as client:
+            self.assertIs(client.rate_limiter, get_default_rate_limiter())
+            self.assertIs(client.rate_limiter, GraphClient().rate_limiter)
+        async with AsyncGraphClient(rate_limiter=None) as client:
+            self.assertIsNone(client.rate_limiter)
+
+if __name__ == "__main__":
+    unittest.main()
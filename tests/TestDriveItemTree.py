@@ -0,0 +1,40 @@
+import unittest
+
+from integrator.integrator.DriveItemTree import DriveItemTree
+
+
+class TestDriveItemTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = DriveItemTree()
+        documents = self.tree.add_item(0, {"id": "1", "name": "Documents", "folder": {}})
+        self.tree.add_item(documents, {"id": "2", "name": "2024", "folder": {}})
+        self.tree.add_item(documents, {"id": "3", "name": "report.pdf", "file": {}, "size": 42})
+        self.tree.add_item(0, {"id": "4", "name": "Pictures", "folder": {}})
+
+    def test_find_and_get(self):
+        node = self.tree.find("/Documents/report.pdf")
+        self.assertEqual(node.id, "3")
+        self.assertEqual(node.size, 42)
+        self.assertFalse(node.is_folder)
+        self.assertEqual(node.parent.name, "Documents")
+        self.assertEqual(self.tree.get("2").path, "/Documents/2024")
+        self.assertIsNone(self.tree.find("Documents/missing"))
+
+    def test_iteration_order(self):
+        self.assertEqual([node.path for node in self.tree], ["/", "/Documents", "/Documents/2024", "/Documents/report.pdf", "/Pictures"])
+
+    def test_round_trip(self):
+        restored = DriveItemTree.from_dict(self.tree.to_dict())
+        self.assertEqual(restored.to_dict(), self.tree.to_dict())
+        self.assertEqual(restored.get("3").path, "/Documents/report.pdf")
+
+    def test_folder_structure(self):
+        structure = self.tree.to_folder_structure(lambda item_id: f"items/{item_id}")
+        self.assertEqual(structure, {
+            "Documents": {"FolderURL": "items/1", "Subfolders": {"2024": {"FolderURL": "items/2", "Subfolders": {}}}},
+            "Pictures": {"FolderURL": "items/4", "Subfolders": {}},
+        })
+
+if __name__ == "__main__":
+    unittest.main()
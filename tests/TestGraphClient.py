@@ -0,0 +1,163 @@
+import io
+import json
+import time
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import requests
+
+from integrator.integrator.GraphClient import (GraphClient,
+                                              get_default_rate_limiter)
+from integrator.integrator.GraphThrottle import RetryPolicy, TokenBucket
+
+
+def make_response(status_code: int, body: dict = None, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body or {}).encode("utf-8")
+    response.raw = io.BytesIO(response._content)
+    response.headers.update(headers or {})
+    return response
+
+
+class StubSession(requests.Session):
+    """Returns the queued responses in order and records the request arguments and file bodies."""
+
+    def __init__(self, responses: list):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = []
+        self.bodies = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if hasattr(kwargs.get("data"), "read"):
+            self.bodies.append(kwargs["data"].read())
+        return self.responses.pop(0)
+
+
+def batch_response(*items) -> requests.Response:
+    return make_response(200, {"responses": list(items)})
+
+
+class TestRequest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("integrator.integrator.GraphClient.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+        # Records pauses instead of blocking the retried request
+        self.limiter = mock.Mock(spec=TokenBucket)
+
+    def make_client(self, responses: list, **kwargs) -> GraphClient:
+        kwargs.setdefault("rate_limiter", self.limiter)
+        return GraphClient(session=StubSession(responses), **kwargs)
+
+    def test_throttled_request_waits_for_retry_after(self):
+        client = self.make_client([make_response(503, headers={"Retry-After": "1.5"}), make_response(200)])
+        self.assertEqual(client.get("https://graph.example/me").status_code, 200)
+        self.sleep.assert_called_once_with(1.5)
+        self.limiter.pause.assert_called_once_with(1.5)
+        self.assertEqual(self.limiter.acquire.call_count, 2)
+
+    def test_retry_after_as_http_date(self):
+        retry_at = formatdate(time.time() + 30, usegmt=True)
+        client = self.make_client([make_response(429, headers={"Retry-After": retry_at}), make_response(200)])
+        client.get("https://graph.example/me")
+        self.assertAlmostEqual(self.sleep.call_args[0][0], 30, delta=2)
+        self.assertAlmostEqual(self.limiter.pause.call_args[0][0], 30, delta=2)
+
+    def test_exhausted_throttle_still_pauses_limiter(self):
+        client = self.make_client([make_response(503, headers={"Retry-After": "5"})], retry_policy=RetryPolicy(max_retries=0))
+        self.assertEqual(client.get("https://graph.example/me").status_code, 503)
+        self.limiter.pause.assert_called_once_with(5.0)
+
+    def test_server_error_backs_off_for_idempotent_methods_only(self):
+        policy = RetryPolicy(max_retries=2, backoff_factor=0.5)
+        client = self.make_client([make_response(500), make_response(502), make_response(200)], retry_policy=policy)
+        self.assertEqual(client.get("https://graph.example/me").status_code, 200)
+        self.assertEqual(len(self.sleep.call_args_list), 2)
+        self.assertLessEqual(self.sleep.call_args_list[0][0][0], 0.5)
+        self.assertLessEqual(self.sleep.call_args_list[1][0][0], 1.0)
+        self.limiter.pause.assert_not_called()
+
+        client = self.make_client([make_response(500)], retry_policy=policy)
+        self.assertEqual(client.post("https://graph.example/me").status_code, 500)
+        self.assertEqual(len(client.session.calls), 1)
+
+    def test_seekable_body_is_rewound(self):
+        client = self.make_client([make_response(503, headers={"Retry-After": "0"}), make_response(201)])
+        self.assertEqual(client.put("https://graph.example/content", data=io.BytesIO(b"content")).status_code, 201)
+        self.assertEqual(client.session.bodies, [b"content", b"content"])
+
+    def test_clients_share_the_default_rate_limiter(self):
+        self.assertIs(GraphClient().rate_limiter, get_default_rate_limiter())
+        self.assertIs(GraphClient().rate_limiter, GraphClient().rate_limiter)
+        self.assertIsNone(GraphClient(rate_limiter=None).rate_limiter)
+
+
+class TestExecuteBatch(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("integrator.integrator.GraphClient.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def execute(self, responses: list, sub_requests: list):
+        session = StubSession(responses)
+        client = GraphClient(session=session, rate_limiter=mock.Mock(spec=TokenBucket))
+        results = client.execute_batch("token", sub_requests)
+        sent = [[request["id"] for request in kwargs["json"]["requests"]] for _, _, kwargs in session.calls]
+        return results, sent
+
+    def test_throttled_requests_are_requeued(self):
+        results, sent = self.execute(
+            [
+                batch_response(
+                    {"id": "1", "status": 200, "body": {"name": "a"}},
+                    {"id": "2", "status": 429, "headers": {"Retry-After": "1.5"}},
+                ),
+                batch_response({"id": "2", "status": 200, "body": {"name": "b"}}),
+            ],
+            [{"id": 1, "method": "GET", "url": "/me/drive/items/a"}, {"id": 2, "method": "GET", "url": "/me/drive/items/b"}],
+        )
+        self.assertEqual(sent, [["1", "2"], ["2"]])
+        self.assertEqual(results["2"]["body"], {"name": "b"})
+        self.sleep.assert_called_once_with(1.5)
+
+    def test_retry_after_as_http_date(self):
+        retry_at = formatdate(usegmt=True)
+        results, _ = self.execute(
+            [
+                batch_response({"id": "1", "status": 503, "headers": {"retry-after": retry_at}}),
+                batch_response({"id": "1", "status": 200}),
+            ],
+            [{"id": "1", "method": "GET", "url": "/me"}],
+        )
+        self.assertEqual(results["1"]["status"], 200)
+        self.assertLessEqual(self.sleep.call_args[0][0], 1)
+
+    def test_throttled_too_often_returns_last_response(self):
+        throttled = {"id": "1", "status": 429, "headers": {"Retry-After": "2"}}
+        session = StubSession([batch_response(throttled) for _ in range(3)])
+        results = GraphClient(session=session, rate_limiter=None).execute_batch("token", [{"id": "1", "method": "GET", "url": "/me"}], max_retries=2)
+        self.assertEqual(results["1"]["status"], 429)
+        self.assertEqual(len(session.calls), 3)
+
+    def test_failed_dependency_is_answered_locally(self):
+        sub_requests = [{"id": str(index), "method": "GET", "url": f"/me/drive/items/{index}"} for index in range(1, 22)]
+        sub_requests.append({"id": "22", "method": "GET", "url": "/me/drive/items/22", "dependsOn": ["1"]})
+        first = [{"id": str(index), "status": 404 if index == 1 else 200} for index in range(1, 21)]
+        results, sent = self.execute([batch_response(*first), batch_response({"id": "21", "status": 200})], sub_requests)
+        self.assertEqual(sent[1], ["21"])
+        self.assertEqual(results["22"]["status"], 424)
+        self.assertEqual(results["22"]["body"]["error"]["code"], "FailedDependency")
+
+    def test_unknown_dependency(self):
+        results, sent = self.execute([], [{"id": "1", "method": "GET", "url": "/me", "dependsOn": ["0"]}])
+        self.assertEqual(sent, [])
+        self.assertEqual(results["1"]["status"], 424)
+
+if __name__ == "__main__":
+    unittest.main()
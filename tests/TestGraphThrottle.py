@@ -0,0 +1,45 @@
+import time
+import unittest
+from email.utils import formatdate
+
+from integrator.integrator.GraphThrottle import (TokenBucket,
+                                                 parse_retry_after)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def test_seconds_and_http_date(self):
+        self.assertEqual(parse_retry_after("1.5"), 1.5)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 20, usegmt=True)), 20, delta=2)
+
+    def test_missing_or_malformed(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_up_to_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        started = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_pause_blocks_acquire(self):
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.pause(0.1)
+        started = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_bucket_refills_from_empty_after_pause(self):
+        bucket = TokenBucket(rate=100, capacity=40)
+        bucket.pause(0.3)
+        time.sleep(0.31)
+        bucket.acquire()
+        # Only the time since the pause ended counts, not the pause itself
+        self.assertLessEqual(bucket.tokens, 1)
+
+if __name__ == "__main__":
+    unittest.main()
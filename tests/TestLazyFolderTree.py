@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+
+import requests
+
+from integrator.integrator.LazyFolderTree import LazyFolderTree
+
+FOLDERS = {
+    "root": [("docs", "Documents"), ("pics", "Pictures")],
+    "docs": [("2024", "2024")],
+    "pics": [],
+    "2024": [],
+}
+
+
+class StubOneDrive:
+    """Lists the folders of FOLDERS, counting the listings per folder."""
+
+    def __init__(self, folders: dict = FOLDERS):
+        self.folders = folders
+        self.calls = []
+        self.lock = threading.Lock()
+        # Folder ID -> callable run before answering, e.g. to block or fail
+        self.hooks = {}
+
+    def get_children_url(self, folder_id: str) -> str:
+        return f"https://graph.example/items/{folder_id}/children"
+
+    def list_child_folders(self, access_token, children_url, page_size=None, select=None):
+        folder_id = children_url.split("/")[-2]
+        with self.lock:
+            self.calls.append(folder_id)
+            hook = self.hooks.pop(folder_id, None)
+        if hook is not None:
+            hook()
+        return [{"id": item_id, "name": name, "folder": {}} for item_id, name in self.folders[folder_id]]
+
+
+def go_offline():
+    raise requests.exceptions.ConnectionError("offline")
+
+
+class TestLazyFolderTree(unittest.TestCase):
+
+    def test_folders_are_listed_on_access_only(self):
+        onedrive = StubOneDrive()
+        tree = LazyFolderTree(onedrive, "token")
+        self.assertEqual(onedrive.calls, [])
+        self.assertEqual(tree.find("/Documents/2024").path, "/Documents/2024")
+        self.assertEqual(onedrive.calls, ["root", "docs"])
+        self.assertIsNone(tree.find("/Documents/missing"))
+        self.assertEqual(tree.fetch_count, 2)
+
+    def test_expired_listing_is_fetched_again_keeping_child_nodes(self):
+        onedrive = StubOneDrive()
+        tree = LazyFolderTree(onedrive, "token", ttl=0.05)
+        docs = tree.root["Documents"]
+        docs.children
+        time.sleep(0.06)
+        self.assertIs(tree.root["Documents"], docs)
+        self.assertEqual(onedrive.calls, ["root", "docs", "root"])
+
+    def test_failed_listing_is_raised_and_retried(self):
+        onedrive = StubOneDrive()
+        onedrive.hooks["root"] = go_offline
+        tree = LazyFolderTree(onedrive, "token")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            tree.root.children
+        self.assertEqual([child.name for child in tree.root.children], ["Documents", "Pictures"])
+
+    def test_prefetch_lists_the_next_level(self):
+        onedrive = StubOneDrive()
+        with LazyFolderTree(onedrive, "token", prefetch=True) as tree:
+            tree.root.children
+            deadline = time.monotonic() + 2
+            while len(onedrive.calls) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(sorted(onedrive.calls), ["docs", "pics", "root"])
+            tree.root["Documents"].children
+            # Prefetching goes one level ahead only: 2024 is listed when Documents is opened
+            self.assertEqual(len(onedrive.calls), 3)
+
+    def test_waiter_fetches_again_when_prefetch_fails(self):
+        onedrive = StubOneDrive()
+        prefetch_started = threading.Event()
+        release_prefetch = threading.Event()
+
+        def failing_prefetch():
+            prefetch_started.set()
+            release_prefetch.wait(2)
+            raise requests.exceptions.ConnectionError("prefetch failed")
+
+        onedrive.hooks["docs"] = failing_prefetch
+        with LazyFolderTree(onedrive, "token", prefetch=True) as tree:
+            docs = tree.root["Documents"]
+            self.assertTrue(prefetch_started.wait(2))
+            threading.Timer(0.05, release_prefetch.set).start()
+            # Waits for the in-flight prefetch, which fails, then lists the folder itself
+            self.assertEqual([child.name for child in docs.children], ["2024"])
+            self.assertEqual(onedrive.calls.count("docs"), 2)
+
+    def test_concurrent_loads_share_one_request(self):
+        onedrive = StubOneDrive()
+        onedrive.hooks["root"] = lambda: time.sleep(0.1)
+        tree = LazyFolderTree(onedrive, "token")
+        threads = [threading.Thread(target=lambda: tree.root.children) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(onedrive.calls, ["root"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from integrator.integrator.MultipartStream import MultipartStream
+
+
+class TestMultipartStream(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "report.pdf")
+        self.file_data = os.urandom(100_000)
+        with open(self.file_path, "wb") as file:
+            file.write(self.file_data)
+        self.stream = MultipartStream()
+        self.stream.add_part("Presentation", "<html><body/></html>", "application/xhtml+xml")
+        self.stream.add_part("image", memoryview(b"\x89PNG data"), "image/png")
+        self.stream.add_part("report", pathlib.Path(self.file_path), filename="report.pdf")
+        notes = io.BytesIO(b"skipped:notes")
+        notes.seek(8)
+        self.stream.add_part("notes", notes)
+
+    def tearDown(self):
+        self.stream.close()
+        self.directory.cleanup()
+
+    def parse(self, body: bytes):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.stream.content_type}\r\n\r\n".encode() + body
+        )
+        return [
+            (part.get_param("name", header="content-disposition"), part.get_content_type(), part.get_payload(decode=True))
+            for part in message.iter_parts()
+        ]
+
+    def test_parts_and_length(self):
+        body = self.stream.read()
+        self.assertEqual(len(body), len(self.stream))
+        self.assertEqual(self.parse(body), [
+            ("Presentation", "application/xhtml+xml", b"<html><body/></html>"),
+            ("image", "image/png", b"\x89PNG data"),
+            ("report", "application/pdf", self.file_data),
+            ("notes", "application/octet-stream", b"notes"),
+        ])
+
+    def test_small_reads_and_rewind(self):
+        first = b"".join(iter(lambda: self.stream.read(1000), b""))
+        self.stream.seek(0)
+        self.assertEqual(self.stream.read(), first)
+        with self.assertRaises(ValueError):
+            self.stream.add_part("late", b"data")
+
+if __name__ == "__main__":
+    unittest.main()
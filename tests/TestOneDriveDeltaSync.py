@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+from integrator.integrator.OneDriveDeltaSync import OneDriveDeltaSync
+from integrator.integrator.OneDriveLib import OneDriveLib
+from integrator.integrator.OneDriveMetadataStore import OneDriveMetadataStore
+
+
+class StubResponse:
+    def __init__(self, status_code: int, body: dict = None):
+        self.status_code = status_code
+        self.body = body or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+
+class StubClient:
+    """Returns the queued responses in order, whatever URL is requested."""
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+def folder(item_id: str, name: str, parent_id: str) -> dict:
+    return {"id": item_id, "name": name, "folder": {}, "parentReference": {"id": parent_id}}
+
+
+def file(item_id: str, name: str, parent_id: str) -> dict:
+    return {"id": item_id, "name": name, "file": {}, "parentReference": {"id": parent_id}, "cTag": "c1"}
+
+
+INITIAL_ITEMS = [
+    {"id": "root", "name": "root", "root": {}, "folder": {}},
+    folder("docs", "Documents", "root"),
+    folder("2024", "2024", "docs"),
+    file("report", "report.pdf", "2024"),
+    file("notes", "notes.txt", "docs"),
+    folder("pics", "Pictures", "root"),
+]
+
+
+class TestOneDriveDeltaSync(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.directory.name, "delta.json")
+        self.store = OneDriveMetadataStore(os.path.join(self.directory.name, "items.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def make_sync(self, responses: list) -> OneDriveDeltaSync:
+        onedrive = OneDriveLib(client=StubClient(responses), metadata_store=self.store)
+        return OneDriveDeltaSync(onedrive, self.state_file)
+
+    def initial_sync(self) -> OneDriveDeltaSync:
+        sync = self.make_sync([StubResponse(200, {"value": INITIAL_ITEMS, "@odata.deltaLink": "delta-1"})])
+        self.assertEqual(len(sync.sync("token")), len(INITIAL_ITEMS))
+        return sync
+
+    def test_deleting_folder_removes_subtree(self):
+        sync = self.initial_sync()
+        sync.onedrive.client.responses.append(
+            StubResponse(200, {"value": [{"id": "docs", "deleted": {}}], "@odata.deltaLink": "delta-2"})
+        )
+        changes = sync.sync("token")
+        self.assertEqual(changes, [{"type": "deleted", "id": "docs", "name": "Documents", "removed": 4}])
+        self.assertEqual(set(sync.items), {"root", "pics"})
+        self.assertEqual(sync.children, {None: {"root"}, "root": {"pics"}})
+        self.assertIsNone(self.store.get_item("report"))
+        self.assertEqual(self.store.get_item("pics")["path"], "/Pictures")
+
+    def test_moved_folder_takes_its_children_along(self):
+        sync = self.initial_sync()
+        sync.onedrive.client.responses += [
+            StubResponse(200, {"value": [folder("2024", "2024", "pics")], "@odata.deltaLink": "delta-2"}),
+            StubResponse(200, {"value": [{"id": "pics", "deleted": {}}], "@odata.deltaLink": "delta-3"}),
+        ]
+        self.assertEqual(sync.sync("token")[0]["type"], "moved")
+        self.assertEqual(sync.get_path("report"), "/Pictures/2024/report.pdf")
+        self.assertEqual(self.store.get_item("report")["path"], "/Pictures/2024/report.pdf")
+        sync.sync("token")
+        self.assertEqual(set(sync.items), {"root", "docs", "notes"})
+
+    def test_state_survives_reload(self):
+        self.initial_sync()
+        sync = self.make_sync([])
+        self.assertEqual(sync.delta_link, "delta-1")
+        self.assertEqual(sync.children["docs"], {"2024", "notes"})
+        self.assertEqual(sync.get_path("report"), "/Documents/2024/report.pdf")
+
+    def test_failed_sync_leaves_cache_and_store_unchanged(self):
+        sync = self.initial_sync()
+        sync.onedrive.client.responses += [
+            StubResponse(200, {"value": [{"id": "docs", "deleted": {}}], "@odata.nextLink": "page-2"}),
+            StubResponse(500),
+        ]
+        self.assertEqual(sync.sync("token"), [])
+        self.assertEqual(sync.delta_link, "delta-1")
+        self.assertIn("report", sync.items)
+        self.assertEqual(self.store.get_item("report")["path"], "/Documents/2024/report.pdf")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from integrator.integrator.OneDriveDownloader import OneDriveDownloader
+from integrator.integrator.OneDriveLib import OneDriveLib
+
+BASE_URL = "https://graph.example/drive/"
+
+
+def make_response(status_code: int, body: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class StubClient:
+    """Answers GET requests from a URL -> (status, body) or callable map, recording the URLs."""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False):
+        with self.lock:
+            self.calls.append((url, "Authorization" in (headers or {})))
+        route = self.routes[url]
+        if callable(route):
+            route = route()
+        return make_response(*route)
+
+
+def drive_file(item_id: str, name: str, size: int, download_url: str = None) -> dict:
+    item = {"id": item_id, "name": name, "size": size, "file": {}}
+    if download_url:
+        item["@microsoft.graph.downloadUrl"] = download_url
+    return item
+
+
+class TestDownloadItems(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def download(self, routes: dict, items: list) -> tuple:
+        client = StubClient(routes)
+        downloader = OneDriveDownloader(OneDriveLib(base_url=BASE_URL, client=client), max_workers=2, verify_hash=False)
+        return downloader.download_items("token", items, self.directory.name), client.calls
+
+    def read(self, name: str) -> bytes:
+        with open(os.path.join(self.directory.name, name), "rb") as file:
+            return file.read()
+
+    def test_downloads_through_the_listed_url(self):
+        report, calls = self.download(
+            {"https://dl.example/a": (200, b"alpha")},
+            [drive_file("a", "a.txt", 5, "https://dl.example/a")],
+        )
+        self.assertEqual(report["downloaded"], ["a.txt"])
+        self.assertEqual(report["bytes"], 5)
+        self.assertEqual(self.read("a.txt"), b"alpha")
+        # Pre-authenticated URLs are requested without the access token
+        self.assertEqual(calls, [("https://dl.example/a", False)])
+
+    def test_expired_download_url_is_refreshed(self):
+        for status_code in (401, 403):
+            with self.subTest(status_code=status_code):
+                report, calls = self.download(
+                    {
+                        "https://dl.example/a": (status_code, b""),
+                        BASE_URL + "items/a/content": (200, b"alpha"),
+                    },
+                    [drive_file("a", "a.txt", 5, "https://dl.example/a")],
+                )
+                self.assertEqual(report["downloaded"], ["a.txt"])
+                self.assertEqual(self.read("a.txt"), b"alpha")
+                self.assertEqual(calls, [("https://dl.example/a", False), (BASE_URL + "items/a/content", True)])
+                os.remove(os.path.join(self.directory.name, "a.txt"))
+
+    def test_other_http_errors_are_not_retried(self):
+        report, calls = self.download(
+            {"https://dl.example/a": (404, b"")},
+            [drive_file("a", "a.txt", 5, "https://dl.example/a")],
+        )
+        self.assertEqual(report["failed"], ["a.txt"])
+        self.assertEqual(len(calls), 1)
+
+    def test_unexpected_error_fails_only_that_item(self):
+        def broken():
+            raise ValueError("malformed response")
+
+        report, _ = self.download(
+            {"https://dl.example/a": broken, "https://dl.example/b": (200, b"beta")},
+            [drive_file("a", "a.txt", 5, "https://dl.example/a"), drive_file("b", "b.txt", 4, "https://dl.example/b")],
+        )
+        self.assertEqual(report["failed"], ["a.txt"])
+        self.assertEqual(report["downloaded"], ["b.txt"])
+        self.assertEqual(self.read("b.txt"), b"beta")
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "a.txt.part")))
+
+    def test_up_to_date_files_are_skipped(self):
+        with open(os.path.join(self.directory.name, "a.txt"), "wb") as file:
+            file.write(b"alpha")
+        report, calls = self.download({}, [drive_file("a", "a.txt", 5, "https://dl.example/a")])
+        self.assertEqual(report["skipped"], ["a.txt"])
+        self.assertEqual(calls, [])
+
+if __name__ == "__main__":
+    unittest.main()
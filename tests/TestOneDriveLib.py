@@ -0,0 +1,378 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from integrator.integrator.OneDriveLib import OneDriveLib
+from integrator.integrator.OneDriveMetadataStore import OneDriveMetadataStore
+
+
+def make_response(status_code: int, body: bytes = b"", headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class StubClient:
+    """Returns the queued responses in order and records the request arguments."""
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.responses.pop(0)
+
+    def iter_collection(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        yield from self.responses.pop(0)
+
+
+class TestCopyStatus(unittest.TestCase):
+
+    def test_in_progress(self):
+        client = StubClient([make_response(202, b'{"status": "inProgress", "percentageComplete": 42.5}')])
+        status = OneDriveLib(client=client).get_copy_status("https://monitor.example/job")
+        self.assertEqual(status, {"status": "inProgress", "percentageComplete": 42.5, "resourceId": None})
+
+    def test_completed_redirect_is_not_followed(self):
+        location = "https://graph.microsoft.com/v1.0/drives/b!drive/items/01NEWITEM"
+        client = StubClient([make_response(303, headers={"Location": location})])
+        status = OneDriveLib(client=client).get_copy_status("https://monitor.example/job")
+        self.assertEqual(status, {"status": "completed", "percentageComplete": 100.0, "resourceId": "01NEWITEM"})
+        self.assertFalse(client.calls[0][1]["allow_redirects"])
+
+
+class StubCopyClient:
+    """Starts every batched copy with a monitor per sub-request and answers each monitor from a table."""
+
+    def __init__(self, monitor_responses: dict, failed: set = ()):
+        self.monitor_responses = monitor_responses
+        self.failed = failed
+        self.sub_requests = []
+
+    def execute_batch(self, access_token, sub_requests, graph_root=None):
+        self.sub_requests = sub_requests
+        return {
+            request["id"]: {"id": request["id"], "status": 409, "body": {"error": {"code": "nameAlreadyExists"}}}
+            if request["id"] in self.failed
+            else {"id": request["id"], "status": 202, "headers": {"Location": f"https://monitor.example/{request['id']}"}}
+            for request in sub_requests
+        }
+
+    def get(self, url, **kwargs):
+        return self.monitor_responses[url]
+
+
+class TestCopyItems(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("integrator.integrator.OneDriveLib.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_item_to_several_destinations(self):
+        completed = make_response(200, json.dumps({"status": "completed", "resourceId": "COPY0"}).encode())
+        client = StubCopyClient(
+            {
+                "https://monitor.example/0": completed,
+                "https://monitor.example/2": make_response(200, b'{"status": "failed"}'),
+            },
+            failed={"1"},
+        )
+        copies = [{"id": "ITEM", "parent_id": f"DEST{index}"} for index in range(3)]
+        progress = []
+        results = OneDriveLib(client=client).copy_items(
+            "token", copies, progress_callback=lambda index, status: progress.append((index, status["status"]))
+        )
+        self.assertEqual([request["id"] for request in client.sub_requests], ["0", "1", "2"])
+        self.assertEqual([result["status"] for result in results], ["completed", "failed", "failed"])
+        self.assertEqual(results[0]["resourceId"], "COPY0")
+        self.assertEqual(results[1]["error"], {"error": {"code": "nameAlreadyExists"}})
+        self.assertEqual(sorted(progress), [(0, "completed"), (2, "failed")])
+
+    def test_failed_batch_fails_every_copy(self):
+        client = StubCopyClient({})
+        client.execute_batch = mock.Mock(side_effect=requests.exceptions.ConnectionError("offline"))
+        results = OneDriveLib(client=client).copy_items("token", [{"id": "ITEM", "parent_id": "A"}, {"id": "ITEM", "parent_id": "B"}])
+        self.assertEqual(results, [{"status": "failed", "error": "offline"}] * 2)
+
+
+def failing_after(items: list):
+    """Yield items, then fail like a later @odata.nextLink page."""
+    yield from items
+    raise requests.exceptions.HTTPError("503 error", response=make_response(503))
+
+
+def child(item_id: str, name: str) -> dict:
+    return {"id": item_id, "name": name, "file": {}, "parentReference": {"id": "folder", "path": "/drive/root:/Docs"}}
+
+
+class TestIncompleteListing(unittest.TestCase):
+
+    def test_failed_page_is_raised(self):
+        onedrive = OneDriveLib(client=StubClient([failing_after([child("a", "a.txt")])]))
+        items = onedrive.iter_folder_content("token", "folder")
+        self.assertEqual(next(items)["id"], "a")
+        with self.assertRaises(requests.exceptions.HTTPError):
+            next(items)
+
+    def test_list_wrappers_never_return_a_partial_listing(self):
+        onedrive = OneDriveLib(client=StubClient([failing_after([child("a", "a.txt")]) for _ in range(3)]))
+        self.assertEqual(onedrive.list_root_objects("token"), [])
+        self.assertIsNone(onedrive.get_folder_content("token", "folder"))
+        self.assertIsNone(onedrive.list_children_cached("token", "folder"))
+
+    def test_partial_listing_keeps_stored_children(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = OneDriveMetadataStore(os.path.join(directory, "items.db"))
+            children = [child("a", "a.txt"), child("b", "b.txt")]
+            onedrive = OneDriveLib(client=StubClient([children, failing_after(children[:1])]), metadata_store=store)
+            self.assertEqual(len(onedrive.list_children_cached("token", "folder")), 2)
+            self.assertIsNone(onedrive.list_children_cached("token", "folder", max_age=-1))
+            self.assertEqual([row["id"] for row in store.list_children("folder")], ["a", "b"])
+            store.close()
+
+
+def folder(item_id: str) -> dict:
+    return {"id": item_id, "name": item_id, "folder": {"childCount": 0}}
+
+
+TREE = {
+    "top": [folder("a"), {"id": "y", "name": "y.txt", "file": {}}],
+    "a": [folder("b")],
+    "b": [{"id": "x", "name": "x.txt", "file": {}}],
+}
+
+
+class StubTreeClient:
+    """
+    Lists the children of a folder tree (folder ID -> items) and deletes items,
+    answering each DELETE with the next queued status for that item (default 204).
+    """
+
+    def __init__(self, tree: dict = TREE, statuses: dict = None):
+        self.tree = tree
+        self.statuses = {item_id: list(queue) for item_id, queue in (statuses or {}).items()}
+        self.listed = []
+        self.deletes = []
+
+    def iter_collection(self, url, headers=None, params=None):
+        folder_id = url.split("/")[-2]
+        self.listed.append(folder_id)
+        yield from self.tree.get(folder_id, [])
+
+    def _delete_status(self, item_id: str) -> int:
+        queue = self.statuses.get(item_id)
+        return queue.pop(0) if queue else 204
+
+    def execute_batch(self, access_token, sub_requests, graph_root=None):
+        item_ids = [request["url"].rsplit("/", 1)[-1] for request in sub_requests]
+        self.deletes.append(sorted(item_ids))
+        return {
+            request["id"]: {"id": request["id"], "status": self._delete_status(item_id)}
+            for request, item_id in zip(sub_requests, item_ids)
+        }
+
+    def delete(self, url, headers=None):
+        item_id = url.rsplit("/", 1)[-1]
+        self.deletes.append([item_id])
+        return make_response(self._delete_status(item_id))
+
+
+class TestDeleteTree(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("integrator.integrator.OneDriveLib.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_files_first_then_folders_deepest_first(self):
+        client = StubTreeClient()
+        progress = []
+        report = OneDriveLib(client=client).delete_tree(
+            "token", "top", max_workers=1, progress_callback=lambda deleted, total: progress.append(deleted)
+        )
+        self.assertEqual(client.deletes, [["x", "y"], ["b"], ["a"], ["top"]])
+        self.assertEqual(report, {"deleted": 5, "total": 5, "failed": []})
+        self.assertEqual(progress, [2, 3, 4, 5])
+
+    def test_failed_dependency_is_retried_in_the_next_round(self):
+        # 424: the sub-request failed because another one in the batch did
+        client = StubTreeClient(statuses={"x": [424], "b": [424, 409]})
+        report = OneDriveLib(client=client).delete_tree("token", "top", max_workers=1)
+        self.assertEqual(client.deletes, [["x", "y"], ["x"], ["b"], ["b"], ["b"], ["a"], ["top"]])
+        self.assertEqual(report, {"deleted": 5, "total": 5, "failed": []})
+
+    def test_retry_rounds_are_bounded(self):
+        for use_batch in (True, False):
+            with self.subTest(use_batch=use_batch):
+                client = StubTreeClient(statuses={"y": [503] * 10})
+                report = OneDriveLib(client=client).delete_tree(
+                    "token", "top", max_workers=1, use_batch=use_batch, max_retries=2
+                )
+                # The first attempt plus max_retries rounds
+                self.assertEqual(sum("y" in item_ids for item_ids in client.deletes), 3)
+                self.assertEqual(report["deleted"], 4)
+                self.assertEqual([item["id"] for item in report["failed"]], ["y"])
+
+    def test_server_side_deletes_the_folder_only(self):
+        client = StubTreeClient()
+        report = OneDriveLib(client=client).delete_tree("token", "top", server_side=True)
+        self.assertEqual(client.listed, [])
+        self.assertEqual(client.deletes, [["top"]])
+        self.assertEqual(report, {"deleted": 1, "total": 1, "failed": []})
+
+    def test_failed_listing_deletes_nothing(self):
+        client = StubTreeClient()
+        client.iter_collection = lambda url, **kwargs: failing_after([])
+        report = OneDriveLib(client=client).delete_tree("token", "top")
+        self.assertEqual(client.deletes, [])
+        self.assertEqual(report["deleted"], 0)
+        self.assertEqual(report["failed"], [{"id": "top", "name": "top"}])
+
+
+FOLDERS = {
+    "root": [folder("a"), folder("d"), {"id": "readme", "name": "readme.txt", "file": {}}],
+    "a": [folder("b")],
+    "b": [folder("c")],
+    "c": [],
+    "d": [],
+}
+
+
+def subfolders(structure: dict) -> dict:
+    """Reduce a get_folders structure to folder name -> subfolders."""
+    return {name: subfolders(node["Subfolders"]) for name, node in structure.items()}
+
+
+class TestCrawlFolders(unittest.TestCase):
+
+    def test_matches_get_folders(self):
+        onedrive = OneDriveLib(client=StubTreeClient(FOLDERS))
+        structure = onedrive.crawl_folders("token", max_workers=3)
+        self.assertEqual(structure, onedrive.get_folders("token"))
+        self.assertEqual(subfolders(structure), {"a": {"b": {"c": {}}}, "d": {}})
+        self.assertEqual(structure["a"]["FolderURL"], onedrive.get_folder_url("a"))
+
+    def test_max_depth_limits_the_listed_levels(self):
+        client = StubTreeClient(FOLDERS)
+        structure = OneDriveLib(client=client).crawl_folders("token", max_depth=2)
+        self.assertEqual(subfolders(structure), {"a": {"b": {}}, "d": {}})
+        self.assertEqual(sorted(client.listed), ["a", "d", "root"])
+        self.assertEqual(OneDriveLib(client=client).crawl_folders("token", max_depth=0), {})
+
+    def test_cancel_returns_the_partial_structure(self):
+        client = StubTreeClient(FOLDERS)
+        cancel_event = threading.Event()
+        iter_collection = client.iter_collection
+
+        def cancel_below_a(url, **kwargs):
+            if url.split("/")[-2] == "a":
+                cancel_event.set()
+            return iter_collection(url, **kwargs)
+
+        client.iter_collection = cancel_below_a
+        structure = OneDriveLib(client=client).crawl_folders("token", max_workers=1, cancel_event=cancel_event)
+        # b is found in the listing of a, but never listed itself
+        self.assertEqual(subfolders(structure)["a"], {"b": {}})
+        self.assertNotIn("c", client.listed)
+
+
+CONTENT = bytes(range(10))
+DOWNLOAD_URL = "https://dl.example/file"
+
+
+class StubRangeClient:
+    """Serves the metadata of one file and its bytes through Range requests."""
+
+    def __init__(self, failures: dict = None):
+        # Range start -> queued failures (a status code or a truncated length)
+        self.failures = {start: list(queue) for start, queue in (failures or {}).items()}
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False):
+        if url != DOWNLOAD_URL:
+            item = {"id": "file", "size": len(CONTENT), "eTag": "v1", "@microsoft.graph.downloadUrl": DOWNLOAD_URL}
+            return make_response(200, json.dumps(item).encode())
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        with self.lock:
+            self.ranges.append((start, end))
+            queue = self.failures.get(start)
+            failure = queue.pop(0) if queue else None
+        body = CONTENT[start:end + 1]
+        if failure is not None and failure >= 400:
+            return make_response(failure)
+        if failure is not None:
+            body = body[:failure]
+        response = make_response(206)
+        response.raw = io.BytesIO(body)
+        return response
+
+
+class TestDownloadFileRanged(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("integrator.integrator.OneDriveLib.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.local_file = os.path.join(self.directory.name, "file.bin")
+
+    def download(self, client: StubRangeClient, **options) -> str:
+        return OneDriveLib(client=client).download_file_ranged(
+            "token", "folder", self.directory.name, "file.bin", chunk_size=4, **options
+        )
+
+    def assert_downloaded(self):
+        with open(self.local_file, "rb") as file:
+            self.assertEqual(file.read(), CONTENT)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["file.bin"])
+
+    def test_segments_are_assembled_in_place(self):
+        client = StubRangeClient()
+        self.assertEqual(self.download(client, max_workers=3), self.local_file)
+        self.assertEqual(sorted(client.ranges), [(0, 3), (4, 7), (8, 9)])
+        self.assert_downloaded()
+
+    def test_failed_segment_is_retried(self):
+        client = StubRangeClient({4: [503, 2]})
+        self.assertEqual(self.download(client), self.local_file)
+        self.assertEqual(sorted(client.ranges), [(0, 3), (4, 7), (4, 7), (4, 7), (8, 9)])
+        self.assert_downloaded()
+
+    def test_failed_download_resumes_with_missing_segments(self):
+        client = StubRangeClient({8: [503, 503]})
+        self.assertIsNone(self.download(client, max_workers=1, max_retries=1))
+        self.assertTrue(os.path.isfile(self.local_file + ".part.json"))
+
+        client = StubRangeClient()
+        self.assertEqual(self.download(client), self.local_file)
+        self.assertEqual(client.ranges, [(8, 9)])
+        self.assert_downloaded()
+
+
+class TestWithoutMetadataStore(unittest.TestCase):
+
+    def test_list_children_cached_lists_live(self):
+        children = [{"id": "a", "name": "a.txt", "file": {}}]
+        client = StubClient([children])
+        self.assertEqual(OneDriveLib(client=client).list_children_cached("token", "folder"), children)
+        self.assertTrue(client.calls[0][0].endswith("items/folder/children"))
+
+    def test_search_items_needs_store(self):
+        with self.assertRaises(ValueError):
+            OneDriveLib(client=StubClient([])).search_items("report")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from integrator.integrator.OneDriveMetadataStore import OneDriveMetadataStore
+
+
+def item(item_id: str, name: str, parent_id: str, parent_path: str, is_folder: bool = False) -> dict:
+    data = {
+        "id": item_id,
+        "name": name,
+        "parentReference": {"id": parent_id, "path": f"/drive/root:{parent_path}"},
+    }
+    data["folder" if is_folder else "file"] = {}
+    return data
+
+
+DOCS = item("docs", "Documents", "root", "", is_folder=True)
+PICS = item("pics", "Pictures", "root", "", is_folder=True)
+YEAR = item("2024", "2024", "docs", "/Documents", is_folder=True)
+REPORT = item("report", "report.pdf", "2024", "/Documents/2024")
+NOTES = item("notes", "notes.txt", "docs", "/Documents")
+
+
+class TestOneDriveMetadataStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = OneDriveMetadataStore(os.path.join(self.directory.name, "items.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def record(self, folder_id: str, items: list) -> list:
+        return list(self.store.record_listing(folder_id, items))
+
+    def test_listing_is_stored(self):
+        self.assertEqual(self.record("root", [DOCS, PICS]), [DOCS, PICS])
+        self.assertEqual(self.store.resolve_folder_id("root"), "root")
+        children = self.store.list_children("root")
+        self.assertEqual([child["path"] for child in children], ["/Documents", "/Pictures"])
+        self.assertTrue(children[0]["is_folder"])
+        self.assertIsNone(self.store.list_children("docs"))
+        self.assertIsNone(self.store.list_children("root", max_age=-1))
+
+    def test_folder_missing_from_listing_removes_its_subtree(self):
+        self.record("root", [DOCS, PICS])
+        self.record("docs", [YEAR, NOTES])
+        self.record("2024", [REPORT])
+        self.record("root", [PICS])
+        self.assertEqual([child["id"] for child in self.store.list_children("root")], ["pics"])
+        for item_id in ("docs", "2024", "report", "notes"):
+            self.assertIsNone(self.store.get_item(item_id))
+        self.assertIsNone(self.store.list_children("docs"))
+        self.assertIsNone(self.store.list_children("2024"))
+        self.assertEqual(self.store.search("report"), [])
+
+    def test_moved_folder_rewrites_paths_below_it(self):
+        self.store.upsert_items([DOCS, PICS, YEAR, REPORT])
+        self.store.upsert_items([item("2024", "2024", "pics", "/Pictures", is_folder=True)])
+        self.assertEqual(self.store.get_item("2024")["parent_id"], "pics")
+        self.assertEqual(self.store.get_item("report")["path"], "/Pictures/2024/report.pdf")
+        self.assertEqual(self.store.get_item_by_path("/Pictures/2024/report.pdf")["id"], "report")
+        self.assertIsNone(self.store.get_item_by_path("/Documents/2024/report.pdf"))
+
+    def test_delete_folder_removes_subtree(self):
+        self.store.upsert_items([DOCS, PICS, YEAR, REPORT, NOTES])
+        self.store.delete_item("docs")
+        self.assertEqual(self.store.get_item("pics")["path"], "/Pictures")
+        self.assertIsNone(self.store.get_item("report"))
+        self.assertIsNone(self.store.get_item("notes"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import base64
+import re
+import unittest
+
+from integrator.integrator.GraphClient import GraphClient
+from integrator.integrator.OneNoteLib import OneNoteLib
+
+
+class StubBatchClient(GraphClient):
+    """
+    Answers /$batch calls like Graph: sub-requests run in order, and a request
+    whose dependency failed gets 424 without being run.
+    """
+
+    def __init__(self, failing_titles=(), missing_sections=()):
+        super().__init__()
+        self.failing_titles = set(failing_titles)
+        self.missing_sections = set(missing_sections)
+        self.created = []
+        self.rounds = 0
+
+    def post(self, url, json=None, **kwargs):
+        self.rounds += 1
+        statuses = {}
+        responses = []
+        for sub_request in json["requests"]:
+            section_id = re.search(r"sections/([^/]+)/pages", sub_request["url"]).group(1)
+            title = re.search(r"<title>(.*?)</title>", base64.b64decode(sub_request["body"]).decode()).group(1)
+            if any(statuses[dep] >= 400 for dep in sub_request.get("dependsOn", [])):
+                status, body = 424, {"error": {"code": "FailedDependency"}}
+            elif section_id in self.missing_sections:
+                status, body = 404, {"error": {"code": "NotFound"}}
+            elif title in self.failing_titles:
+                self.failing_titles.discard(title)
+                status, body = 500, {"error": {"code": "InternalServerError"}}
+            else:
+                self.created.append((section_id, title))
+                status, body = 201, {"id": f"page-{title}", "title": title}
+            statuses[sub_request["id"]] = status
+            responses.append({"id": sub_request["id"], "status": status, "body": body})
+        return StubResponse({"responses": responses})
+
+
+class StubResponse:
+    def __init__(self, body: dict):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class TestOneNoteCreatePages(unittest.TestCase):
+
+    def create(self, client, pages):
+        onenote = OneNoteLib(client=client)
+        return onenote.create_pages("token", pages)
+
+    def test_failure_does_not_drop_rest_of_section(self):
+        client = StubBatchClient(failing_titles={"a1"})
+        pages = [{"section_id": section, "title": f"{section}{index}"} for index in range(4) for section in "ab"]
+        results = self.create(client, pages)
+        self.assertEqual([page and page["title"] for page in results], ["a0", "b0", None, "b1", "a2", "b2", "a3", "b3"])
+        self.assertEqual([title for section, title in client.created if section == "a"], ["a0", "a2", "a3"])
+        self.assertEqual(client.rounds, 2)
+
+    def test_missing_section_stops_its_pages(self):
+        client = StubBatchClient(missing_sections={"b"})
+        pages = [{"section_id": section, "title": f"{section}{index}"} for index in range(3) for section in "ab"]
+        results = self.create(client, pages)
+        self.assertEqual([page and page["title"] for page in results], ["a0", None, "a1", None, "a2", None])
+        self.assertEqual(client.rounds, 1)
+
+if __name__ == "__main__":
+    unittest.main()
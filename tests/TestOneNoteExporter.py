@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from integrator.integrator.OneNoteExporter import (MANIFEST_NAME,
+                                                   OneNoteExporter)
+from integrator.integrator.OneNoteLib import OneNoteLib
+from integrator.integrator.OneNoteStructure import OneNotePage
+
+RESOURCE_URL = "https://graph.microsoft.com/v1.0/me/onenote/resources/img1/$value"
+
+
+def make_response(status_code: int, body: bytes, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = content_type
+    response._content = body
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class StubClient:
+    """Serves page HTML and resources, recording the URLs and running a hook per URL."""
+
+    def __init__(self, html: dict):
+        # Page ID -> HTML of the page
+        self.html = html
+        self.fetched = []
+        self.hooks = {}
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False):
+        with self.lock:
+            self.fetched.append(url)
+            hook = self.hooks.pop(url, None)
+        if hook is not None:
+            hook()
+        if url == RESOURCE_URL:
+            return make_response(200, b"\x89PNG", "image/png")
+        page_id = url.split("/")[-2]
+        return make_response(200, self.html[page_id].encode("utf-8"), "text/html")
+
+
+class TestExportResume(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.client = StubClient({
+            "a": "<html>A</html>",
+            "b": f'<html><img src="{RESOURCE_URL}" /></html>',
+            "c": "<html>C</html>",
+        })
+        self.onenote = OneNoteLib(client=self.client)
+        self.pages = [
+            ("Section", OneNotePage("a", "Alpha", last_modified="2024-05-01T10:00:00Z")),
+            ("Section", OneNotePage("b", "Beta", last_modified="2024-05-01T10:00:00Z")),
+            ("Section", OneNotePage("c", "Gamma", last_modified="2024-05-01T10:00:00Z")),
+        ]
+
+    def export(self, cancel_event: threading.Event = None) -> dict:
+        exporter = OneNoteExporter(self.onenote, max_workers=1)
+        return exporter.export_pages("token", iter(self.pages), self.directory.name, cancel_event)
+
+    def content_url(self, page_id: str) -> str:
+        return f"{self.onenote.get_page_url(page_id)}/content"
+
+    def manifest(self) -> dict:
+        with open(os.path.join(self.directory.name, MANIFEST_NAME), encoding="utf-8") as file:
+            return json.load(file)
+
+    def exported_files(self) -> list:
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.directory.name).replace(os.sep, "/")
+            for root, _, names in os.walk(self.directory.name)
+            for name in names
+            if name != MANIFEST_NAME
+        )
+
+    def test_interrupted_export_resumes_with_unfinished_pages(self):
+        cancel_event = threading.Event()
+        # Cancelled while page b is being exported, before its image is downloaded
+        self.client.hooks[self.content_url("b")] = cancel_event.set
+        report = self.export(cancel_event)
+        self.assertEqual(report["exported"], ["a"])
+        self.assertIn("b", report["cancelled"])
+        self.assertEqual(list(self.manifest()), ["a"])
+        self.assertEqual(len(self.exported_files()), 1)
+
+        self.client.fetched = []
+        report = self.export()
+        self.assertEqual(report["skipped"], ["a"])
+        self.assertEqual(sorted(report["exported"]), ["b", "c"])
+        self.assertNotIn(self.content_url("a"), self.client.fetched)
+        self.assertEqual(sorted(self.manifest()), ["a", "b", "c"])
+        # The image of b is stored next to its page, and the HTML points at it
+        html_file = self.manifest()["b"]["path"]
+        self.assertIn(html_file.removesuffix(".html") + "_files/img1.png", self.exported_files())
+        with open(os.path.join(self.directory.name, *html_file.split("/")), encoding="utf-8") as file:
+            self.assertNotIn(RESOURCE_URL, file.read())
+
+    def test_changed_and_renamed_pages_are_exported_again(self):
+        self.export()
+        old_path = self.manifest()["a"]["path"]
+        self.pages[0] = ("Section", OneNotePage("a", "Alpha renamed", last_modified="2024-06-01T10:00:00Z"))
+        self.client.fetched = []
+        report = self.export()
+        self.assertEqual(report["exported"], ["a"])
+        self.assertEqual(sorted(report["skipped"]), ["b", "c"])
+        self.assertNotIn(old_path, self.exported_files())
+        self.assertIn(self.manifest()["a"]["path"], self.exported_files())
+
+    def test_missing_file_is_exported_again(self):
+        self.export()
+        os.remove(os.path.join(self.directory.name, *self.manifest()["c"]["path"].split("/")))
+        report = self.export()
+        self.assertEqual(report["exported"], ["c"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import io
+import json
+import unittest
+
+import requests
+
+from integrator.integrator.GraphClient import GraphClient
+from integrator.integrator.GraphThrottle import RetryPolicy
+from integrator.integrator.OneNoteLib import (ONENOTE_NOTEBOOK_BASE_URL,
+                                              ONENOTE_SECTION_BASE_URL,
+                                              ONENOTE_SECTION_GROUP_BASE_URL,
+                                              STRUCTURE_EXPAND,
+                                              STRUCTURE_EXPAND_NO_PAGES,
+                                              OneNoteLib)
+
+
+def make_response(status_code: int, body: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body or {}).encode("utf-8")
+    response.raw = io.BytesIO(response._content)
+    return response
+
+
+class RoutingSession(requests.Session):
+    """Answers each URL with its queued responses and records the requests."""
+
+    def __init__(self, routes: dict):
+        super().__init__()
+        self.routes = {url: list(responses) for url, responses in routes.items()}
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs.get("params")))
+        return self.routes[url].pop(0)
+
+
+def make_onenote(routes: dict) -> OneNoteLib:
+    client = GraphClient(session=RoutingSession(routes), retry_policy=RetryPolicy(max_retries=0), rate_limiter=None)
+    return OneNoteLib(client=client)
+
+
+class TestListings(unittest.TestCase):
+
+    def test_get_notebooks_follows_next_link(self):
+        next_link = f"{ONENOTE_NOTEBOOK_BASE_URL}?$skip=1"
+        onenote = make_onenote({
+            ONENOTE_NOTEBOOK_BASE_URL: [make_response(200, {
+                "value": [{"id": "nb1", "displayName": "Work"}], "@odata.nextLink": next_link,
+            })],
+            next_link: [make_response(200, {"value": [{"id": "nb2", "displayName": "Home"}]})],
+        })
+        self.assertEqual(onenote.get_notebooks("token"), [{"name": "Work", "id": "nb1"}, {"name": "Home", "id": "nb2"}])
+
+    def test_list_sections_failing_on_a_later_page(self):
+        url = f"{ONENOTE_NOTEBOOK_BASE_URL}/nb1/sections"
+        onenote = make_onenote({
+            url: [make_response(200, {"value": [{"id": "s1", "displayName": "A"}], "@odata.nextLink": url + "?page=2"})],
+            url + "?page=2": [make_response(500)],
+        })
+        self.assertEqual(onenote.list_sections("token", "nb1"), [])
+
+    def test_pages_failing_on_a_later_page(self):
+        url = f"{ONENOTE_SECTION_BASE_URL}/s1/pages"
+        routes = {
+            url: [make_response(200, {"value": [{"id": "p1"}], "@odata.nextLink": url + "?page=2"})] * 2,
+            url + "?page=2": [make_response(503)] * 2,
+        }
+        onenote = make_onenote(routes)
+        self.assertEqual(onenote.list_pages("token", "s1"), [])
+        with self.assertRaises(requests.exceptions.HTTPError):
+            list(onenote.iter_pages("token", "s1"))
+
+
+def section(section_id: str, pages: list = None) -> dict:
+    data = {"id": section_id, "displayName": section_id.upper()}
+    if pages is not None:
+        data["pages"] = [{"id": page_id, "title": page_id.upper()} for page_id in pages]
+    return data
+
+
+def section_group(group_id: str, sections: list, groups: list = None) -> dict:
+    data = {"id": group_id, "displayName": group_id.upper(), "sections": sections}
+    if groups is not None:
+        data["sectionGroups"] = groups
+    return data
+
+
+def pages_of(tree) -> dict:
+    return {section.id: [page.id for page in section.pages] for section in tree.iter_sections()}
+
+
+class TestNotebookTree(unittest.TestCase):
+
+    notebook_url = f"{ONENOTE_NOTEBOOK_BASE_URL}/nb1"
+
+    def test_expanded_tree_in_one_request(self):
+        deep_url = f"{ONENOTE_SECTION_GROUP_BASE_URL}/deep"
+        onenote = make_onenote({
+            self.notebook_url: [make_response(200, {
+                "id": "nb1",
+                "displayName": "Work",
+                "sections": [section("s1", ["p1"])],
+                "sectionGroups": [section_group("g1", [section("s2", ["p2"])], [{"id": "deep", "displayName": "DEEP"}])],
+            })],
+            # Section groups below the second level are expanded with a request of their own
+            deep_url: [make_response(200, {"id": "deep", "sections": [section("s3", [])]})],
+        })
+        tree = onenote.get_notebook_tree("token", "nb1")
+        self.assertEqual(pages_of(tree), {"s1": ["p1"], "s2": ["p2"], "s3": []})
+        self.assertEqual([call[1] for call in onenote.client.session.calls], [self.notebook_url, deep_url])
+
+    def test_rejected_page_expansion_falls_back_to_paging_sections(self):
+        onenote = make_onenote({
+            self.notebook_url: [
+                make_response(400, {"error": {"code": "20266", "message": "Too many levels of $expand"}}),
+                make_response(200, {
+                    "id": "nb1",
+                    "sections": [section("s1")],
+                    "sectionGroups": [section_group("g1", [section("s2")], [])],
+                }),
+            ],
+            f"{ONENOTE_SECTION_BASE_URL}/s1/pages": [make_response(200, {"value": [{"id": "p1", "title": "P1"}]})],
+            f"{ONENOTE_SECTION_BASE_URL}/s2/pages": [make_response(200, {"value": [{"id": "p2", "title": "P2"}]})],
+        })
+        tree = onenote.get_notebook_tree("token", "nb1")
+        self.assertEqual(pages_of(tree), {"s1": ["p1"], "s2": ["p2"]})
+        calls = onenote.client.session.calls
+        self.assertEqual([call[2]["$expand"] for call in calls[:2]], [STRUCTURE_EXPAND, STRUCTURE_EXPAND_NO_PAGES])
+        self.assertEqual(len(calls), 4)
+
+    def test_other_errors_are_not_retried_without_pages(self):
+        onenote = make_onenote({self.notebook_url: [make_response(404)]})
+        self.assertIsNone(onenote.get_notebook_tree("token", "nb1"))
+        self.assertEqual(len(onenote.client.session.calls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
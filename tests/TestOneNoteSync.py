@@ -0,0 +1,98 @@
+import os
+import re
+import tempfile
+import unittest
+
+from integrator.integrator.OneNoteStructure import (OneNoteNotebook,
+                                                    OneNotePage,
+                                                    OneNoteSection)
+from integrator.integrator.OneNoteSync import OneNoteSync, parse_timestamp
+
+FILTER_PATTERN = re.compile(r"lastModifiedDateTime ge (\S+) and parentNotebook/id eq '([^']+)'")
+
+
+class StubOneNote:
+    """
+    In-memory notebooks answering full listings and the filtered page query
+    OneNoteSync sends. pages maps notebook ID -> section ID -> list of pages.
+    """
+
+    page_base_url = "https://graph.example/me/onenote/pages"
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.client = self
+        self.listed = []
+        self.queries = []
+
+    def get_notebook_tree(self, access_token, notebook_id):
+        self.listed.append(notebook_id)
+        sections = [
+            OneNoteSection(section_id, section_id, [OneNotePage(page["id"], page["title"], None, page["lastModifiedDateTime"]) for page in pages])
+            for section_id, pages in self.pages[notebook_id].items()
+        ]
+        return OneNoteNotebook(notebook_id, notebook_id, sections)
+
+    def iter_collection(self, url, headers=None, params=None):
+        watermark, notebook_id = FILTER_PATTERN.fullmatch(params["$filter"]).groups()
+        self.queries.append((notebook_id, watermark))
+        for section_id, pages in self.pages[notebook_id].items():
+            for page in pages:
+                if parse_timestamp(page["lastModifiedDateTime"]) >= parse_timestamp(watermark):
+                    yield dict(page, parentSection={"id": section_id})
+
+
+def page(page_id: str, modified: str) -> dict:
+    return {"id": page_id, "title": page_id.upper(), "lastModifiedDateTime": modified}
+
+
+class TestOneNoteSync(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.state_file = os.path.join(self.directory.name, "onenote_sync.json")
+        self.onenote = StubOneNote({
+            "work": {"s1": [page("a", "2024-05-01T10:00:00Z"), page("b", "2024-05-02T10:00:00.500Z")]},
+            "home": {"s2": [page("c", "2024-01-01T08:00:00Z")]},
+            "empty": {"s3": []},
+        })
+
+    def make_sync(self) -> OneNoteSync:
+        return OneNoteSync(self.onenote, self.state_file)
+
+    def test_first_sync_lists_notebooks_completely(self):
+        changes = self.make_sync().sync("token", ["work", "home", "empty"])
+        self.assertEqual(sorted(change["id"] for change in changes), ["a", "b", "c"])
+        self.assertTrue(all(change["type"] == "created" for change in changes))
+        self.assertEqual(self.onenote.listed, ["work", "home", "empty"])
+        state = self.make_sync().notebooks
+        self.assertEqual(state["work"]["watermark"], "2024-05-02T10:00:00.500Z")
+        self.assertIsNotNone(state["empty"]["watermark"])
+
+    def test_incremental_sync_uses_each_notebooks_watermark(self):
+        self.make_sync().sync("token", ["work", "home", "empty"])
+        self.onenote.listed = []
+        self.onenote.pages["work"]["s1"].append(page("d", "2024-05-03T09:00:00Z"))
+        self.onenote.pages["home"]["s2"][0] = page("c", "2024-05-04T09:00:00Z")
+
+        changes = self.make_sync().sync("token")
+        self.assertEqual(self.onenote.listed, [])
+        self.assertEqual(
+            sorted((change["type"], change["id"]) for change in changes), [("changed", "c"), ("created", "d")]
+        )
+        queries = dict(self.onenote.queries)
+        self.assertEqual(queries["work"], "2024-05-02T10:00:00.500Z")
+        self.assertEqual(queries["home"], "2024-01-01T08:00:00Z")
+
+    def test_notebook_without_changes(self):
+        self.make_sync().sync("token", ["work", "empty"])
+        self.onenote.listed = []
+        self.assertEqual(self.make_sync().sync("token"), [])
+        # The empty notebook is queried incrementally as well, not listed again
+        self.assertEqual(self.onenote.listed, [])
+        self.assertEqual(sorted(notebook_id for notebook_id, _ in self.onenote.queries), ["empty", "work"])
+        self.assertEqual(self.make_sync().notebooks["work"]["watermark"], "2024-05-02T10:00:00.500Z")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from integrator.integrator.PageContentCache import PageContentCache
+
+
+class TestPageContentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "pages.db")
+        self.cache = PageContentCache(self.db_path, max_bytes=4096)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_hit_and_outdated_miss(self):
+        self.cache.put("p1", "2024-01-01T00:00:00Z", "<html>one</html>")
+        self.assertEqual(self.cache.get("p1", "2024-01-01T00:00:00Z"), "<html>one</html>")
+        self.assertIsNone(self.cache.get("p1", "2024-02-01T00:00:00Z"))
+        self.assertIsNone(self.cache.get("p1", "2024-01-01T00:00:00Z"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 0))
+
+    def test_unknown_version_keeps_entry(self):
+        self.cache.put("p1", "v1", "<html>one</html>")
+        self.assertIsNone(self.cache.get("p1", None))
+        self.assertEqual(self.cache.get("p1", "v1"), "<html>one</html>")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        pages = {f"p{index}": os.urandom(1100).hex() for index in range(3)}
+        for page_id, content in pages.items():
+            self.cache.put(page_id, "v1", content)
+        self.cache.get("p0", "v1")
+        self.cache.put("p3", "v1", os.urandom(1100).hex())
+        self.assertLessEqual(self.cache.stats()["bytes"], 4096)
+        self.assertIsNone(self.cache.get("p1", "v1"))
+        self.assertEqual(self.cache.get("p0", "v1"), pages["p0"])
+
+    def test_persists_across_instances(self):
+        self.cache.put("p1", "v1", "<html>one</html>")
+        self.cache.close()
+        self.cache = PageContentCache(self.db_path, max_bytes=4096)
+        self.assertEqual(self.cache.get("p1", "v1"), "<html>one</html>")
+        self.assertGreater(self.cache.stats()["bytes"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
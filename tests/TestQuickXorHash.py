@@ -0,0 +1,42 @@
+import base64
+import os
+import tempfile
+import unittest
+
+from integrator.integrator.OneLib import quick_xor_hash
+
+
+# Byte-by-byte reference implementation of OneDrive's quickXorHash
+def reference_quick_xor_hash(data: bytes) -> str:
+    ring = 0
+    shift = 0
+    for byte in data:
+        ring ^= ((byte << shift) | (byte >> (160 - shift))) & ((1 << 160) - 1)
+        shift = (shift + 11) % 160
+    digest = bytearray(ring.to_bytes(20, "little"))
+    for index, byte in enumerate(len(data).to_bytes(8, "little")):
+        digest[12 + index] ^= byte
+    return base64.b64encode(bytes(digest)).decode("ascii")
+
+
+class TestQuickXorHash(unittest.TestCase):
+
+    def hash_bytes(self, data: bytes) -> str:
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            file.write(data)
+        try:
+            return quick_xor_hash(file.name)
+        finally:
+            os.remove(file.name)
+
+    def test_empty_file(self):
+        self.assertEqual(self.hash_bytes(b""), "AAAAAAAAAAAAAAAAAAAAAAAAAAA=")
+
+    def test_matches_reference(self):
+        # Sizes around the 160-byte block and the read size boundaries
+        for size in (1, 159, 160, 161, 4097, 160 * 8192 - 1, 160 * 8192 + 321):
+            data = os.urandom(size)
+            self.assertEqual(self.hash_bytes(data), reference_quick_xor_hash(data), size)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+import requests
+
+from integrator.integrator.AsyncGraphClient import AsyncGraphClient
+from integrator.integrator.AsyncOneDriveLib import AsyncOneDriveLib
+from integrator.integrator.GraphThrottle import RetryPolicy
+from integrator.integrator.OneDriveLib import (UPLOAD_FRAGMENT_UNIT,
+                                               OneDriveLib, save_upload_state)
+
+UPLOAD_URL = "https://upload.example/session"
+FILE_SIZE = 3 * UPLOAD_FRAGMENT_UNIT
+
+
+def make_response(status_code: int, body: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body or {}).encode("utf-8")
+    return response
+
+
+def expected_ranges(start: int) -> dict:
+    return {"nextExpectedRanges": [f"{start}-{FILE_SIZE - 1}"]}
+
+
+class StubClient:
+    """Returns the queued responses in order and records method, URL and Content-Range."""
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs.get("headers", {}).get("Content-Range")))
+        return self.responses.pop(0)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+
+class StubUploadClient:
+    """
+    Accepts simple PUTs and upload session ranges, keeping the bytes received.
+    A session answers every range but the last with the next expected byte.
+    """
+
+    file_url = "https://graph.example/drive/items/folder:/report.bin:/content"
+
+    def __init__(self):
+        self.calls = []
+        self.received = bytearray()
+
+    def post(self, url, **kwargs):
+        self.calls.append("POST")
+        return make_response(200, {"uploadUrl": UPLOAD_URL})
+
+    def put(self, url, data=None, headers=None):
+        # Ranges are memoryview slices released after the call; copy them now
+        self.received += bytes(data)
+        if url == self.file_url:
+            self.calls.append("PUT")
+            return make_response(201, {"id": "uploaded", "size": len(self.received)})
+        content_range = headers["Content-Range"]
+        self.calls.append(content_range)
+        start, end, total = map(int, content_range.removeprefix("bytes ").replace("/", "-").split("-"))
+        if start != len(self.received) - (end - start + 1):
+            raise AssertionError(f"Range {content_range} sent out of order")
+        if end + 1 == total:
+            return make_response(201, {"id": "uploaded", "size": total})
+        return make_response(202, {"nextExpectedRanges": [f"{end + 1}-"]})
+
+
+class TestUploadContent(unittest.TestCase):
+
+    threshold = UPLOAD_FRAGMENT_UNIT
+
+    def upload(self, content, **options) -> tuple:
+        client = StubUploadClient()
+        item = OneDriveLib(base_url="https://graph.example/drive/", client=client).upload_content(
+            "token", "folder", "report.bin", content,
+            large_file_threshold=self.threshold, chunk_size=UPLOAD_FRAGMENT_UNIT, **options,
+        )
+        return item, client
+
+    def test_single_put_up_to_the_threshold(self):
+        data = os.urandom(self.threshold)
+        for content in (data, io.BytesIO(data), iter([data[:100], data[100:]])):
+            with self.subTest(content=type(content).__name__):
+                item, client = self.upload(content)
+                self.assertEqual(item["id"], "uploaded")
+                self.assertEqual(client.calls, ["PUT"])
+                self.assertEqual(bytes(client.received), data)
+
+    def test_upload_session_above_the_threshold(self):
+        data = os.urandom(2 * UPLOAD_FRAGMENT_UNIT + 5)
+        item, client = self.upload(data)
+        self.assertEqual(item["size"], len(data))
+        self.assertEqual(client.calls, [
+            "POST",
+            f"bytes 0-{UPLOAD_FRAGMENT_UNIT - 1}/{len(data)}",
+            f"bytes {UPLOAD_FRAGMENT_UNIT}-{2 * UPLOAD_FRAGMENT_UNIT - 1}/{len(data)}",
+            f"bytes {2 * UPLOAD_FRAGMENT_UNIT}-{len(data) - 1}/{len(data)}",
+        ])
+        self.assertEqual(bytes(client.received), data)
+
+    def test_stream_of_unknown_size(self):
+        data = os.urandom(2 * UPLOAD_FRAGMENT_UNIT + 5)
+        chunks = (data[start:start + 1000] for start in range(0, len(data), 1000))
+        item, client = self.upload(chunks)
+        self.assertEqual(item["size"], len(data))
+        # Spooled first, so the session knows the total size up front
+        self.assertTrue(client.calls[1].endswith(f"/{len(data)}"))
+        self.assertEqual(bytes(client.received), data)
+
+    def test_stream_shorter_than_its_size_fails(self):
+        item, _ = self.upload(iter([b"x" * 10]), size=2 * self.threshold)
+        self.assertIsNone(item)
+
+    def test_partly_read_streams_upload_the_rest(self):
+        data = os.urandom(2 * UPLOAD_FRAGMENT_UNIT + 5)
+        for size in (self.threshold - 1, len(data)):
+            with tempfile.TemporaryFile() as file:
+                file.write(data[:size])
+                file.seek(0)
+                for content in (io.BytesIO(data[:size]), file):
+                    with self.subTest(size=size, content=type(content).__name__):
+                        content.seek(0)
+                        content.read(10)
+                        item, client = self.upload(content)
+                        self.assertIsNotNone(item)
+                        self.assertEqual(bytes(client.received), data[10:size])
+                        self.assertEqual(client.calls[0], "PUT" if size <= self.threshold else "POST")
+
+
+class UploadSessionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.file_name = "large.bin"
+        self.local_file = os.path.join(self.directory.name, self.file_name)
+        with open(self.local_file, "wb") as file:
+            file.write(os.urandom(FILE_SIZE))
+        self.state_file = os.path.join(self.directory.name, "upload.json")
+
+    def save_state(self):
+        save_upload_state(self.state_file, UPLOAD_URL, FILE_SIZE, os.path.getmtime(self.local_file))
+
+
+class TestUploadLargeFile(UploadSessionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("integrator.integrator.OneDriveLib.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, responses: list) -> tuple:
+        client = StubClient(responses)
+        item = OneDriveLib(client=client).upload_large_file(
+            "token", "folder", self.directory.name, self.file_name,
+            chunk_size=UPLOAD_FRAGMENT_UNIT, state_file=self.state_file,
+        )
+        return item, client.calls
+
+    def test_resumes_saved_session(self):
+        self.save_state()
+        item, calls = self.upload([
+            make_response(200, expected_ranges(2 * UPLOAD_FRAGMENT_UNIT)),
+            make_response(201, {"id": "uploaded"}),
+        ])
+        self.assertEqual(item, {"id": "uploaded"})
+        self.assertEqual(calls, [
+            ("GET", UPLOAD_URL, None),
+            ("PUT", UPLOAD_URL, f"bytes {2 * UPLOAD_FRAGMENT_UNIT}-{FILE_SIZE - 1}/{FILE_SIZE}"),
+        ])
+        self.assertFalse(os.path.exists(self.state_file))
+
+    def test_failed_range_continues_where_the_session_stands(self):
+        item, calls = self.upload([
+            make_response(200, {"uploadUrl": UPLOAD_URL}),
+            make_response(202, expected_ranges(UPLOAD_FRAGMENT_UNIT)),
+            make_response(503),
+            make_response(200, expected_ranges(2 * UPLOAD_FRAGMENT_UNIT)),
+            make_response(201, {"id": "uploaded"}),
+        ])
+        self.assertEqual(item, {"id": "uploaded"})
+        self.assertEqual([call[2] for call in calls if call[0] == "PUT"], [
+            f"bytes 0-{UPLOAD_FRAGMENT_UNIT - 1}/{FILE_SIZE}",
+            f"bytes {UPLOAD_FRAGMENT_UNIT}-{2 * UPLOAD_FRAGMENT_UNIT - 1}/{FILE_SIZE}",
+            f"bytes {2 * UPLOAD_FRAGMENT_UNIT}-{FILE_SIZE - 1}/{FILE_SIZE}",
+        ])
+
+    def test_state_is_kept_when_the_upload_fails(self):
+        item, _ = self.upload([
+            make_response(200, {"uploadUrl": UPLOAD_URL}),
+            make_response(400),
+        ])
+        self.assertIsNone(item)
+        self.assertTrue(os.path.exists(self.state_file))
+
+
+class TestAsyncUploadLargeFile(UploadSessionTestCase, unittest.IsolatedAsyncioTestCase):
+
+    async def upload(self, responses: list) -> tuple:
+        calls = []
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, str(request.url), request.headers.get("Content-Range")))
+            status_code, body = responses.pop(0)
+            return httpx.Response(status_code, json=body)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        onedrive = AsyncOneDriveLib(client=AsyncGraphClient(client=client, retry_policy=RetryPolicy(max_retries=0)))
+        with mock.patch("integrator.integrator.AsyncOneDriveLib.asyncio.sleep", new=mock.AsyncMock()):
+            item = await onedrive._upload_large_file(
+                "token", "folder", self.local_file, self.file_name,
+                chunk_size=UPLOAD_FRAGMENT_UNIT, state_file=self.state_file,
+            )
+        await client.aclose()
+        return item, calls
+
+    async def test_resumes_saved_session(self):
+        self.save_state()
+        item, calls = await self.upload([
+            (200, expected_ranges(2 * UPLOAD_FRAGMENT_UNIT)),
+            (201, {"id": "uploaded"}),
+        ])
+        self.assertEqual(item, {"id": "uploaded"})
+        self.assertEqual(calls[1], ("PUT", UPLOAD_URL, f"bytes {2 * UPLOAD_FRAGMENT_UNIT}-{FILE_SIZE - 1}/{FILE_SIZE}"))
+        self.assertFalse(os.path.exists(self.state_file))
+
+    async def test_failed_range_continues_where_the_session_stands(self):
+        item, calls = await self.upload([
+            (200, {"uploadUrl": UPLOAD_URL}),
+            (202, expected_ranges(UPLOAD_FRAGMENT_UNIT)),
+            (503, {}),
+            (200, expected_ranges(2 * UPLOAD_FRAGMENT_UNIT)),
+            (201, {"id": "uploaded"}),
+        ])
+        self.assertEqual(item, {"id": "uploaded"})
+        self.assertEqual([call[0] for call in calls], ["POST", "PUT", "PUT", "GET", "PUT"])
+        self.assertTrue(calls[-1][2].startswith(f"bytes {2 * UPLOAD_FRAGMENT_UNIT}-"))
+
+if __name__ == "__main__":
+    unittest.main()